@@ -0,0 +1,60 @@
+"""
+Linear execution against the DAG scheduler on a synthetic plan.
+
+The plan mixes UI steps (short, serialized), I/O steps (web and document
+work, longer), and waits, with a few dependencies between them. Steps
+sleep for their cost. Reported are the wall time of each strategy, the
+critical path, and a check that no two UI steps overlapped.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_dag_scheduler [--chains 4] [--scale 1.0]
+"""
+import argparse
+import time
+
+from src.safwanbuddy.automation.dag_scheduler import IO_LANE, UI_LANE, DagNode, DagScheduler
+
+
+def build_plan(chains: int, scale: float):
+    """Per chain: open page (ui) -> wait for load -> fill (ui); fetch prices (io) -> report (io) needs both."""
+    nodes = []
+    for c in range(chains):
+        cost = lambda seconds: (lambda: time.sleep(seconds * scale))
+        nodes += [
+            DagNode(f"open{c}", (), UI_LANE, cost(0.05), len(nodes)),
+            DagNode(f"load{c}", (f"open{c}",), IO_LANE, cost(0.3), len(nodes) + 1),
+            DagNode(f"fill{c}", (f"load{c}",), UI_LANE, cost(0.08), len(nodes) + 2),
+            DagNode(f"prices{c}", (), IO_LANE, cost(0.4), len(nodes) + 3),
+            DagNode(f"report{c}", (f"fill{c}", f"prices{c}"), IO_LANE, cost(0.25), len(nodes) + 4),
+        ]
+    return nodes
+
+
+def ui_overlaps(report) -> int:
+    spans = sorted((t.start_ms, t.end_ms) for t in report.timings.values() if t.lane == UI_LANE)
+    return sum(1 for (_, end), (start, _) in zip(spans, spans[1:]) if start < end)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chains", type=int, default=4)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplies every step's cost")
+    parser.add_argument("--workers", type=int, default=5)
+    args = parser.parse_args()
+
+    nodes = build_plan(args.chains, args.scale)
+    start = time.perf_counter()
+    for node in sorted(nodes, key=lambda n: n.order):
+        node.action()
+    linear_ms = (time.perf_counter() - start) * 1000
+
+    report = DagScheduler(args.workers).run(nodes)
+    print(f"{len(nodes)} steps in {args.chains} chains")
+    print(f"linear    {linear_ms:8.0f} ms")
+    print(f"dag       {report.total_ms:8.0f} ms  x{linear_ms / report.total_ms:.1f}  "
+          f"(steps {report.serial_ms:.0f} ms, UI overlaps {ui_overlaps(report)})")
+    print(f"critical  {report.critical_ms:8.0f} ms  {' -> '.join(report.critical_path)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+UI element detection time per frame size, median ms. Each previous
+find_buttons / find_input_fields pass (converting and contouring the frame
+on its own) is set against its replacement: the single-kind wrappers, then
+both legacy passes against detect(kinds=(button, input)). "all" is the full
+detect, which also finds labels. Counts are shown against the drawn elements.
+
+    python -m benchmarks.bench_element_detector
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic_ui import render_form
+from src.safwanbuddy.vision.element_detector import BUTTON, INPUT, ElementDetector
+
+SIZES = ((1280, 720), (1920, 1080), (2560, 1440), (3840, 2160))
+
+
+def legacy_find_buttons(image):
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    edged = cv2.Canny(cv2.GaussianBlur(gray, (5, 5), 0), 50, 150)
+    contours, _ = cv2.findContours(edged, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    buttons = []
+    for cnt in contours:
+        approx = cv2.approxPolyDP(cnt, 0.02 * cv2.arcLength(cnt, True), True)
+        if len(approx) == 4:
+            x, y, w, h = cv2.boundingRect(approx)
+            if 2 < float(w) / h < 6 and w > 50 and h > 20:
+                buttons.append((x, y, w, h))
+    return buttons
+
+
+def legacy_find_input_fields(image):
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    _, thresh = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY_INV)
+    contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    fields = []
+    for cnt in contours:
+        x, y, w, h = cv2.boundingRect(cnt)
+        if float(w) / h > 4 and w > 100 and 20 < h < 50:
+            fields.append((x, y, w, h))
+    return fields
+
+
+def timed(fn, repeat: int):
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Element detector timing per frame size")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    detector = ElementDetector()
+    print(f"{'frame':>10} {'buttons':>13} {'inputs':>13} {'both':>13} {'all':>6} "
+          f"{'buttons':>9} {'inputs':>9} {'labels':>9}")
+    for width, height in SIZES:
+        image, truth = render_form(width, height)
+        pairs = [
+            (lambda: legacy_find_buttons(image), lambda: detector.find_buttons(image)),
+            (lambda: legacy_find_input_fields(image), lambda: detector.find_input_fields(image)),
+            (lambda: (legacy_find_buttons(image), legacy_find_input_fields(image)),
+             lambda: detector.detect(image, (BUTTON, INPUT))),
+        ]
+        times = [f"{timed(old, args.repeat):5.1f}->{timed(new, args.repeat):5.1f}" for old, new in pairs]
+        full = timed(lambda: detector.detect(image), args.repeat)
+        elements = detector.detect(image)
+        counts = []
+        for kind in ("button", "input", "label"):
+            drawn = sum(1 for k, _, _ in truth if k == kind)
+            counts.append(f"{int((elements['kind'] == kind).sum())}/{drawn}")
+        print(f"{width}x{height:<5} {times[0]:>13} {times[1]:>13} {times[2]:>13} {full:>6.1f} "
+              f"{counts[0]:>9} {counts[1]:>9} {counts[2]:>9}")
+
+
+if __name__ == "__main__":
+    main()
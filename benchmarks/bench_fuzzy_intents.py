@@ -0,0 +1,95 @@
+"""
+Accuracy and latency of the fuzzy intent fallback on near-miss ASR output.
+
+Builds the same phrase index CommandProcessor uses (voice_commands.yaml plus
+dialect variants) and sweeps the score threshold, so voice.fuzzy_threshold
+can be tuned against benchmarks/data/asr_near_misses.yaml.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_fuzzy_intents [--thresholds 0.5 0.6 0.7]
+"""
+import argparse
+import time
+
+import yaml
+
+from src.safwanbuddy.profiles.language_mapper import LanguageMapper
+from src.safwanbuddy.utils.fuzzy_index import NGramIndex
+from src.safwanbuddy.utils.intent_matcher import IntentMatcher, trigger_phrases
+
+
+def load_intents(path: str):
+    with open(path, 'r') as f:
+        data = yaml.safe_load(f) or {}
+    matcher = IntentMatcher()
+    phrases = []
+    for name, spec in (data.get("intents") or {}).items():
+        for pattern in spec.get("patterns", []):
+            matcher.add_pattern(name, pattern)
+            phrases.extend((phrase, name) for phrase in trigger_phrases(pattern))
+    for phrase, name in (data.get("commands") or {}).items():
+        matcher.add_phrase(name, phrase)
+        phrases.append((phrase, name))
+    return matcher, phrases
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--config", default="config/voice_commands.yaml")
+    parser.add_argument("--corpus", default="benchmarks/data/asr_near_misses.yaml")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.4, 0.5, 0.55, 0.6, 0.65, 0.7, 0.8])
+    parser.add_argument("--dialect", default="hyderabadi")
+    parser.add_argument("--budget-ms", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    matcher, phrases = load_intents(args.config)
+    mapper = LanguageMapper()
+    mapper.select(args.dialect)
+    dialect = mapper.variant_phrases()
+    for phrase, intent in dialect:
+        matcher.add_phrase(intent, phrase)
+    index = NGramIndex()
+    for phrase, intent in phrases + dialect:
+        index.add(phrase, intent)
+    with open(args.corpus, 'r') as f:
+        corpus = yaml.safe_load(f)
+
+    latencies = []
+    for _ in range(args.repeat):
+        for case in corpus:
+            start = time.perf_counter()
+            index.search(case["text"], k=3, budget=args.budget_ms / 1000.0)
+            latencies.append(time.perf_counter() - start)
+    print(f"{len(index)} phrases, {len(corpus)} cases; search latency "
+          f"p50 {percentile(latencies, 50) * 1e6:.0f}us  p99 {percentile(latencies, 99) * 1e6:.0f}us  "
+          f"max {max(latencies) * 1e6:.0f}us")
+
+    print(f"{'threshold':>9} {'precision':>9} {'recall':>7} {'false +':>7}")
+    for threshold in args.thresholds:
+        true_pos = false_pos = expected = 0
+        for case in corpus:
+            expected += case["intent"] is not None
+            resolved = None
+            for candidate in index.search(case["text"], k=3, min_score=threshold, budget=args.budget_ms / 1000.0):
+                match = matcher.match(candidate.corrected)
+                if match and match.intent == candidate.intent:
+                    resolved = match.intent
+                    break
+            if resolved is None:
+                continue
+            if resolved == case["intent"]:
+                true_pos += 1
+            else:
+                false_pos += 1
+        precision = true_pos / (true_pos + false_pos) if true_pos + false_pos else 1.0
+        print(f"{threshold:>9.2f} {precision:>9.2f} {true_pos / expected:>7.2f} {false_pos:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Intent matching throughput as the number of registered intents grows.
+
+Compares the sequential re.search loop CommandProcessor used to run against
+the compiled IntentMatcher.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_intent_matcher [--sizes 13 100 1000 5000]
+"""
+import argparse
+import random
+import re
+import time
+
+from src.safwanbuddy.utils.intent_matcher import IntentMatcher
+
+VERBS = ["open", "close", "start", "stop", "show", "hide", "play", "pause", "find", "send"]
+NOUNS = ["browser", "report", "music", "notes", "mail", "calendar", "folder", "window", "camera", "timer"]
+
+
+def build_intents(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    intents = []
+    for i in range(count):
+        verb, noun = rng.choice(VERBS), rng.choice(NOUNS)
+        if i % 3 == 0:
+            intents.append((f"intent_{i}", rf"{verb} {noun}{i} (?:to |for )?(.+)", False))
+        elif i % 3 == 1:
+            intents.append((f"intent_{i}", rf"(?:{verb}|launch) (?:the )?{noun}{i}", False))
+        else:
+            intents.append((f"intent_{i}", f"{noun}{i} {verb}", True))
+    return intents
+
+
+def build_commands(intents, count: int, seed: int = 11):
+    rng = random.Random(seed)
+    commands = []
+    for _ in range(count):
+        if rng.random() < 0.1:
+            commands.append("what is the weather like today")
+            continue
+        name, pattern, literal = rng.choice(intents)
+        if literal:
+            commands.append(f"please {pattern} now")
+        else:
+            sample = pattern.replace("(?:to |for )?(.+)", "to alice").replace("(?:the )?", "the ")
+            sample = re.sub(r"\(\?:(\w+)\|launch\)", r"\1", sample)
+            commands.append(sample)
+    return commands
+
+
+def run_sequential(intents, commands):
+    compiled = [(name, re.compile(re.escape(p) if literal else p)) for name, p, literal in intents]
+    start = time.perf_counter()
+    for command in commands:
+        for name, regex in compiled:
+            if regex.search(command):
+                break
+    return time.perf_counter() - start
+
+
+def run_compiled(intents, commands):
+    matcher = IntentMatcher()
+    for name, pattern, literal in intents:
+        if literal:
+            matcher.add_phrase(name, pattern)
+        else:
+            matcher.add_pattern(name, pattern)
+    build_start = time.perf_counter()
+    matcher.compile()
+    build_time = time.perf_counter() - build_start
+
+    start = time.perf_counter()
+    for command in commands:
+        matcher.match(command)
+    return time.perf_counter() - start, build_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[13, 100, 1000, 5000])
+    parser.add_argument("--commands", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'intents':>8} {'sequential cmd/s':>18} {'compiled cmd/s':>16} {'speedup':>8} {'compile ms':>11}")
+    for size in args.sizes:
+        intents = build_intents(size)
+        commands = build_commands(intents, args.commands)
+        seq = run_sequential(intents, commands)
+        comp, build = run_compiled(intents, commands)
+        print(f"{size:>8} {len(commands) / seq:>18,.0f} {len(commands) / comp:>16,.0f} "
+              f"{seq / comp:>7.1f}x {build * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
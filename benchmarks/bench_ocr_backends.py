@@ -0,0 +1,62 @@
+"""
+Per-call OCR latency: pytesseract (one tesseract process per call) versus
+the pooled tesserocr engines, on a small label crop and a full text block.
+
+Backends that are not installed are skipped.
+    python -m benchmarks.bench_ocr_backends
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from benchmarks.synthetic_ui import render_text
+from src.safwanbuddy.vision import ocr_backends
+
+SAMPLE_LINES = [
+    "First Name", "Last Name", "Email address", "Phone number",
+    "Street address line one", "City  State  Postal code", "Submit  Cancel  Help",
+]
+
+
+def available_backends():
+    backends = [ocr_backends.PytesseractBackend()]
+    if ocr_backends.tesserocr is not None:
+        backends.append(ocr_backends.TesserocrBackend())
+    return backends
+
+
+def timed(fn, repeat: int):
+    fn()  # Warm up: loads traineddata once for pooled engines
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000, samples[int(len(samples) * 0.95)] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR backend latency")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=4, help="concurrent callers for the throughput run")
+    args = parser.parse_args()
+
+    block = cv2.cvtColor(render_text(SAMPLE_LINES), cv2.COLOR_BGR2GRAY)
+    label = cv2.cvtColor(render_text(["Email address"], width=260), cv2.COLOR_BGR2GRAY)
+
+    print(f"{'backend':<12} {'label p50':>10} {'label p95':>10} {'block p50':>10} {'block p95':>10} {'calls/s x' + str(args.threads):>12}")
+    for backend in available_backends():
+        small = timed(lambda: backend.image_to_data(label, psm=7), args.repeat)
+        full = timed(lambda: backend.image_to_data(block), args.repeat)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            list(pool.map(lambda _: backend.image_to_data(label, psm=7), range(args.repeat * args.threads)))
+        rate = args.repeat * args.threads / (time.perf_counter() - start)
+        print(f"{backend.name:<12} {small[0]:>10.1f} {small[1]:>10.1f} {full[0]:>10.1f} {full[1]:>10.1f} {rate:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
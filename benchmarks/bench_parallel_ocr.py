@@ -0,0 +1,44 @@
+"""
+Tiled parallel OCR on a synthetic 4K frame: wall time and speedup against a
+single worker, plus how many of the drawn words were recovered (seam merging
+should neither lose nor duplicate words).
+
+    python -m benchmarks.bench_parallel_ocr --workers 1 2 4
+"""
+import argparse
+import os
+import time
+
+from benchmarks.synthetic_ui import render_page, word_recall
+from src.safwanbuddy.vision.parallel_ocr import ParallelOCR
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel OCR scaling")
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, os.cpu_count() or 2}))
+    parser.add_argument("--size", type=int, nargs=2, default=[3840, 2160], metavar=("W", "H"))
+    parser.add_argument("--tile", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    image, drawn = render_page(*args.size)
+    print(f"frame {args.size[0]}x{args.size[1]}, {len(drawn)} words, tile {args.tile}")
+    print(f"{'workers':>7} {'best s':>8} {'speedup':>8} {'words':>7} {'recall':>7}")
+    baseline = None
+    for workers in args.workers:
+        ocr = ParallelOCR(workers=workers, tile_size=args.tile)
+        try:
+            frame = ocr.recognize(image)  # Starts workers and warms their engines
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                frame = ocr.recognize(image)
+                best = min(best, time.perf_counter() - start)
+        finally:
+            ocr.shutdown()
+        baseline = baseline or best
+        print(f"{workers:>7} {best:>8.2f} {baseline / best:>7.2f}x {len(frame.words):>7} {word_recall(frame.words, drawn):>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
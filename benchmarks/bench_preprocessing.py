@@ -0,0 +1,66 @@
+"""
+OCR preprocessing: accuracy against time on synthetic UI screenshots.
+
+For each scene (clean, noisy, blurred) and pipeline configuration, reports
+the median preprocessing time, the slowest stage, the OCR time and word
+recall. --skip-ocr times the preprocessing alone (no Tesseract needed).
+
+    python -m benchmarks.bench_preprocessing
+"""
+import argparse
+import time
+
+from benchmarks.synthetic_ui import degrade, render_page, word_recall
+from src.safwanbuddy.vision.ocr_backends import create_backend
+from src.safwanbuddy.vision.ocr_frame import OCRFrame
+from src.safwanbuddy.vision.preprocessing import PreprocessPipeline
+
+CONFIGS = {
+    "legacy denoise+otsu": dict(denoise=True, threshold="otsu"),
+    "auto+otsu": dict(denoise="auto", threshold="otsu"),
+    "auto+adaptive": dict(denoise="auto", threshold="adaptive"),
+    "no threshold": dict(denoise="auto", threshold=None),
+    "x0.75 auto+otsu": dict(scale=0.75, denoise="auto", threshold="otsu"),
+    "x1.5 auto+otsu": dict(scale=1.5, denoise="auto", threshold="otsu"),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR preprocessing accuracy vs time")
+    parser.add_argument("--size", type=int, nargs=2, default=[1920, 1080], metavar=("W", "H"))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-ocr", action="store_true")
+    args = parser.parse_args()
+
+    page, drawn = render_page(*args.size, columns=3)
+    scenes = {
+        "clean": page,
+        "noise s=8": degrade(page, noise_sigma=8),
+        "blur 3": degrade(page, blur=3),
+    }
+    backend = None if args.skip_ocr else create_backend()
+
+    print(f"{'scene':<10} {'pipeline':<20} {'prep ms':>8} {'slowest stage':>22} {'ocr ms':>8} {'recall':>7}")
+    for scene, image in scenes.items():
+        for name, options in CONFIGS.items():
+            pipeline = PreprocessPipeline(**options)
+            samples = []
+            for _ in range(args.repeat):
+                processed = pipeline(image)
+                samples.append(pipeline.timings["total"])
+            samples.sort()
+            stage = max((k for k in pipeline.timings if k != "total"), key=pipeline.timings.get)
+            slowest = f"{stage} {pipeline.timings[stage]:.1f}"
+
+            ocr_ms, recall = "-", "-"
+            if backend is not None:
+                start = time.perf_counter()
+                data = backend.image_to_data(processed)
+                ocr_ms = f"{(time.perf_counter() - start) * 1000:.0f}"
+                frame = OCRFrame(data, scale=processed.shape[1] / image.shape[1])
+                recall = f"{word_recall(frame.words, drawn):.1%}"
+            print(f"{scene:<10} {name:<20} {samples[len(samples) // 2]:>8.1f} {slowest:>22} {ocr_ms:>8} {recall:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Replay time of a recorded session under the replay options, with the end
+state checked against a plain replay.
+
+The recording is synthetic: typing bursts, clicks and long idle gaps. A fake
+UI applies keys and text to a buffer, and sleeps are summed rather than
+slept, so a multi-minute recording is replayed instantly. The reported
+replay time is what the run would take on a real desktop, not counting the
+time the actions themselves take.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_replay [--minutes 5]
+"""
+import argparse
+import random
+from types import SimpleNamespace
+
+from src.safwanbuddy.automation.workflow_plan import UI, compile_workflow
+
+WORDS = ["invoice", "Total", "name", "Address", "city", "phone", "submit", "order", "Date", "notes"]
+
+
+def build_recording(minutes: float, seed: int = 5):
+    rng = random.Random(seed)
+    steps, elapsed = [], 0.0
+    while elapsed < minutes * 60:
+        roll = rng.random()
+        if roll < 0.6:
+            for w, word in enumerate(rng.sample(WORDS, rng.randint(1, 4))):
+                if w:
+                    steps.append({"type": "key", "key": "space", "delay": rng.uniform(0.08, 0.3)})
+                for char in word:
+                    if char.isupper():
+                        steps.append({"type": "key", "key": "shift", "delay": rng.uniform(0.05, 0.2)})
+                    steps.append({"type": "key", "key": char, "delay": rng.uniform(0.05, 0.25)})
+            steps.append({"type": "key", "key": "tab", "delay": rng.uniform(0.2, 0.6)})
+        elif roll < 0.85:
+            steps.append({"type": "click", "x": rng.randint(0, 1920), "y": rng.randint(0, 1080),
+                          "delay": rng.uniform(0.5, 2.0)})
+        else:
+            steps.append({"type": "click", "x": rng.randint(0, 1920), "y": rng.randint(0, 1080),
+                          "delay": rng.uniform(5, 40)})  # Reading, thinking, waiting on the app
+        elapsed = sum(s["delay"] for s in steps)
+    return {"name": "session", "steps": steps}
+
+
+class FakeDesktop:
+    def __init__(self):
+        self.events = []
+        self.actions = 0
+
+    def press(self, key):
+        self.actions += 1
+        if key == "space":
+            self.events.append(" ")
+        elif len(key) == 1:
+            self.events.append(key)
+        elif key != "shift":
+            self.events.append(f"<{key}>")
+
+    def type_text(self, text, human_like=True):
+        self.actions += 1
+        self.events.extend(text)
+
+    def click(self, x, y):
+        self.actions += 1
+        self.events.append((x, y))
+
+    def ui(self):
+        return UI(SimpleNamespace(press=self.press, click=self.click), SimpleNamespace(click_text=None),
+                  SimpleNamespace(type_text=self.type_text))
+
+
+def replay(workflow, coalesce: bool, speed: float, max_idle):
+    desktop = FakeDesktop()
+    plan = compile_workflow(workflow, desktop.ui(), coalesce=coalesce)
+    slept = []
+    plan.run(speed, max_idle, sleep=slept.append)
+    return sum(slept), len(plan), desktop
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--minutes", type=float, default=5)
+    args = parser.parse_args()
+
+    workflow = build_recording(args.minutes)
+    baseline_time, _, baseline = replay(workflow, False, 1.0, None)
+    print(f"recording: {len(workflow['steps'])} steps, {baseline_time:.1f} s as recorded")
+    print(f"{'coalesce':>8} {'speed':>6} {'max_idle':>8} {'steps':>6} {'actions':>8} {'replay s':>9} {'x':>6}  state")
+    for coalesce, speed, max_idle in [(False, 1.0, None), (True, 1.0, None), (False, 1.0, 2.0),
+                                      (True, 1.0, 2.0), (True, 2.0, 2.0), (True, 4.0, 1.0)]:
+        seconds, steps, desktop = replay(workflow, coalesce, speed, max_idle)
+        same = "same" if desktop.events == baseline.events else "DIFFERENT"
+        idle = "-" if max_idle is None else f"{max_idle:g}"
+        print(f"{str(coalesce):>8} {speed:>6g} {idle:>8} {steps:>6} {desktop.actions:>8} {seconds:>9.1f} "
+              f"{baseline_time / seconds:>6.1f}  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Cost of checkpointing a workflow run after every step.
+
+A 200-step plan of no-op actions runs without checkpoints, with atomic
+checkpoint writes, and with atomic writes plus fsync. Reported is the added
+time per step and the size of the run state on disk.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_run_checkpoint [--steps 200]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.bench_workflow_plan import FAKE_UI, build_workflow
+from src.safwanbuddy.automation.run_checkpoint import CheckpointStore
+from src.safwanbuddy.automation.workflow_plan import compile_workflow
+
+
+def run(plan, store, source):
+    state = {"stamp": [0, 0], "next": 0, "completed": [], "variables": {"total": 0}}
+    following = {step.index: nxt.index for step, nxt in zip(plan.steps, plan.steps[1:])}
+
+    def checkpoint(step):
+        state["next"] = following.get(step.index, step.index + 1)
+        state["variables"]["total"] += 1
+        store.save(source, state)
+
+    start = time.perf_counter()
+    plan.run(on_step=checkpoint if store else None, variables=state["variables"])
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(store.path_for(source)) if store else 0
+    if store:
+        store.clear(source)
+    return elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=200)
+    args = parser.parse_args()
+
+    plan = compile_workflow(build_workflow(args.steps), FAKE_UI)
+    directory = tempfile.mkdtemp()
+    source = os.path.join(directory, "bench.json")
+    base, _ = run(plan, None, source)
+    print(f"{len(plan)} steps, no checkpoints: {base * 1000:.1f} ms")
+    for label, fsync in (("atomic write", False), ("atomic write + fsync", True)):
+        elapsed, size = run(plan, CheckpointStore(directory, fsync=fsync), source)
+        print(f"{label:<22} {elapsed * 1000:8.1f} ms  +{(elapsed - base) / len(plan) * 1e6:7.1f} us/step  "
+              f"state {size} bytes")
+
+
+if __name__ == "__main__":
+    main()
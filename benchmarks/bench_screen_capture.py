@@ -0,0 +1,59 @@
+"""
+Screen capture latency: the old PIL round trip versus NumPy views over the
+mss buffer, full frame and region of interest.
+
+Needs a display; on a headless machine run it under Xvfb:
+    xvfb-run -s "-screen 0 1920x1080x24" python -m benchmarks.bench_screen_capture
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.safwanbuddy.vision.screen_capture import ScreenCapture
+
+
+def legacy_capture(capture: ScreenCapture, region=None):
+    from PIL import Image
+    screenshot = capture.sct.grab(capture._grab_area(1, region))
+    img = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
+    return np.array(img)
+
+
+def timed(fn, repeat: int):
+    fn()  # Warm up buffers and the display connection
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000, samples[int(len(samples) * 0.95)] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Screen capture latency")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--roi", type=int, nargs=4, default=[100, 100, 400, 200], metavar=("X", "Y", "W", "H"))
+    args = parser.parse_args()
+
+    capture = ScreenCapture()
+    width, height = capture.monitor_size()
+    roi = tuple(args.roi)
+    cases = [
+        ("legacy PIL rgb", lambda region: legacy_capture(capture, region)),
+        ("bgra view", lambda region: capture.capture(region=region, mode="bgra")),
+        ("bgr", lambda region: capture.capture(region=region)),
+        ("bgr reuse", lambda region: capture.capture(region=region, reuse=True)),
+        ("gray reuse", lambda region: capture.capture_gray(region=region, reuse=True)),
+    ]
+    print(f"monitor {width}x{height}, roi {roi[2]}x{roi[3]}")
+    print(f"{'path':<16} {'full p50 ms':>12} {'full p95 ms':>12} {'roi p50 ms':>11} {'roi p95 ms':>11}")
+    for name, fn in cases:
+        full = timed(lambda: fn(None), args.repeat)
+        part = timed(lambda: fn(roi), args.repeat)
+        print(f"{name:<16} {full[0]:>12.2f} {full[1]:>12.2f} {part[0]:>11.2f} {part[1]:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Icon lookup cost: a textless icon drawn at 125% display scale on a form
+screen, found by exhaustive full-resolution matching over every pyramid
+level versus the coarse-to-fine TemplateMatcher, cold and cached.
+Compare with bench_ocr_backends / bench_preprocessing for the OCR path.
+
+    python -m benchmarks.bench_template_matcher
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic_ui import place, render_form, render_icon
+from src.safwanbuddy.vision.preprocessing import to_gray
+from src.safwanbuddy.vision.template_matcher import TemplateLibrary, TemplateMatcher
+
+
+def exhaustive(image, library, name):
+    gray = to_gray(image)
+    best = None
+    for scale, full, _ in library.get(name):
+        _, score, _, (x, y) = cv2.minMaxLoc(cv2.matchTemplate(gray, full, cv2.TM_CCOEFF_NORMED))
+        if best is None or score > best[4]:
+            best = (x, y, full.shape[1], full.shape[0], score)
+    return best
+
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples)) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Template matching cost")
+    parser.add_argument("--size", type=int, nargs=2, default=[1920, 1080], metavar=("W", "H"))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    image, _ = render_form(*args.size)
+    truth = place(image, render_icon(32), args.size[0] - 120, 40, scale=1.25)
+    library = TemplateLibrary(template_dir="")
+    library.add("settings", render_icon(32))
+
+    def cold():
+        matcher = TemplateMatcher(library)
+        return matcher.find(image, "settings")
+
+    warm_matcher = TemplateMatcher(library)
+    warm_matcher.find(image, "settings")
+
+    print(f"frame {args.size[0]}x{args.size[1]}, icon drawn at {truth}")
+    for name, fn in (("exhaustive", lambda: exhaustive(image, library, "settings")),
+                     ("coarse-to-fine", cold),
+                     ("cached", lambda: warm_matcher.find(image, "settings"))):
+        ms, found = timed(fn, args.repeat)
+        box = tuple(int(v) for v in found[:4]) if found else None
+        print(f"{name:<15} {ms:>8.1f} ms  found {box} score {found[4] if found else 0:.3f}")
+
+
+if __name__ == "__main__":
+    main()
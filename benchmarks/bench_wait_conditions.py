@@ -0,0 +1,79 @@
+"""
+Fixed sleeps against polling waits on a simulated application.
+
+Each step triggers a UI update that lands after a random latency. A fixed
+sleep has to cover the slowest case, while WaitConditions returns once the
+watched region changed (region_change), or once it stopped changing
+(stable, optionally after first waiting for a change to start). Reported
+are the total run time and how often a step went on before its update had
+arrived.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_wait_conditions [--steps 12] [--fixed 0.8]
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from src.safwanbuddy.automation.wait_conditions import WaitConditions
+
+
+class FakeApp:
+    """A 200x120 "window" that redraws a step's result after its latency; capture() matches ScreenCapture."""
+
+    def __init__(self):
+        self.version = 0
+        self.ready_at = 0.0
+
+    def trigger(self, latency: float):
+        self.version += 1
+        self.ready_at = time.monotonic() + latency
+
+    @property
+    def shown(self) -> int:
+        return self.version if time.monotonic() >= self.ready_at else self.version - 1
+
+    def capture(self, monitor_id=1, region=None, mode="gray"):
+        image = np.full((120, 200), 240, dtype=np.uint8)
+        image[40:80, 20:20 + (self.shown * 13) % 160] = 30
+        return image
+
+
+def run(latencies, wait):
+    app = FakeApp()
+    waits = WaitConditions(interval=0.02, timeout=5.0, capture=app)
+    early = 0
+    start = time.perf_counter()
+    for latency in latencies:
+        app.trigger(latency)
+        wait(waits, app)
+        early += app.shown != app.version
+    return time.perf_counter() - start, early
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=12)
+    parser.add_argument("--fixed", type=float, default=0.8, help="fixed sleep per step (s)")
+    args = parser.parse_args()
+
+    rng = random.Random(2)
+    latencies = [rng.choice([0.03, 0.05, 0.1, 0.2]) if rng.random() < 0.8 else rng.uniform(0.4, 1.2)
+                 for _ in range(args.steps)]
+    print(f"{args.steps} steps, UI latency {sum(latencies):.2f} s in total (max {max(latencies):.2f} s)")
+    strategies = {
+        f"sleep {args.fixed}s": lambda w, app: time.sleep(args.fixed),
+        "region_change": lambda w, app: w.region_changed(),
+        "stable 0.1s": lambda w, app: w.stable(duration=0.1),
+        "change+stable": lambda w, app: w.stable(duration=0.1, change_timeout=1.5),
+    }
+    for name, wait in strategies.items():
+        elapsed, early = run(latencies, wait)
+        print(f"{name:<16} total {elapsed:6.2f} s  overhead {elapsed - sum(latencies):6.2f} s  "
+              f"went on early {early}/{len(latencies)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Per-run overhead of WorkflowEngine.run_workflow: the old interpreter (read
+and parse the JSON file, import inside the step loop, if/elif dispatch)
+against a cached compiled WorkflowPlan. Actions are no-ops and delays are
+zero, so only the engine's own cost is measured.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_workflow_plan [--steps 50 200 1000] [--runs 200]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from types import SimpleNamespace
+
+from src.safwanbuddy.automation.workflow_plan import UI, PlanCache
+
+
+def noop(*args, **kwargs):
+    pass
+
+
+FAKE_UI = UI(SimpleNamespace(click=noop, press=noop),
+             SimpleNamespace(click_text=noop),
+             SimpleNamespace(type_text=noop))
+
+
+def build_workflow(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    steps = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.4:
+            steps.append({"type": "key", "key": rng.choice("abcdefgh"), "delay": 0})
+        elif roll < 0.7:
+            steps.append({"type": "click", "x": rng.randint(0, 1920), "y": rng.randint(0, 1080), "delay": 0})
+        elif roll < 0.8:
+            steps.append({"type": "click", "target": "Submit", "delay": 0})
+        elif roll < 0.95:
+            steps.append({"type": "type", "text": "hello world", "delay": 0})
+        else:
+            steps.append({"type": "wait", "duration": 0, "delay": 0})
+    return {"name": f"bench_{count}", "steps": steps, "version": "1.0"}
+
+
+def run_legacy(path: str, ui: UI):
+    """The pre-compilation loop of run_workflow, with the same no-op actions."""
+    with open(path, 'r') as f:
+        workflow = json.load(f)
+    for step in workflow['steps']:
+        time.sleep(step.get("delay", 0.5))
+        step_type = step.get("type")
+        if step_type == "click":
+            x, y = step.get("x"), step.get("y")
+            if x is not None and y is not None:
+                import json as pyautogui_stand_in  # the per-step import the old loop did
+                ui.pyautogui.click(x, y)
+            elif step.get("target"):
+                ui.click_system.click_text(step.get("target"))
+        elif step_type == "key":
+            import json as pyautogui_stand_in
+            ui.pyautogui.press(step.get("key"))
+        elif step_type == "type":
+            ui.type_system.type_text(step.get("text"))
+        elif step_type == "wait":
+            time.sleep(step.get("duration", 1))
+
+
+def load(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def bench(count: int, runs: int):
+    fd, path = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(build_workflow(count), f)
+    try:
+        start = time.perf_counter()
+        for _ in range(runs):
+            run_legacy(path, FAKE_UI)
+        legacy = (time.perf_counter() - start) / runs
+
+        cache = PlanCache(load, ui=lambda: FAKE_UI)
+        start = time.perf_counter()
+        for _ in range(runs):
+            cache.get(path).run()
+        compiled = (time.perf_counter() - start) / runs
+        timings = cache.get(path).last_timings
+    finally:
+        os.remove(path)
+    overhead = sum(t.wait_ms + t.run_ms for t in timings) / len(timings) * 1000
+    print(f"{count:>6} steps  legacy {legacy * 1000:8.3f} ms/run  compiled {compiled * 1000:8.3f} ms/run  "
+          f"x{legacy / compiled:5.1f}  ({cache.compiles} compile, {overhead:.1f} us/step timed)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+    for count in args.steps:
+        bench(count, args.runs)
+
+
+if __name__ == "__main__":
+    main()
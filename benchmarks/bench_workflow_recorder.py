@@ -0,0 +1,70 @@
+"""
+Recording cost on the hook threads and read-back speed of the step stream.
+
+Several threads call WorkflowRecorder.record concurrently (as the mouse and
+keyboard hooks do) while the writer streams to disk; reported are the
+per-call latency percentiles seen by the hooks and the streaming read rate.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_workflow_recorder [--events 200000] [--threads 2]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from src.safwanbuddy.automation.workflow_recorder import WorkflowRecorder, iter_recording
+
+
+def hook(recorder, count: int, latencies: list, offset: int):
+    record = recorder.record
+    clock = time.perf_counter_ns
+    for i in range(count):
+        start = clock()
+        if i % 3:
+            record("key", key="a")
+        else:
+            record("click", x=offset + i % 1920, y=i % 1080)
+        latencies.append(clock() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=2)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.jsonl")
+    recorder = WorkflowRecorder(path)
+    recorder.start()
+    per_thread = args.events // args.threads
+    latencies = [[] for _ in range(args.threads)]
+    threads = [threading.Thread(target=hook, args=(recorder, per_thread, latencies[i], i))
+               for i in range(args.threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    recorded = time.perf_counter() - start
+    count = recorder.stop()
+    stopped = time.perf_counter() - start
+
+    ns = np.concatenate([np.array(l) for l in latencies])
+    size = os.path.getsize(path)
+    print(f"record(): p50 {np.percentile(ns, 50):.0f} ns  p99 {np.percentile(ns, 99):.0f} ns  "
+          f"max {ns.max() / 1000:.0f} us  ({count} steps in {recorded:.2f} s, drained by {stopped:.2f} s)")
+
+    start = time.perf_counter()
+    read = sum(1 for _ in iter_recording(path))
+    elapsed = time.perf_counter() - start
+    print(f"read back: {read} steps in {elapsed * 1000:.0f} ms ({read / elapsed:,.0f} steps/s), "
+          f"{size / count:.1f} bytes/step")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
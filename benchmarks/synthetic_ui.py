@@ -0,0 +1,205 @@
+"""
+Synthetic screens for vision benchmarks, rendered without a display: quick
+OpenCV drawings, and PIL-rendered scenes with ground-truth boxes.
+"""
+from collections import Counter
+from typing import NamedTuple
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+def render_text(lines, width: int = 800, line_height: int = 40, scale: float = 0.9, margin: int = 20) -> np.ndarray:
+    """Dark text on a light background, one entry of lines per row (BGR)."""
+    height = margin * 2 + line_height * len(lines)
+    image = np.full((height, width, 3), 245, dtype=np.uint8)
+    for i, line in enumerate(lines):
+        baseline = margin + line_height * (i + 1) - line_height // 4
+        cv2.putText(image, line, (margin, baseline), FONT, scale, (20, 20, 20), 2, cv2.LINE_AA)
+    return image
+
+WORDS = ("name", "email", "address", "phone", "submit", "cancel", "settings", "search", "profile",
+         "account", "password", "login", "upload", "download", "help", "save", "open", "close")
+
+
+def render_page(width: int = 3840, height: int = 2160, columns: int = 4, seed: int = 7):
+    """A screen-sized frame of text columns. Returns (BGR image, list of words drawn)."""
+    rng = np.random.default_rng(seed)
+    image = np.full((height, width, 3), 245, dtype=np.uint8)
+    drawn = []
+    column_width = width // columns
+    for col in range(columns):
+        for baseline in range(40, height - 10, 40):
+            line = " ".join(rng.choice(WORDS, size=3))
+            cv2.putText(image, line, (col * column_width + 20, baseline), FONT, 0.9, (20, 20, 20), 2, cv2.LINE_AA)
+            drawn.extend(line.split())
+    return image, drawn
+
+
+def degrade(image: np.ndarray, noise_sigma: float = 0.0, blur: int = 0, seed: int = 11) -> np.ndarray:
+    """Adds Gaussian noise and/or box blur, as seen on scaled remote-desktop or camera captures."""
+    out = image
+    if blur:
+        out = cv2.blur(out, (blur, blur))
+    if noise_sigma:
+        rng = np.random.default_rng(seed)
+        noisy = out.astype(np.float32) + rng.normal(0, noise_sigma, out.shape).astype(np.float32)
+        out = np.clip(noisy, 0, 255).astype(np.uint8)
+    return out
+
+
+def word_recall(words, drawn) -> float:
+    """Share of drawn words found in recognized words (OCRFrame.words), counting duplicates."""
+    expected = Counter(drawn)
+    found = Counter(word["text"].lower() for word in words)
+    return sum(min(count, found[word]) for word, count in expected.items()) / max(1, len(drawn))
+
+
+FORM_FIELDS = ("First name", "Last name", "Email", "Phone", "Company", "City", "Postal code", "Country")
+
+
+def render_form(width: int = 1920, height: int = 1080, seed: int = 3):
+    """
+    A form screen: rows of "label  [input]" pairs in two columns plus a row of
+    buttons, tiled to fill the frame. Returns (BGR image, list of
+    (kind, (x, y, w, h), text)) with the drawn boxes.
+    """
+    rng = np.random.default_rng(seed)
+    image = np.full((height, width, 3), 245, dtype=np.uint8)
+    truth = []
+    column_width = 900
+    row = 0
+    for top in range(30, height - 110, 60):
+        for left in range(30, width - column_width + 1, column_width):
+            label = FORM_FIELDS[row % len(FORM_FIELDS)]
+            row += 1
+            (tw, th), _ = cv2.getTextSize(label, FONT, 0.7, 2)
+            cv2.putText(image, label, (left, top + 28), FONT, 0.7, (30, 30, 30), 2, cv2.LINE_AA)
+            truth.append(("label", (left, top + 28 - th, tw, th), label))
+            fx, fw = left + 220 + int(rng.integers(0, 40)), 420
+            cv2.rectangle(image, (fx, top + 6), (fx + fw, top + 42), (255, 255, 255), -1)
+            cv2.rectangle(image, (fx, top + 6), (fx + fw, top + 42), (150, 150, 150), 1)
+            truth.append(("input", (fx, top + 6, fw + 1, 37), label))
+    for i, text in enumerate(("Submit", "Cancel", "Reset")):
+        x, y = 30 + i * 180, height - 80
+        cv2.rectangle(image, (x, y), (x + 150, y + 44), (60, 120, 200), -1)
+        cv2.rectangle(image, (x, y), (x + 150, y + 44), (40, 80, 160), 2)
+        cv2.putText(image, text, (x + 25, y + 30), FONT, 0.7, (255, 255, 255), 2, cv2.LINE_AA)
+        truth.append(("button", (x, y, 151, 45), text))
+    return image, truth
+
+
+def render_icon(size: int = 32) -> np.ndarray:
+    """A textless gear-like icon (BGR), the kind of target OCR cannot find."""
+    icon = np.full((size, size, 3), 245, dtype=np.uint8)
+    center, radius = (size // 2, size // 2), size // 3
+    for angle in range(0, 360, 45):
+        tip = (int(center[0] + np.cos(np.radians(angle)) * size * 0.45), int(center[1] + np.sin(np.radians(angle)) * size * 0.45))
+        cv2.line(icon, center, tip, (60, 60, 60), max(2, size // 10))
+    cv2.circle(icon, center, radius, (60, 60, 60), -1)
+    cv2.circle(icon, center, radius // 2, (245, 245, 245), -1)
+    return icon
+
+
+def place(image: np.ndarray, patch: np.ndarray, x: int, y: int, scale: float = 1.0) -> tuple:
+    """Draws patch onto image at (x, y), optionally rescaled; returns its (x, y, w, h)."""
+    if scale != 1.0:
+        patch = cv2.resize(patch, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC)
+    h, w = patch.shape[:2]
+    image[y:y + h, x:x + w] = patch
+    return x, y, w, h
+
+
+class Scene(NamedTuple):
+    name: str
+    image: np.ndarray  # BGR
+    truth: list  # {"kind": word|label|input|button, "box": (x, y, w, h), "text": str}
+
+
+def _font(size: int):
+    for name in ("DejaVuSans.ttf", "arial.ttf", "segoeui.ttf", "Helvetica.ttc"):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size=size)
+
+
+def _draw_words(draw, truth, x: int, y: int, text: str, font, fill) -> tuple:
+    """Draws text word by word, recording each word's box; returns the union box."""
+    space = font.getlength(" ")
+    boxes = []
+    for word in text.split():
+        left, top, right, bottom = draw.textbbox((x, y), word, font=font)
+        draw.text((x, y), word, font=font, fill=fill)
+        truth.append({"kind": "word", "box": (left, top, right - left, bottom - top), "text": word})
+        boxes.append((left, top, right, bottom))
+        x = right + space
+    x0, y0 = min(b[0] for b in boxes), min(b[1] for b in boxes)
+    return x0, y0, max(b[2] for b in boxes) - x0, max(b[3] for b in boxes) - y0
+
+
+def _button(draw, truth, x: int, y: int, text: str, font, dpi: float):
+    pad_x, height = int(18 * dpi), int(36 * dpi)
+    width = max(int(110 * dpi), int(font.getlength(text)) + 2 * pad_x)
+    draw.rectangle((x, y, x + width, y + height), fill=(200, 120, 60), outline=(160, 80, 40), width=max(1, int(2 * dpi)))
+    text_top = y + (height - (font.getbbox(text)[3] - font.getbbox(text)[1])) // 2 - font.getbbox(text)[1]
+    _draw_words(draw, truth, x + pad_x, text_top, text, font, (255, 255, 255))
+    truth.append({"kind": "button", "box": (x, y, width + 1, height + 1), "text": text})
+    return width
+
+
+def render_scene(kind: str, dpi: float = 1.0, size=(1280, 800), seed: int = 0) -> Scene:
+    """
+    Renders a synthetic UI screen with PIL at a display scale (dpi 1.0 = 100%):
+    "form" (labels, input fields and buttons), "buttons" (a toolbar grid) or
+    "dense_text" (paragraphs of small text). The ground truth lists every
+    word, label (text run), input and button box.
+    """
+    rng = np.random.default_rng(seed)
+    width, height = size
+    canvas = Image.new("RGB", size, (245, 245, 245))
+    draw = ImageDraw.Draw(canvas)
+    truth = []
+    font = _font(int(15 * dpi))
+
+    if kind == "form":
+        row_height, field_width = int(48 * dpi), int(320 * dpi)
+        y = int(24 * dpi)
+        labels = list(FORM_FIELDS)
+        while y + row_height < height - int(80 * dpi):
+            x = int(24 * dpi)
+            while x + int(560 * dpi) < width:
+                label = labels[int(rng.integers(len(labels)))]
+                box = _draw_words(draw, truth, x, y + int(8 * dpi), label, font, (30, 30, 30))
+                truth.append({"kind": "label", "box": box, "text": label})
+                fx, fy = x + int(150 * dpi), y
+                draw.rectangle((fx, fy, fx + field_width, fy + int(32 * dpi)), fill=(255, 255, 255), outline=(150, 150, 150))
+                truth.append({"kind": "input", "box": (fx, fy, field_width + 1, int(32 * dpi) + 1), "text": label})
+                x += int(600 * dpi)
+            y += row_height
+        x = int(24 * dpi)
+        for text in ("Submit", "Cancel", "Reset"):
+            x += _button(draw, truth, x, height - int(60 * dpi), text, font, dpi) + int(20 * dpi)
+    elif kind == "buttons":
+        y = int(24 * dpi)
+        while y + int(36 * dpi) < height:
+            x = int(24 * dpi)
+            while x + int(200 * dpi) < width:
+                x += _button(draw, truth, x, y, str(rng.choice(WORDS)).capitalize(), font, dpi) + int(24 * dpi)
+            y += int(60 * dpi)
+    elif kind == "dense_text":
+        small = _font(int(12 * dpi))
+        line_height = int(18 * dpi)
+        for y in range(int(12 * dpi), height - line_height, line_height):
+            line = " ".join(str(word) for word in rng.choice(WORDS, size=max(1, int(width / (70 * dpi)))))
+            box = _draw_words(draw, truth, int(12 * dpi), y, line, small, (20, 20, 20))
+            truth.append({"kind": "label", "box": box, "text": line})
+    else:
+        raise ValueError(f"Unknown scene kind: {kind}")
+
+    image = cv2.cvtColor(np.asarray(canvas), cv2.COLOR_RGB2BGR)
+    return Scene(f"{kind}@{int(dpi * 100)}%", image, truth)
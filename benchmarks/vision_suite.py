@@ -0,0 +1,239 @@
+"""
+Vision benchmark suite on synthetic screens (forms, button grids and dense
+text at several display scales) with known ground-truth boxes.
+
+Components measured per scene:
+  ocr              OCREngine.recognize: word precision/recall, latency per frame
+  elements.<kind>  ElementDetector.detect: input/button/label precision/recall
+  locate           the click_text lookup (tile-cached frame + find_text) per label
+  locate_hinted    OCREngine.locate_text with a region hint around the label
+
+Results can be stored as a JSON baseline and later runs compared against it:
+    python -m benchmarks.vision_suite --save benchmarks/baselines/vision.json
+    python -m benchmarks.vision_suite --compare benchmarks/baselines/vision.json
+
+The committed baseline was recorded without Tesseract, so it holds element
+detection only. Its quality numbers hold anywhere; latencies are from the
+machine that recorded it, so re-save before comparing them elsewhere.
+
+OCR components are skipped (with a note) when no Tesseract backend works.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic_ui import render_scene
+from src.safwanbuddy.vision.element_detector import ElementDetector
+from src.safwanbuddy.vision.ocr_engine import OCREngine
+from src.safwanbuddy.vision.tile_cache import TileOCRCache
+
+SCENE_KINDS = ("form", "buttons", "dense_text")
+DPIS = (1.0, 1.25, 1.5, 2.0)
+IOU_MATCH = 0.5
+
+
+def iou(a, b) -> float:
+    ix = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+    iy = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    if ix <= 0 or iy <= 0:
+        return 0.0
+    inter = ix * iy
+    return inter / (a[2] * a[3] + b[2] * b[3] - inter)
+
+
+def match_boxes(predicted, truth, same=lambda p, t: True):
+    """Greedy one-to-one matching by IoU; returns the number of true positives."""
+    used = set()
+    hits = 0
+    for p in predicted:
+        best, best_iou = None, IOU_MATCH
+        for i, t in enumerate(truth):
+            if i not in used and same(p, t):
+                score = iou(p["box"], t["box"])
+                if score >= best_iou:
+                    best, best_iou = i, score
+        if best is not None:
+            used.add(best)
+            hits += 1
+    return hits
+
+
+def summarize(latencies, hits: int, predicted: int, expected: int) -> dict:
+    ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "precision": round(hits / predicted, 4) if predicted else 1.0,
+        "recall": round(hits / expected, 4) if expected else 1.0,
+        "samples": len(latencies),
+    }
+
+
+def _normalize(text: str) -> str:
+    return text.strip(".,:;!?\"'()[]").lower()
+
+
+def bench_ocr(engine, scene, repeat: int):
+    latencies, frame = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        frame = engine.recognize(scene.image)
+        latencies.append(time.perf_counter() - start)
+    predicted = [{"box": w["box"], "text": _normalize(w["text"])} for w in frame.words]
+    truth = [{"box": t["box"], "text": _normalize(t["text"])} for t in scene.truth if t["kind"] == "word"]
+    hits = match_boxes(predicted, truth, lambda p, t: p["text"] == t["text"])
+    return summarize(latencies, hits, len(predicted), len(truth))
+
+
+def bench_elements(detector, scene, repeat: int):
+    latencies, elements = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        elements = detector.detect(scene.image)
+        latencies.append(time.perf_counter() - start)
+    results = {}
+    for kind in ("input", "button", "label"):
+        truth = [t for t in scene.truth if t["kind"] == kind]
+        rows = elements[elements["kind"] == kind]
+        if not truth and not len(rows):
+            continue
+        predicted = [{"box": (int(r["x"]), int(r["y"]), int(r["w"]), int(r["h"]))} for r in rows]
+        results[f"elements.{kind}"] = summarize(latencies, match_boxes(predicted, truth), len(predicted), len(truth))
+    return results
+
+
+def _center_in(match, box) -> bool:
+    x, y, w, h = match[:4]
+    cx, cy = x + w / 2, y + h / 2
+    return box[0] <= cx <= box[0] + box[2] and box[1] <= cy <= box[1] + box[3]
+
+
+def bench_locate(engine, scene, hinted: bool):
+    """The click_text lookup: best-confidence match for each label/button text, scored by its center."""
+    targets = [t for t in scene.truth if t["kind"] in ("label", "button")]
+    engine.tile_cache = TileOCRCache(engine.recognize)  # Cold cache per scene
+    height, width = scene.image.shape[:2]
+    latencies, answered, hits = [], 0, 0
+    for target in targets:
+        start = time.perf_counter()
+        if hinted:
+            x, y, w, h = target["box"]
+            region = (max(0, x - w), max(0, y - 2 * h), min(width, 3 * w), min(height, 5 * h))
+            matches = engine.locate_text(target["text"], region=region, image=scene.image)
+        else:
+            matches = engine.recognize_cached(scene.image).find_text(target["text"])
+        latencies.append(time.perf_counter() - start)
+        if matches:
+            answered += 1
+            # Repeated labels are fine: any instance of the same text counts
+            best = max(matches, key=lambda m: m[4])
+            same_text = [t["box"] for t in targets if t["text"] == target["text"]]
+            hits += any(_center_in(best, box) for box in same_text)
+    return summarize(latencies, hits, answered, len(targets))
+
+
+def ocr_available(engine) -> bool:
+    try:
+        engine.backend.image_to_string(np.full((32, 32), 255, dtype=np.uint8))
+        return True
+    except Exception as e:
+        print(f"note: OCR components skipped ({type(e).__name__}: {e})")
+        return False
+
+
+def run(args) -> dict:
+    engine = OCREngine()
+    detector = ElementDetector()
+    with_ocr = not args.skip_ocr and ocr_available(engine)
+    results = {}
+    for kind in args.scenes:
+        for dpi in args.dpis:
+            scene = render_scene(kind, dpi, size=tuple(args.size))
+            measured = bench_elements(detector, scene, args.repeat)
+            if with_ocr:
+                measured["ocr"] = bench_ocr(engine, scene, args.ocr_repeat)
+                if any(t["kind"] in ("label", "button") for t in scene.truth):
+                    measured["locate"] = bench_locate(engine, scene, hinted=False)
+                    measured["locate_hinted"] = bench_locate(engine, scene, hinted=True)
+            for component, summary in measured.items():
+                results.setdefault(component, {})[scene.name] = summary
+            print(f"  {scene.name}: {', '.join(sorted(measured))}", file=sys.stderr)
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "opencv": cv2.__version__,
+            "machine": platform.machine(),
+            "ocr_backend": engine.backend.name if with_ocr else None,
+            "size": list(args.size),
+        },
+        "results": results,
+    }
+
+
+def print_report(report: dict):
+    print(f"{'component':<18} {'scene':<18} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'prec':>6} {'recall':>6}")
+    for component, scenes in sorted(report["results"].items()):
+        for scene, s in scenes.items():
+            print(f"{component:<18} {scene:<18} {s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} {s['p99_ms']:>9.2f} "
+                  f"{s['precision']:>6.2f} {s['recall']:>6.2f}")
+
+
+def compare(report: dict, baseline: dict, latency_tolerance: float, quality_tolerance: float):
+    """Prints regressions against baseline; returns how many were found."""
+    regressions = 0
+    for component, scenes in sorted(report["results"].items()):
+        for scene, current in scenes.items():
+            base = baseline.get("results", {}).get(component, {}).get(scene)
+            if base is None:
+                continue
+            problems = []
+            if current["p50_ms"] > base["p50_ms"] * (1 + latency_tolerance):
+                problems.append(f"p50 {base['p50_ms']:.2f} -> {current['p50_ms']:.2f} ms")
+            for metric in ("precision", "recall"):
+                if current[metric] < base[metric] - quality_tolerance:
+                    problems.append(f"{metric} {base[metric]:.2f} -> {current[metric]:.2f}")
+            if problems:
+                regressions += 1
+                print(f"REGRESSION {component} {scene}: {'; '.join(problems)}")
+    print(f"{regressions} regression(s) against baseline from {baseline.get('meta', {}).get('created', '?')}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic-screen vision benchmark suite")
+    parser.add_argument("--scenes", nargs="+", default=list(SCENE_KINDS), choices=SCENE_KINDS)
+    parser.add_argument("--dpis", type=float, nargs="+", default=list(DPIS))
+    parser.add_argument("--size", type=int, nargs=2, default=[1280, 800], metavar=("W", "H"))
+    parser.add_argument("--repeat", type=int, default=10, help="runs per scene for detection")
+    parser.add_argument("--ocr-repeat", type=int, default=3, help="runs per scene for full-frame OCR")
+    parser.add_argument("--skip-ocr", action="store_true")
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline; exit 1 on regression")
+    parser.add_argument("--latency-tolerance", type=float, default=0.2, help="allowed relative p50 increase")
+    parser.add_argument("--quality-tolerance", type=float, default=0.02, help="allowed absolute precision/recall drop")
+    args = parser.parse_args()
+
+    report = run(args)
+    print_report(report)
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or ".", exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"saved baseline to {args.save}")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.latency_tolerance, args.quality_tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,20 +6,16 @@ class CalculatorPlugin(PluginBase):
         super().__init__()
         self.name = "Calculator"
         self.description = "Performs basic math"
+        self.intents = {
+            "calculate": {"patterns": [r"calculate (.+)"], "handler": "handle_command"}
+        }
 
-    def activate(self):
-        self.event_bus.subscribe("voice_command", self.handle_command)
-
-    def handle_command(self, text: str):
-        if "calculate" in text.lower():
-            # Very basic extraction
-            try:
-                expr = text.lower().replace("calculate", "").strip()
-                result = eval(expr, {"__builtins__": None}, {})
-                logger.info(f"Calculation Result: {result}")
-                self.event_bus.emit("system_log", f"Calculator: {expr} = {result}")
-            except Exception as e:
-                logger.error(f"Calculation Error: {e}")
-
-    def deactivate(self):
-        self.event_bus.unsubscribe("voice_command", self.handle_command)
+    def handle_command(self, args):
+        # Very basic extraction
+        try:
+            expr = args[0].strip()
+            result = eval(expr, {"__builtins__": None}, {})
+            logger.info(f"Calculation Result: {result}")
+            self.event_bus.emit("system_log", f"Calculator: {expr} = {result}")
+        except Exception as e:
+            logger.error(f"Calculation Error: {e}")
@@ -6,14 +6,15 @@ class HelloPlugin(PluginBase):
         super().__init__()
         self.name = "Hello Plugin"
         self.description = "A simple plugin that says hello."
+        self.intents = {
+            "hello": {"phrases": ["hello"], "handler": "on_hello"}
+        }
 
     def activate(self):
         logger.info(f"{self.name} activated!")
-        self.event_bus.subscribe("voice_command", self.on_voice_command)
 
-    def on_voice_command(self, text):
-        if "hello" in text.lower():
-            logger.info("HelloPlugin: I heard hello!")
+    def on_hello(self, args):
+        logger.info("HelloPlugin: I heard hello!")
 
     def deactivate(self):
         logger.info(f"{self.name} deactivated.")
@@ -2,51 +2,54 @@ from src.safwanbuddy.core.plugin_loader import PluginBase
 from src.safwanbuddy.core.logging import logger
 from src.safwanbuddy.utils.win_utils import WinUtils
 import os
-import re
 
 class SystemOpsPlugin(PluginBase):
     def __init__(self):
         super().__init__()
         self.name = "System Operations"
         self.description = "Handles advanced system control, volume, brightness, and power"
+        self.intents = {
+            "lock_workstation": {"phrases": ["lock workstation", "lock pc"], "handler": "lock_workstation"},
+            "shutdown_pc": {"phrases": ["shutdown pc", "turn off computer"], "handler": "shutdown_pc"},
+            "restart_pc": {"phrases": ["restart pc"], "handler": "restart_pc"},
+            "sleep_pc": {"phrases": ["put pc to sleep"], "handler": "sleep_pc"},
+            "set_volume": {"patterns": [r"set volume to (\d+) percent"], "handler": "set_volume"},
+            "set_brightness": {"patterns": [r"set brightness to (\d+) percent"], "handler": "set_brightness"},
+            "open_notepad": {"phrases": ["open notepad"], "handler": "open_notepad"},
+            "close_notepad": {"phrases": ["close notepad"], "handler": "close_notepad"},
+        }
 
     def activate(self):
-        self.event_bus.subscribe("voice_command", self.handle_command)
         self.event_bus.subscribe("system_control", self.handle_control)
 
-    def handle_command(self, text: str):
-        text = text.lower()
-        
-        # Power commands
-        if "lock workstation" in text or "lock pc" in text:
-            logger.info("Locking workstation...")
-            os.system("rundll32.exe user32.dll,LockWorkStation")
-        elif "shutdown pc" in text or "turn off computer" in text:
-            WinUtils.power_action("shutdown")
-        elif "restart pc" in text:
-            WinUtils.power_action("restart")
-        elif "put pc to sleep" in text:
-            WinUtils.power_action("sleep")
-            
-        # Volume control
-        volume_match = re.search(r"set volume to (\d+) percent", text)
-        if volume_match:
-            level = int(volume_match.group(1)) / 100.0
-            WinUtils.set_volume(level)
-            logger.info(f"Volume set to {level*100}%")
-        
-        # Brightness control
-        brightness_match = re.search(r"set brightness to (\d+) percent", text)
-        if brightness_match:
-            level = int(brightness_match.group(1))
-            WinUtils.set_brightness(level)
-            logger.info(f"Brightness set to {level}%")
+    def lock_workstation(self, args):
+        logger.info("Locking workstation...")
+        os.system("rundll32.exe user32.dll,LockWorkStation")
+
+    def shutdown_pc(self, args):
+        WinUtils.power_action("shutdown")
+
+    def restart_pc(self, args):
+        WinUtils.power_action("restart")
+
+    def sleep_pc(self, args):
+        WinUtils.power_action("sleep")
+
+    def set_volume(self, args):
+        level = int(args[0]) / 100.0
+        WinUtils.set_volume(level)
+        logger.info(f"Volume set to {level*100}%")
+
+    def set_brightness(self, args):
+        level = int(args[0])
+        WinUtils.set_brightness(level)
+        logger.info(f"Brightness set to {level}%")
+
+    def open_notepad(self, args):
+        os.system("notepad.exe")
 
-        # App management
-        elif "open notepad" in text:
-            os.system("notepad.exe")
-        elif "close notepad" in text:
-            WinUtils.close_window("Notepad")
+    def close_notepad(self, args):
+        WinUtils.close_window("Notepad")
 
     def handle_control(self, data: dict):
         action = data.get("action")
@@ -73,5 +76,4 @@ class SystemOpsPlugin(PluginBase):
                 os.system("powercfg /setactive 8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c")
 
     def deactivate(self):
-        self.event_bus.unsubscribe("voice_command", self.handle_command)
         self.event_bus.unsubscribe("system_control", self.handle_control)
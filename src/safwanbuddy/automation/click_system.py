@@ -1,28 +1,68 @@
 import pyautogui
 import time
-from src.safwanbuddy.vision import ocr_engine, screen_capture
+import cv2
+from src.safwanbuddy.vision import ocr_engine, screen_capture, template_matcher
 from src.safwanbuddy.core import logger, event_bus
+from src.safwanbuddy.vision.screen_watcher import screen_watcher
+from src.safwanbuddy.vision.ocr_engine import PSM_SINGLE_LINE
+from src.safwanbuddy.automation.locate_cache import LocateCache
 
 class ClickSystem:
     def __init__(self):
         pyautogui.FAILSAFE = True
+        self.locate_cache = LocateCache()
 
     def _human_move(self, x, y):
         """Moves the mouse in a human-like curve."""
         pyautogui.moveTo(x, y, duration=0.5, tween=pyautogui.easeInOutQuad)
 
-    def click_text(self, text: str, double_click: bool = False):
+    @staticmethod
+    def _ocr_box(image, box, text):
+        """Tiny single-line OCR of a remembered box, padded so glyphs do not touch the edge."""
+        pad = 8
+        padded = cv2.copyMakeBorder(image, pad, pad, pad, pad, cv2.BORDER_REPLICATE)
+        frame = ocr_engine.recognize(padded, psm=PSM_SINGLE_LINE, offset=(box[0] - pad, box[1] - pad))
+        return frame.find_text(text)
+
+    def _locate_cached(self, text: str):
+        """Remembered box for text in the current window, if it still verifies on screen."""
+        key = self.locate_cache.key(text)
+        try:
+            box = self.locate_cache.verify(key, lambda b: screen_capture.capture(region=b, mode="gray"),
+                                           lambda image, b: self._ocr_box(image, b, text))
+        except Exception as e:
+            logger.debug(f"Locate cache verification failed for '{text}': {e}")
+            self.locate_cache.forget(key)
+            box = None
+        return key, box
+
+    def click_text(self, text: str, double_click: bool = False, region=None, whitelist=None):
+        """
+        region (x, y, w, h) hints where the text should be; only that crop is OCRed unless it misses.
+        Without a hint, the box of the last hit in the same window is verified first and the full
+        screen is only searched when that fails.
+        """
         logger.info(f"Attempting to click text: {text}")
-        screenshot = screen_capture.capture()
-        results = ocr_engine.find_text(screenshot, text)
-        
-        if not results:
-            logger.warning(f"Could not find text '{text}' on screen.")
-            return False
+        key, cached = (None, None) if region else self._locate_cached(text)
+        if cached:
+            x, y, w, h = cached
+        else:
+            if region:
+                results = ocr_engine.locate_text(text, region=region, whitelist=whitelist)
+            else:
+                self.locate_cache.searched()
+                screenshot = screen_watcher.latest_or_capture()
+                # Unchanged screen regions are answered from the tile OCR cache
+                results = ocr_engine.recognize_cached(screenshot).find_text(text)
+
+            if not results:
+                logger.warning(f"Could not find text '{text}' on screen.")
+                return False
 
-        # Pick the highest confidence result
-        best_match = max(results, key=lambda x: x[4])
-        x, y, w, h, conf = best_match
+            # Pick the highest confidence result
+            x, y, w, h, conf = max(results, key=lambda x: x[4])
+            if key is not None:
+                self.locate_cache.remember(key, (x, y, w, h), screenshot)
         
         center_x = x + w // 2
         center_y = y + h // 2
@@ -36,6 +76,33 @@ class ClickSystem:
         event_bus.emit("system_log", f"Clicked '{text}' at ({center_x}, {center_y})")
         return True
 
+    def get_locate_stats(self):
+        """Hit/miss counts of the click_text locate cache."""
+        return self.locate_cache.stats()
+
+    def click_template(self, name: str, double_click: bool = False, region=None):
+        """Clicks a textless control (icon) from the template library."""
+        logger.info(f"Attempting to click template: {name}")
+        screenshot = screen_watcher.latest_or_capture()
+        match = template_matcher.find(screenshot, name, region)
+
+        if not match:
+            logger.warning(f"Could not find template '{name}' on screen.")
+            return False
+
+        x, y, w, h, score = match
+        center_x = x + w // 2
+        center_y = y + h // 2
+
+        self._human_move(center_x, center_y)
+        if double_click:
+            pyautogui.doubleClick()
+        else:
+            pyautogui.click()
+
+        event_bus.emit("system_log", f"Clicked template '{name}' at ({center_x}, {center_y}) score {score:.2f}")
+        return True
+
     def click_at(self, x, y, double_click=False):
         self._human_move(x, y)
         if double_click:
@@ -0,0 +1,165 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, NamedTuple
+
+UI_LANE = "ui"
+IO_LANE = "io"
+
+# Steps that never touch mouse or keyboard and may overlap; anything else is serialized on the UI lane
+IO_STEP_TYPES = {"document_request", "expert_event", "notification", "wait", "compute"}
+IO_ACTIONS = {("web_request", "compare_price")}
+
+
+def lane_for(step_type: str, action: str = None, lane: str = None) -> str:
+    """The lane a step runs on: an explicit lane, else io for known input-free steps, else ui."""
+    if lane in (UI_LANE, IO_LANE):
+        return lane
+    if step_type in IO_STEP_TYPES or (step_type, action) in IO_ACTIONS:
+        return IO_LANE
+    return UI_LANE
+
+
+class DagError(ValueError):
+    """Duplicate ids, unknown dependencies or a dependency cycle."""
+
+
+class DagNode(NamedTuple):
+    id: str
+    needs: tuple
+    lane: str
+    action: Callable[[], Any]
+    order: int = 0  # Tie-break among ready nodes: UI steps keep their file order
+
+
+class NodeTiming(NamedTuple):
+    id: str
+    lane: str
+    start_ms: float
+    end_ms: float
+
+
+class ScheduleReport(NamedTuple):
+    total_ms: float  # wall clock for the whole graph
+    critical_ms: float  # longest dependency chain by measured step durations
+    serial_ms: float  # sum of step durations, i.e. a strictly linear run
+    critical_path: list  # node ids along the critical chain
+    timings: dict  # id -> NodeTiming
+
+
+def toposort(nodes) -> list:
+    """Validates the graph and returns its nodes in a dependency-respecting order."""
+    by_id = {}
+    for node in nodes:
+        if node.id in by_id:
+            raise DagError(f"Duplicate step id {node.id!r}")
+        by_id[node.id] = node
+    for node in nodes:
+        unknown = [need for need in node.needs if need not in by_id]
+        if unknown:
+            raise DagError(f"Step {node.id!r} needs unknown step(s) {', '.join(map(repr, unknown))}")
+    pending = {node.id: len(set(node.needs)) for node in nodes}
+    dependents = {node.id: [] for node in nodes}
+    for node in nodes:
+        for need in set(node.needs):
+            dependents[need].append(node.id)
+    ready = sorted((by_id[i] for i, count in pending.items() if count == 0), key=lambda n: n.order)
+    ordered = []
+    while ready:
+        node = ready.pop(0)
+        ordered.append(node)
+        for dependent in dependents[node.id]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                ready.append(by_id[dependent])
+        ready.sort(key=lambda n: n.order)
+    if len(ordered) != len(nodes):
+        cycle = sorted(i for i, count in pending.items() if count > 0)
+        raise DagError(f"Dependency cycle among steps {', '.join(cycle)}")
+    return ordered
+
+
+def critical_path(nodes, timings: dict):
+    """(length ms, ids) of the longest chain of measured durations through the graph."""
+    finish, previous = {}, {}
+    for node in toposort(nodes):
+        duration = timings[node.id].end_ms - timings[node.id].start_ms
+        before = max(node.needs, key=lambda need: finish[need], default=None)
+        finish[node.id] = (finish[before] if before else 0.0) + duration
+        previous[node.id] = before
+    if not finish:
+        return 0.0, []
+    end = max(finish, key=finish.get)
+    path = [end]
+    while previous[path[-1]]:
+        path.append(previous[path[-1]])
+    return finish[end], path[::-1]
+
+
+class DagScheduler:
+    """
+    Runs a graph of steps as soon as their dependencies finish. io steps run
+    concurrently on a thread pool; ui steps (mouse, keyboard, anything that
+    needs the focused window) go through a single thread in file order, so
+    input never interleaves. The first failure stops new steps from starting
+    and is raised once the running ones have finished.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+
+    def run(self, nodes, should_continue: Callable[[], bool] = None) -> ScheduleReport:
+        nodes = list(nodes)
+        toposort(nodes)  # Validate before anything runs
+        by_id = {node.id: node for node in nodes}
+        pending = {node.id: len(set(node.needs)) for node in nodes}
+        dependents = {node.id: [] for node in nodes}
+        for node in nodes:
+            for need in set(node.needs):
+                dependents[need].append(node.id)
+
+        clock = time.perf_counter
+        origin = clock()
+        timings, lock = {}, threading.Lock()
+
+        def execute(node):
+            start = clock()
+            try:
+                return node.action()
+            finally:
+                end = clock()
+                with lock:
+                    timings[node.id] = NodeTiming(node.id, node.lane, (start - origin) * 1000, (end - origin) * 1000)
+
+        ready = sorted((by_id[i] for i, count in pending.items() if count == 0), key=lambda n: n.order)
+        running, failure = {}, None
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="dag-ui") as ui_lane, \
+                ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="dag-io") as io_pool:
+            while ready or running:
+                if failure is None and (should_continue is None or should_continue()):
+                    for node in ready:
+                        pool = ui_lane if node.lane == UI_LANE else io_pool
+                        running[pool.submit(execute, node)] = node
+                ready = []
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        failure = failure or error
+                        continue
+                    for dependent in dependents[node.id]:
+                        pending[dependent] -= 1
+                        if pending[dependent] == 0:
+                            ready.append(by_id[dependent])
+                ready.sort(key=lambda n: n.order)
+        if failure is not None:
+            raise failure
+
+        total_ms = (clock() - origin) * 1000
+        finished = [node for node in nodes if node.id in timings]
+        critical_ms, path = critical_path(finished, timings) if len(finished) == len(nodes) else (0.0, [])
+        serial_ms = sum(t.end_ms - t.start_ms for t in timings.values())
+        return ScheduleReport(total_ms, critical_ms, serial_ms, path, timings)
@@ -3,8 +3,21 @@ import threading
 import json
 import os
 import re
+from functools import partial
 from src.safwanbuddy.core.events import event_bus
 from src.safwanbuddy.core.logging import logger
+from src.safwanbuddy.core.config import config_manager
+from src.safwanbuddy.automation.wait_conditions import WaitTimeout, wait_conditions
+from src.safwanbuddy.automation.dag_scheduler import DagNode, DagScheduler, UI_LANE, lane_for
+
+# Steps that click, type or open and close windows; only these leave the screen changing
+INPUT_STEP_TYPES = {"voice_command", "social_request"}
+INPUT_ACTIONS = {
+    ("automation_request", "open_browser"), ("automation_request", "search"),
+    ("automation_request", "type_profile"), ("automation_request", "click_text"),
+    ("automation_request", "fill_form"), ("automation_request", "run_workflow"),
+    ("web_request", "search"), ("system_control", "close_window"),
+}
 
 class TaskPlanner:
     def __init__(self):
@@ -56,17 +69,17 @@ class TaskPlanner:
         if match:
             topic = match.group(1).strip()
             self.shared_memory["topic"] = topic
+            # Price comparison is pure I/O and overlaps the browser search; the report needs both
             return [
-                {"type": "expert_event", "data": {"status": "Initializing intelligence gathering on: {topic}"}},
-                {"type": "web_request", "data": {"action": "search", "query": "{topic}"}},
-                {"type": "wait", "data": 2},
-                {"type": "expert_event", "data": {"status": "Analyzing search results and extracting key data..."}},
-                {"type": "web_request", "data": {"action": "compare_price", "product": "{topic}"}},
-                {"type": "wait", "data": 3},
-                {"type": "document_request", "data": {"action": "generate_report", "topic": "{topic}"}},
-                {"type": "expert_event", "data": {"status": "Synthesizing executive summary..."}},
-                {"type": "social_request", "data": {"action": "message", "name": "Admin", "message": "Intelligence report on {topic} is complete and archived."}},
-                {"type": "notification", "data": "Expert Mode: Mission Accomplished for {topic}"}
+                {"id": "start", "type": "expert_event", "data": {"status": "Initializing intelligence gathering on: {topic}"}},
+                {"id": "search", "needs": ["start"], "type": "web_request", "data": {"action": "search", "query": "{topic}"}},
+                {"id": "loaded", "needs": ["search"], "type": "wait", "data": 2},
+                {"id": "analyze", "needs": ["loaded"], "type": "expert_event", "data": {"status": "Analyzing search results and extracting key data..."}},
+                {"id": "prices", "needs": ["start"], "type": "web_request", "data": {"action": "compare_price", "product": "{topic}"}},
+                {"id": "report", "needs": ["analyze", "prices"], "type": "document_request", "data": {"action": "generate_report", "topic": "{topic}"}},
+                {"id": "summary", "needs": ["report"], "type": "expert_event", "data": {"status": "Synthesizing executive summary..."}},
+                {"id": "message", "needs": ["report"], "type": "social_request", "data": {"action": "message", "name": "Admin", "message": "Intelligence report on {topic} is complete and archived."}},
+                {"id": "done", "needs": ["summary", "message"], "type": "notification", "data": "Expert Mode: Mission Accomplished for {topic}"}
             ]
 
         # 2. Automated Profile & Onboarding Chain
@@ -152,25 +165,28 @@ class TaskPlanner:
         
         executed_steps = []
         try:
-            for i, step in enumerate(steps):
-                if not self.is_running: break
-                
-                # Resolve variables before execution
-                resolved_data = self._resolve_variables(step["data"]) if "data" in step else None
-                
-                if step["type"] == "wait":
-                    time.sleep(resolved_data)
-                    continue
-                
-                logger.info(f"Expert Mode Step {i+1}/{len(steps)}: {step['type']}")
-                event_bus.emit(step["type"], resolved_data)
-                
-                # Simulate capturing output to shared memory for some steps
-                if step["type"] == "web_request" and resolved_data.get("action") == "search":
-                    self.shared_memory["search_results"] = f"Top results for {resolved_data.get('query')}: [AI is evolving fast, ...]"
-                
-                executed_steps.append({"step": step, "resolved_data": resolved_data, "timestamp": time.time(), "status": "success"})
-                time.sleep(2)
+            if any("needs" in step for step in steps):
+                report = DagScheduler(config_manager.get("automation.max_workers", 5)).run(
+                    (DagNode(step.get("id", str(i)), tuple(step.get("needs", ())), self._lane(step),
+                             partial(self._run_step, i, step, len(steps), executed_steps), i)
+                     for i, step in enumerate(steps)),
+                    should_continue=lambda: self.is_running)
+                logger.info(f"Expert Mode took {report.total_ms:.0f} ms; critical path {report.critical_ms:.0f} ms "
+                            f"({' -> '.join(report.critical_path)}), {report.serial_ms:.0f} ms of steps in total")
+            else:
+                waiter = None
+                try:
+                    for i, step in enumerate(steps):
+                        if not self.is_running: break
+                        # An event wait subscribes before the step ahead of it, which may emit the event
+                        following = steps[i + 1] if i + 1 < len(steps) else None
+                        ahead = wait_conditions.arm(self._resolve_variables(following["data"])) \
+                            if self._is_event_wait(following) else None
+                        self._run_step(i, step, len(steps), executed_steps, waiter)
+                        waiter = ahead
+                finally:
+                    if waiter is not None:
+                        waiter.close()
             
             event_bus.emit("action_result", {"success": True, "message": "Autonomous task completed successfully."})
             self._log_history(goal, executed_steps, "completed")
@@ -183,6 +199,68 @@ class TaskPlanner:
             self.is_running = False
             event_bus.emit("system_state", "idle")
 
+    @staticmethod
+    def _lane(step):
+        data = step.get("data")
+        return lane_for(step["type"], data.get("action") if isinstance(data, dict) else None, step.get("lane"))
+
+    @staticmethod
+    def _is_event_wait(step) -> bool:
+        return step is not None and step["type"] == "wait" and isinstance(step.get("data"), dict) \
+            and step["data"].get("until") == "event"
+
+    def _run_step(self, i, step, total, executed_steps, waiter=None):
+        # Resolve variables before execution
+        resolved_data = self._resolve_variables(step["data"]) if "data" in step else None
+
+        if step["type"] == "wait":
+            self._wait(resolved_data, waiter)
+            return
+
+        logger.info(f"Expert Mode Step {i+1}/{total}: {step['type']}")
+        event_bus.emit(step["type"], resolved_data)
+
+        # Simulate capturing output to shared memory for some steps
+        if step["type"] == "web_request" and resolved_data.get("action") == "search":
+            self.shared_memory["search_results"] = f"Top results for {resolved_data.get('query')}: [AI is evolving fast, ...]"
+
+        executed_steps.append({"step": step, "resolved_data": resolved_data, "timestamp": time.time(), "status": "success"})
+        if self._lane(step) == UI_LANE and self._produces_input(step, resolved_data):
+            region = step.get("region") or (resolved_data.get("region") if isinstance(resolved_data, dict) else None)
+            self._settle(region=tuple(region) if region else None)
+
+    @staticmethod
+    def _produces_input(step, data) -> bool:
+        """Whether to wait for the screen after a step; "settle": true/false on the step overrides."""
+        if "settle" in step:
+            return bool(step["settle"])
+        action = data.get("action") if isinstance(data, dict) else None
+        return step["type"] in INPUT_STEP_TYPES or (step["type"], action) in INPUT_ACTIONS
+
+    def _wait(self, spec, waiter=None):
+        """
+        A number is an upper bound: return once the screen has settled, at most that many seconds.
+        A dict is a wait condition, e.g. {"until": "text", "text": "Results", "timeout": 8}.
+        """
+        if isinstance(spec, dict):
+            wait_conditions.until(spec, waiter)
+        else:
+            self._settle(timeout=float(spec))
+
+    def _settle(self, timeout: float = None, region=None):
+        """Waits for region (default: the whole screen) to stop changing, at most timeout seconds."""
+        timeout = timeout if timeout is not None else config_manager.get("automation.settle_timeout", 2.0)
+        try:
+            wait_conditions.stable(region, duration=config_manager.get("automation.settle_duration", 0.4),
+                                   change_timeout=config_manager.get("automation.settle_change_timeout", 0.5),
+                                   timeout=timeout)
+        except WaitTimeout:
+            logger.debug(f"Screen still changing after {timeout}s; continuing")
+        except Exception as e:
+            # No screen to watch (headless, capture error): fall back to the fixed pause
+            logger.warning(f"Cannot watch the screen to settle ({e}); sleeping {timeout}s")
+            time.sleep(timeout)
+
     def _log_history(self, goal, steps, status):
         history_entry = {
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
@@ -1,6 +1,9 @@
 from src.safwanbuddy.automation import click_system, type_system
 from src.safwanbuddy.core import event_bus, logger
-from src.safwanbuddy.vision import screen_capture, ocr_engine
+from src.safwanbuddy.vision import ocr_engine, element_detector
+from src.safwanbuddy.vision.element_detector import INPUT
+from src.safwanbuddy.vision.screen_watcher import screen_watcher
+from src.safwanbuddy.vision.spatial_index import SpatialIndex
 import time
 
 class FormFiller:
@@ -33,8 +36,9 @@ class FormFiller:
         self.is_filling = True
         self.results = []
         
-        # Capture screen and find potential fields
-        screenshot = screen_capture.capture()
+        # Capture and recognize the screen once; every lookup below reuses it
+        screenshot = screen_watcher.latest_or_capture()
+        frame = ocr_engine.recognize(screenshot)
         self.pending_fields = []
         
         # Search for fields based on profile keys
@@ -44,7 +48,7 @@ class FormFiller:
             
             all_matches = []
             for term in search_terms:
-                matches = ocr_engine.find_text(screenshot, term)
+                matches = frame.find_text(term)
                 if matches:
                     all_matches.extend(matches)
             
@@ -53,6 +57,12 @@ class FormFiller:
                 best_match = max(all_matches, key=lambda m: m[4])
                 self.pending_fields.append({"label": key, "value": value, "rect": best_match[:4]})
 
+        # Resolve every label to its input field in one batched query over the frame
+        index = SpatialIndex.from_frame(frame, element_detector.detect(screenshot, (INPUT,)))
+        targets = index.resolve_fields({field["label"]: field["rect"] for field in self.pending_fields})
+        for field in self.pending_fields:
+            field["target"] = targets[field["label"]]
+
         if not self.pending_fields:
             logger.warning("No fields detected for guided fill.")
             event_bus.emit("notification", "No fields detected.")
@@ -71,7 +81,7 @@ class FormFiller:
         rect = self.current_field["rect"]
         
         event_bus.emit("notification", f"Fill {label}? [Space] Confirm, [Tab] Skip")
-        event_bus.emit("show_targets", [rect]) # Highlight the field
+        event_bus.emit("show_targets", [self.current_field.get("target") or rect]) # Highlight the field
 
     def _on_field_confirmed(self, target):
         if not self.is_filling or not self.current_field:
@@ -83,7 +93,12 @@ class FormFiller:
         x, y, w, h = self.current_field["rect"]
         
         import pyautogui
-        pyautogui.click(x + w + 20, y + h // 2) # Click slightly to the right of label
+        field_box = self.current_field.get("target")
+        if field_box:
+            tx, ty, tw, th = field_box
+            pyautogui.click(tx + min(tw // 2, 40), ty + th // 2) # Inside the detected field, near its start
+        else:
+            pyautogui.click(x + w + 20, y + h // 2) # Click slightly to the right of label
         time.sleep(0.2)
         type_system.type_text(value)
         
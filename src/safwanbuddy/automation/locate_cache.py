@@ -0,0 +1,73 @@
+import numpy as np
+from src.safwanbuddy.utils.lru_cache import LRUCache
+from src.safwanbuddy.utils.win_utils import WinUtils
+from src.safwanbuddy.vision.preprocessing import to_gray
+
+
+class LocateCache:
+    """
+    Remembers where click_text found a label, keyed by (text, active window
+    title, window geometry). A remembered box is only trusted after it is
+    verified on the current screen: first by comparing a fresh crop with the
+    pixels stored at the last hit, then by OCR of just that box.
+    """
+
+    def __init__(self, maxsize: int = 256, max_diff: float = 6.0):
+        self.entries = LRUCache(maxsize=maxsize)
+        self.max_diff = max_diff  # mean absolute gray difference still counted as unchanged
+        self.counters = {"pixel_verified": 0, "ocr_verified": 0, "verify_failed": 0, "full_searches": 0}
+
+    @staticmethod
+    def key(text: str):
+        return text.lower().strip(), WinUtils.get_active_window_title(), WinUtils.get_active_window_rect()
+
+    @staticmethod
+    def _crop(image: np.ndarray, box):
+        x, y, w, h = box
+        return to_gray(image[y:y + h, x:x + w]).copy()
+
+    def remember(self, key, box, screenshot: np.ndarray):
+        """Stores a hit together with the pixels under its box."""
+        box = tuple(int(v) for v in box[:4])
+        self.entries.put(key, {"box": box, "pixels": self._crop(screenshot, box)})
+
+    def searched(self):
+        """Counts a full-screen search (cache miss or failed verification)."""
+        self.counters["full_searches"] += 1
+
+    def forget(self, key):
+        self.entries.pop(key)
+
+    def verify(self, key, grab, ocr_box):
+        """
+        Returns the remembered box if it still shows the label, else None.
+        grab(box) captures that screen box; ocr_box(image, box) OCRs it and
+        returns the label's box inside it (screen coordinates) or None.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        box = entry["box"]
+        current = to_gray(grab(box))
+        if current.shape == entry["pixels"].shape:
+            diff = np.abs(current.astype(np.int16) - entry["pixels"]).mean()
+            if diff <= self.max_diff:
+                self.counters["pixel_verified"] += 1
+                return box
+
+        # Pixels moved (hover highlight, caret, theme); a tiny OCR of the box decides
+        found = ocr_box(current, box)
+        if found:
+            self.counters["ocr_verified"] += 1
+            self.entries.put(key, {"box": box, "pixels": current.copy()})
+            return box
+        self.counters["verify_failed"] += 1
+        self.forget(key)
+        return None
+
+    def stats(self):
+        hits = self.counters["pixel_verified"] + self.counters["ocr_verified"]
+        misses = self.entries.misses + self.counters["verify_failed"]
+        lookups = hits + misses
+        return {**self.counters, "hits": hits, "misses": misses, "entries": len(self.entries),
+                "hit_ratio": hits / lookups if lookups else 0.0}
@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import cv2
+import numpy as np
+
+
+def screen_hash(gray: np.ndarray, size: int = 16) -> str:
+    """Average hash of a gray screen image: size*size bits as hex."""
+    small = cv2.resize(gray, (size, size), interpolation=cv2.INTER_AREA)
+    bits = (small > small.mean()).flatten()
+    return f"{int(''.join('1' if b else '0' for b in bits), 2):0{size * size // 4}x}"
+
+
+def hash_distance(a: str, b: str) -> int:
+    """Number of differing bits between two screen hashes."""
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+def _jsonable(variables: dict) -> dict:
+    """The variables that survive a JSON round trip; screen crops and other objects are left out."""
+    kept = {}
+    for name, value in variables.items():
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            continue
+        kept[name] = value
+    return kept
+
+
+class CheckpointStore:
+    """
+    Run state of in-progress workflows, one small JSON file per workflow
+    under directory. Each save replaces the file atomically (write to a temp
+    file, then os.replace), so a crash leaves either the previous or the new
+    state, never a torn one. State:
+        {"source", "stamp": [mtime_ns, size], "next": index, "completed": [ids],
+         "variables": {...}, "screen": hash, "failed": {"step", "error"}, "updated"}
+    """
+
+    def __init__(self, directory: str = "data/runs", fsync: bool = False):
+        self.directory = directory
+        self.fsync = fsync
+        self._lock = threading.Lock()
+
+    def path_for(self, source: str) -> str:
+        source = os.path.abspath(source)
+        digest = hashlib.sha1(source.encode("utf-8")).hexdigest()[:12]
+        name = os.path.splitext(os.path.basename(source))[0]
+        return os.path.join(self.directory, f"{name}-{digest}.run.json")
+
+    @staticmethod
+    def stamp(source: str):
+        stat = os.stat(source)
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def save(self, source: str, state: dict):
+        path = self.path_for(source)
+        state = {**state, "source": os.path.abspath(source), "variables": _jsonable(state.get("variables", {})),
+                 "updated": time.time()}
+        data = json.dumps(state, separators=(",", ":"))
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(data)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp, path)
+
+    def load(self, source: str):
+        try:
+            with open(self.path_for(source), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def clear(self, source: str):
+        with self._lock:
+            for path in (self.path_for(source), f"{self.path_for(source)}.tmp"):
+                if os.path.exists(path):
+                    os.remove(path)
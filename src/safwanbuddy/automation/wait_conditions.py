@@ -0,0 +1,239 @@
+import threading
+import time
+from contextlib import contextmanager
+import numpy as np
+from src.safwanbuddy.core import config_manager, event_bus, logger
+from src.safwanbuddy.vision import ocr_engine, screen_capture
+from src.safwanbuddy.vision.ocr_engine import PSM_SPARSE_TEXT, hint_whitelist
+
+
+class WaitTimeout(TimeoutError):
+    """The awaited condition did not hold before the timeout."""
+
+
+def parse_color(color):
+    """(r, g, b) from a tuple/list or a "#rrggbb" string."""
+    if isinstance(color, str):
+        value = color.lstrip("#")
+        if len(value) != 6:
+            raise ValueError(f"Expected #rrggbb, got {color!r}")
+        return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+    if len(color) != 3:
+        raise ValueError(f"Expected (r, g, b), got {color!r}")
+    return tuple(int(c) for c in color)
+
+
+def region_diff(a: np.ndarray, b: np.ndarray) -> float:
+    """Mean absolute gray difference on every other pixel; inf if the shapes differ."""
+    if a is None or b is None or a.shape != b.shape:
+        return float("inf")
+    return float(np.abs(a[::2, ::2].astype(np.int16) - b[::2, ::2]).mean())
+
+
+class EventWaiter:
+    """Collects the first matching event; armed before the action that triggers it."""
+
+    def __init__(self, event_type: str, predicate=None, bus=None):
+        self.event_type = event_type
+        self.predicate = predicate
+        self.data = None
+        self._fired = threading.Event()
+        self._bus = bus
+
+    def close(self):
+        """Unsubscribes from the bus it was armed on; safe to call more than once."""
+        bus, self._bus = self._bus, None
+        if bus is not None:
+            bus.unsubscribe(self.event_type, self)
+
+    def __call__(self, data):
+        if not self._fired.is_set() and (self.predicate is None or self.predicate(data)):
+            self.data = data
+            self._fired.set()
+
+    def wait(self, timeout: float):
+        if not self._fired.wait(timeout):
+            raise WaitTimeout(f"No '{self.event_type}' event within {timeout}s")
+        return self.data
+
+
+class WaitConditions:
+    """
+    Polling waits on small screen regions and bus events, used in place of
+    fixed sleeps. Every wait returns as soon as its condition holds and raises
+    WaitTimeout otherwise. Regions are (x, y, w, h) on the monitor; None is
+    the whole monitor.
+    """
+
+    CONDITIONS = ("region_change", "stable", "text", "pixel", "event")
+
+    def __init__(self, interval: float = None, timeout: float = None, monitor_id: int = 1, capture=None):
+        self.interval = interval or config_manager.get("automation.wait_interval", 0.05)
+        self.timeout = timeout or config_manager.get("automation.wait_timeout", 10.0)
+        self.monitor_id = monitor_id
+        self.capture = capture or screen_capture
+
+    def _grab(self, region, mode: str = "gray") -> np.ndarray:
+        return self.capture.capture(self.monitor_id, region, mode=mode)
+
+    def poll(self, check, timeout: float = None, interval: float = None, what: str = "condition"):
+        """Calls check() every interval until it returns something other than None/False."""
+        timeout = self.timeout if timeout is None else timeout
+        interval = interval or self.interval
+        deadline = time.monotonic() + timeout
+        while True:
+            result = check()
+            if result is not None and result is not False:
+                return result
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise WaitTimeout(f"Timed out after {timeout}s waiting for {what}")
+            time.sleep(min(interval, remaining))
+
+    def region_changed(self, region=None, threshold: float = 2.0, baseline: np.ndarray = None,
+                       timeout: float = None, interval: float = None) -> np.ndarray:
+        """Waits until region differs from baseline (default: its content now); returns the new content."""
+        baseline = self._grab(region) if baseline is None else baseline
+
+        def check():
+            current = self._grab(region)
+            return current if region_diff(current, baseline) > threshold else None
+        return self.poll(check, timeout, interval, f"region {region} to change")
+
+    def stable(self, region=None, duration: float = 0.3, threshold: float = 1.0, change_timeout: float = 0.0,
+               timeout: float = None, interval: float = None) -> np.ndarray:
+        """
+        Waits until region has not changed for duration seconds; returns its content.
+        With change_timeout, first gives the region that long to start changing, so an
+        application that has not begun redrawing yet is not mistaken for a settled one.
+        """
+        started = time.monotonic()
+        timeout = self.timeout if timeout is None else timeout
+        if change_timeout > 0:
+            try:
+                self.region_changed(region, threshold, timeout=min(change_timeout, timeout), interval=interval)
+            except WaitTimeout:
+                pass
+        state = {"image": self._grab(region), "since": time.monotonic()}
+
+        def check():
+            current = self._grab(region)
+            now = time.monotonic()
+            if region_diff(current, state["image"]) > threshold:
+                state["image"], state["since"] = current, now
+                return None
+            return current if now - state["since"] >= duration else None
+        remaining = max(0.0, timeout - (time.monotonic() - started))
+        return self.poll(check, remaining, interval, f"region {region} to settle")
+
+    def text_appears(self, text: str, region=None, whitelist=None, threshold: float = 1.0,
+                     timeout: float = None, interval: float = None):
+        """
+        Waits until text is readable in region; returns its matches in screen
+        coordinates. The region is polled cheaply and only OCRed when it changed.
+        """
+        if whitelist is True:
+            whitelist = hint_whitelist(text)
+        offset = tuple(region[:2]) if region else (0, 0)
+        state = {"image": None}
+
+        def check():
+            current = self._grab(region)
+            if region_diff(current, state["image"]) <= threshold:
+                return None
+            state["image"] = current
+            frame = ocr_engine.recognize(current, psm=PSM_SPARSE_TEXT, whitelist=whitelist, offset=offset)
+            return frame.find_text(text) or None
+        return self.poll(check, timeout, interval, f"text '{text}'")
+
+    def pixel_matches(self, x: int, y: int, color, tolerance: int = 8,
+                      timeout: float = None, interval: float = None):
+        """Waits until the pixel at (x, y) is within tolerance of color (r, g, b or #rrggbb)."""
+        target = np.array(parse_color(color), dtype=np.int16)
+
+        def check():
+            rgb = self._grab((x, y, 1, 1), mode="rgb")[0, 0].astype(np.int16)
+            return tuple(int(c) for c in rgb) if np.abs(rgb - target).max() <= tolerance else None
+        return self.poll(check, timeout, interval, f"pixel ({x}, {y}) to be {color}")
+
+    @contextmanager
+    def expect_event(self, event_type: str, predicate=None):
+        """Subscribes before the block runs so an event emitted inside it is not missed."""
+        waiter = EventWaiter(event_type, predicate, event_bus)
+        event_bus.subscribe(event_type, waiter)
+        try:
+            yield waiter
+        finally:
+            waiter.close()
+
+    def arm(self, spec: dict) -> EventWaiter:
+        """
+        Subscribes an event wait spec now, ahead of the step that triggers the
+        event; bus delivery is synchronous, so subscribing when the wait step
+        itself runs is too late. Pass the waiter to until(), which closes it.
+        """
+        waiter = EventWaiter(spec["event"], self._event_predicate(spec.get("match")), event_bus)
+        event_bus.subscribe(waiter.event_type, waiter)
+        return waiter
+
+    @staticmethod
+    def _event_predicate(match):
+        if not match:
+            return None
+        return lambda data: isinstance(data, dict) and all(data.get(k) == v for k, v in match.items())
+
+    def event(self, event_type: str, predicate=None, timeout: float = None):
+        """Waits for the next matching bus event and returns its data."""
+        with self.expect_event(event_type, predicate) as waiter:
+            return waiter.wait(self.timeout if timeout is None else timeout)
+
+    @classmethod
+    def validate(cls, spec: dict):
+        """Raises ValueError for a wait spec that until() could not run."""
+        until = spec.get("until")
+        if until not in cls.CONDITIONS:
+            raise ValueError(f"'until' must be one of {', '.join(cls.CONDITIONS)}, got {until!r}")
+        required = {"text": ("text",), "pixel": ("x", "y", "color"), "event": ("event",)}.get(until, ())
+        missing = [name for name in required if name not in spec]
+        if missing:
+            raise ValueError(f"wait until {until} needs {', '.join(missing)}")
+        if until == "pixel":
+            parse_color(spec["color"])
+        region = spec.get("region")
+        if region is not None and len(region) != 4:
+            raise ValueError(f"'region' must be [x, y, w, h], got {region!r}")
+
+    def until(self, spec: dict, waiter: EventWaiter = None):
+        """
+        Runs a wait described as data, as workflow and Expert Mode steps do:
+        {"until": "text", "text": "Saved", "region": [x, y, w, h], "timeout": 5, "interval": 0.05}.
+        Event waits take {"event": type, "match": {key: value}} to filter on the event data,
+        and a waiter from arm(spec) if they were subscribed ahead of time.
+        With "optional": true a timeout is logged and None returned instead of raising.
+        """
+        until = spec["until"]
+        region = tuple(spec["region"]) if spec.get("region") else None
+        common = {"timeout": spec.get("timeout"), "interval": spec.get("interval")}
+        try:
+            if until == "region_change":
+                return self.region_changed(region, spec.get("threshold", 2.0), **common)
+            if until == "stable":
+                return self.stable(region, spec.get("duration", 0.3), spec.get("threshold", 1.0),
+                                   spec.get("change_timeout", 0.0), **common)
+            if until == "text":
+                return self.text_appears(spec["text"], region, spec.get("whitelist"), **common)
+            if until == "pixel":
+                return self.pixel_matches(spec["x"], spec["y"], spec["color"], spec.get("tolerance", 8), **common)
+            if waiter is None:
+                return self.event(spec["event"], self._event_predicate(spec.get("match")), common["timeout"])
+            return waiter.wait(self.timeout if common["timeout"] is None else common["timeout"])
+        except WaitTimeout as e:
+            if not spec.get("optional"):
+                raise
+            logger.warning(f"{e}; continuing")
+            return None
+        finally:
+            if waiter is not None:
+                waiter.close()
+
+wait_conditions = WaitConditions()
@@ -1,22 +1,35 @@
 import json
+import os
 import time
 import threading
 import keyboard
 import mouse
-from src.safwanbuddy.core import logger, event_bus
+from src.safwanbuddy.core import config_manager, logger, event_bus
+from src.safwanbuddy.automation.workflow_plan import PlanCache, WorkflowError
+from src.safwanbuddy.automation.run_checkpoint import CheckpointStore, hash_distance, screen_hash
+from src.safwanbuddy.automation.dag_scheduler import DagScheduler
+from src.safwanbuddy.automation.workflow_recorder import WorkflowRecorder, load_recording
 
 class WorkflowEngine:
-    def __init__(self):
+    def __init__(self, recordings_dir: str = "data/recordings"):
         self.workflows = {}
         self.is_recording = False
-        self.recorded_steps = []
-        self._last_event_time = 0
+        self.recordings_dir = recordings_dir
+        self.recorder = None
+        self.plans = PlanCache(self.load_workflow)
+        self.last_timings = []
+        self.last_report = None
+        self.last_variables = {}
+        self.checkpoints = CheckpointStore(config_manager.get("automation.checkpoint_dir", "data/runs"),
+                                           fsync=config_manager.get("automation.checkpoint_fsync", False))
 
-    def start_recording(self):
+    def start_recording(self, file_path: str = None):
+        """Steps stream to file_path (default: a timestamped file in recordings_dir) while recording."""
+        file_path = file_path or os.path.join(self.recordings_dir, time.strftime("recording_%Y%m%d_%H%M%S.jsonl"))
+        self.recorder = WorkflowRecorder(file_path)
+        self.recorder.start()
         self.is_recording = True
-        self.recorded_steps = []
-        self._last_event_time = time.time()
-        logger.info("Started recording workflow.")
+        logger.info(f"Started recording workflow to {file_path}")
         event_bus.emit("system_log", "Recording started...")
         
         # Start hooks
@@ -38,8 +51,9 @@ class WorkflowEngine:
         self.add_step("key", key=event.name)
 
     def stop_recording(self, name: str):
+        """Finishes the recording and registers it under name; returns the recording's path."""
         if not self.is_recording:
-            return []
+            return None
         self.is_recording = False
         
         # Stop hooks
@@ -49,23 +63,15 @@ class WorkflowEngine:
         except:
             pass
             
-        self.workflows[name] = self.recorded_steps
-        logger.info(f"Stopped recording workflow: {name}. Recorded {len(self.recorded_steps)} steps.")
-        event_bus.emit("system_log", f"Recording stopped. {len(self.recorded_steps)} steps.")
-        return self.recorded_steps
+        count = self.recorder.stop()
+        self.workflows[name] = self.recorder.path
+        logger.info(f"Stopped recording workflow: {name}. Recorded {count} steps to {self.recorder.path}.")
+        event_bus.emit("system_log", f"Recording stopped. {count} steps.")
+        return self.recorder.path
 
     def add_step(self, step_type: str, **kwargs):
         if self.is_recording:
-            now = time.time()
-            delay = now - self._last_event_time
-            self._last_event_time = now
-            
-            step = {
-                "type": step_type, 
-                "delay": delay,
-                **kwargs
-            }
-            self.recorded_steps.append(step)
+            self.recorder.record(step_type, **kwargs)
 
     def save_workflow(self, name: str, steps: list, file_path: str):
         workflow = {"name": name, "steps": steps, "version": "1.0"}
@@ -73,31 +79,125 @@ class WorkflowEngine:
             json.dump(workflow, f, indent=4)
         logger.info(f"Workflow {name} saved to {file_path}")
 
-    def run_workflow(self, file_path: str):
+    @staticmethod
+    def load_workflow(file_path: str) -> dict:
+        if file_path.endswith(".jsonl"):
+            return load_recording(file_path)
         with open(file_path, 'r') as f:
-            workflow = json.load(f)
-        
-        logger.info(f"Running workflow: {workflow['name']}")
-        from src.safwanbuddy.automation.click_system import click_system
-        from src.safwanbuddy.automation.type_system import type_system
-        
-        for step in workflow['steps']:
-            time.sleep(step.get("delay", 0.5))
-            
-            step_type = step.get("type")
-            if step_type == "click":
-                x, y = step.get("x"), step.get("y")
-                if x is not None and y is not None:
-                    import pyautogui
-                    pyautogui.click(x, y)
-                elif step.get("target"):
-                    click_system.click_text(step.get("target"))
-            elif step_type == "key":
-                import pyautogui
-                pyautogui.press(step.get("key"))
-            elif step_type == "type":
-                type_system.type_text(step.get("text"))
-            elif step_type == "wait":
-                time.sleep(step.get("duration", 1))
+            return json.load(f)
+
+    def run_workflow(self, file_path: str, speed: float = None, max_idle: float = None, coalesce: bool = None,
+                     resume: bool = False, from_step=None):
+        """
+        Runs the compiled plan for file_path (recompiled only when the file changes); returns step timings,
+        or a ScheduleReport for workflows whose steps declare dependencies.
+        speed, max_idle and coalesce default to automation.replay_speed, replay_max_idle and coalesce_keys.
+
+        Progress is checkpointed after every step. resume=True continues an interrupted or failed run
+        at the step it stopped on; from_step (a step index, or a step id in graphs) runs again from that
+        step. The checkpoint is removed once the run completes.
+        """
+        speed = speed or config_manager.get("automation.replay_speed", 1.0)
+        max_idle = max_idle if max_idle is not None else config_manager.get("automation.replay_max_idle")
+        coalesce = coalesce if coalesce is not None else config_manager.get("automation.coalesce_keys", True)
+        file_path = self.workflows.get(file_path, file_path)
+        plan = self.plans.get(file_path, coalesce)
+        state = self._start_state(file_path, plan, resume, from_step)
+        if not plan.is_dag and state["next"] and not plan.starts_at(state["next"]):
+            # The start falls inside a coalesced key run; split the run there rather than skip all of it
+            plan = self.plans.get(file_path, coalesce, split_at=state["next"])
+        logger.info(f"Running workflow: {plan.name} ({len(plan)} steps, speed x{speed})")
+
+        following = {step.index: nxt.index for step, nxt in zip(plan.steps, plan.steps[1:])}
+        lock = threading.Lock()
+
+        def checkpoint(step):
+            with lock:
+                if plan.is_dag:
+                    state["completed"].append(step.id)
+                else:
+                    state["next"] = following.get(step.index, step.index + 1)
+                if config_manager.get("automation.checkpoint_screen_hash", False):
+                    state["screen"] = self._screen_hash()
+                self.checkpoints.save(file_path, state)
+
+        try:
+            if plan.is_dag:
+                result = self._run_dag(plan, speed, max_idle, state, checkpoint)
+            else:
+                result = self._run_linear(plan, speed, max_idle, state, checkpoint)
+        except Exception as e:
+            with lock:
+                state["failed"] = {"error": str(e)} if plan.is_dag else {"error": str(e), "step": state["next"]}
+                self.checkpoints.save(file_path, state)
+            logger.error(f"Workflow {plan.name} failed: {e}. Checkpoint kept; run again with resume=True to continue.")
+            raise
+        self.checkpoints.clear(file_path)
+        self.last_variables = state["variables"]
+        return result
+
+    def _start_state(self, file_path, plan, resume, from_step):
+        """Fresh run state, or the saved one for resume / from_step."""
+        stamp = self.checkpoints.stamp(file_path)
+        state = {"stamp": stamp, "next": 0, "completed": [], "variables": {}}
+        saved = self.checkpoints.load(file_path) if (resume or from_step is not None) else None
+        if saved is None:
+            if resume:
+                logger.info(f"No checkpoint for {file_path}; starting from the beginning")
+        else:
+            if saved.get("stamp") != stamp and from_step is None:
+                raise WorkflowError(f"{file_path} changed since it was checkpointed; run again from a step instead")
+            state["variables"] = saved.get("variables", {})
+            if resume:
+                state["next"], state["completed"] = saved.get("next", 0), list(saved.get("completed", []))
+            if saved.get("screen"):
+                distance = hash_distance(saved["screen"], self._screen_hash())
+                if distance > 32:
+                    logger.warning(f"Screen differs from the checkpoint ({distance}/256 bits); resuming anyway")
+
+        if from_step is not None:
+            if plan.is_dag:
+                ids = [step.id for step in plan.steps]
+                if str(from_step) not in ids:
+                    raise WorkflowError(f"{file_path} has no step {from_step!r}")
+                rerun = plan.dependents_of([str(from_step)])
+                # Without a checkpoint only what the step needs is known to be done
+                done = saved.get("completed", []) if saved is not None else plan.ancestors_of([str(from_step)])
+                state["completed"] = [step.id for step in plan.steps if step.id in done and step.id not in rerun]
+            else:
+                count = plan.steps[-1].index + 1 if plan.steps else 0
+                if not 0 <= int(from_step) < count:
+                    raise WorkflowError(f"{file_path} has no step {from_step}")
+                state["next"] = int(from_step)
+        return state
+
+    @staticmethod
+    def _screen_hash():
+        from src.safwanbuddy.vision import screen_capture
+        return screen_hash(screen_capture.capture(mode="gray"))
+
+    def _run_linear(self, plan, speed, max_idle, state, checkpoint):
+        if state["next"]:
+            logger.info(f"Resuming {plan.name} at step {state['next']}")
+        started = time.perf_counter()
+        self.last_timings = plan.run(speed, max_idle, start=state["next"], variables=state["variables"],
+                                     on_step=checkpoint)
+        total_ms = (time.perf_counter() - started) * 1000
+        if self.last_timings:
+            slowest = max(self.last_timings, key=lambda t: t.run_ms)
+            logger.info(f"Workflow {plan.name} finished in {total_ms:.0f} ms; slowest step "
+                        f"{slowest.index} ({slowest.type}) {slowest.run_ms:.0f} ms")
+        return self.last_timings
+
+    def _run_dag(self, plan, speed, max_idle, state, checkpoint):
+        if state["completed"]:
+            logger.info(f"Resuming {plan.name}; {len(state['completed'])} steps already done")
+        scheduler = DagScheduler(max_workers=config_manager.get("automation.max_workers", 5))
+        report = self.last_report = plan.run_dag(scheduler, speed, max_idle, completed=list(state["completed"]),
+                                                 variables=state["variables"], on_step=checkpoint)
+        logger.info(f"Workflow {plan.name} finished in {report.total_ms:.0f} ms; critical path "
+                    f"{report.critical_ms:.0f} ms ({' -> '.join(report.critical_path)}), "
+                    f"{report.serial_ms:.0f} ms if run serially")
+        return report
 
 workflow_engine = WorkflowEngine()
@@ -0,0 +1,482 @@
+import os
+import re
+import threading
+import time
+from functools import partial
+from typing import Any, Callable, NamedTuple
+from src.safwanbuddy.automation.dag_scheduler import DagError, DagNode, DagScheduler, UI_LANE, lane_for, toposort
+
+
+class WorkflowError(ValueError):
+    """A workflow file or step that cannot be compiled."""
+
+
+class UI(NamedTuple):
+    """What compiled steps act through; resolved once per compile instead of per step."""
+    pyautogui: Any
+    click_system: Any
+    type_system: Any
+    waits: Any = None
+    bus: Any = None
+
+
+class CompiledStep(NamedTuple):
+    index: int
+    type: str
+    delay: float  # seconds slept before the action
+    action: Callable[[], Any]  # bound handler with validated parameters
+    id: str = None
+    needs: tuple = ()
+    lane: str = UI_LANE
+    save_as: str = None  # variable name for the step's result
+    uses: tuple = ()  # saved variables the step's strings refer to; action then takes the variables dict
+    arm: Callable[[], Any] = None  # event waits: subscribes before the step ahead runs; action then takes the waiter
+
+
+class StepTiming(NamedTuple):
+    index: int
+    type: str
+    wait_ms: float
+    run_ms: float
+
+
+# keyboard hook names that pyautogui spells differently
+KEY_ALIASES = {
+    "left shift": "shiftleft", "right shift": "shiftright",
+    "left ctrl": "ctrlleft", "right ctrl": "ctrlright",
+    "left alt": "altleft", "right alt": "altright", "alt gr": "altright",
+    "left windows": "winleft", "right windows": "winright",
+    "page up": "pageup", "page down": "pagedown",
+}
+
+DEFAULT_DELAY = 0.5
+
+# Key presses that only change case; inside a typed run the characters already carry it
+SHIFT_KEYS = {"shift", "left shift", "right shift", "shiftleft", "shiftright"}
+
+# "{name}" in a step's strings is replaced by the result a "save_as": "name" step stored
+PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+# step type -> compiler(step, ui) returning the step's action
+STEP_COMPILERS = {}
+
+
+def step_compiler(step_type: str):
+    def register(func):
+        STEP_COMPILERS[step_type] = func
+        return func
+    return register
+
+
+def _number(step, name):
+    value = step.get(name)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise WorkflowError(f"'{name}' must be a number, got {value!r}")
+    return value
+
+
+def _text(step, name):
+    value = step.get(name)
+    if not isinstance(value, str) or not value.strip():
+        raise WorkflowError(f"'{name}' must be a non-empty string, got {value!r}")
+    return value
+
+
+@step_compiler("click")
+def _compile_click(step, ui):
+    if step.get("x") is not None and step.get("y") is not None:
+        x, y = int(_number(step, "x")), int(_number(step, "y"))
+        click = ui.pyautogui.click
+        return lambda: click(x, y)
+    if step.get("target"):
+        target = _text(step, "target").strip()
+        click_text = ui.click_system.click_text
+        return lambda: click_text(target)
+    raise WorkflowError("click needs x and y or a target")
+
+
+@step_compiler("key")
+def _compile_key(step, ui):
+    key = _text(step, "key")
+    if len(key) > 1:
+        # Named keys are case-insensitive; single characters keep their case
+        key = KEY_ALIASES.get(key.lower(), key.lower())
+    press = ui.pyautogui.press
+    return lambda: press(key)
+
+
+@step_compiler("type")
+def _compile_type(step, ui):
+    text = step.get("text")
+    if not isinstance(text, str):
+        raise WorkflowError(f"'text' must be a string, got {text!r}")
+    human_like = bool(step.get("human_like", True))
+    type_text = ui.type_system.type_text
+    return lambda: type_text(text, human_like=human_like)
+
+
+@step_compiler("wait")
+def _compile_wait(step, ui):
+    if "until" in step:
+        # Condition waits: {"until": "text" | "pixel" | "region_change" | "stable" | "event", ...}
+        try:
+            ui.waits.validate(step)
+        except ValueError as e:
+            raise WorkflowError(str(e)) from None
+        spec = dict(step)
+        until = ui.waits.until
+        return lambda waiter=None: until(spec, waiter)
+    duration = _number(step, "duration") if "duration" in step else 1
+    if duration < 0:
+        raise WorkflowError("'duration' must not be negative")
+    return lambda: time.sleep(duration)
+
+
+@step_compiler("web_request")
+@step_compiler("document_request")
+@step_compiler("social_request")
+@step_compiler("automation_request")
+def _compile_request(step, ui):
+    """Hands a request to its subsystem over the event bus, as Expert Mode steps do."""
+    data = step.get("data")
+    if not isinstance(data, dict) or not data.get("action"):
+        raise WorkflowError("'data' must be an object with an 'action'")
+    step_type, emit = step["type"], ui.bus.emit
+    return lambda: emit(step_type, data)
+
+
+def substitute(value, variables: dict, names):
+    """
+    value with the {name} placeholders of names in its strings replaced by
+    their variables; other braces are left alone. Raises WorkflowError for a
+    name that has no value yet.
+    """
+    if isinstance(value, str):
+        def fill(m):
+            name = m.group(1)
+            if name not in names:
+                return m.group(0)
+            if variables.get(name) is None:
+                raise WorkflowError(f"variable '{name}' has no value")
+            return str(variables[name])
+        return PLACEHOLDER.sub(fill, value)
+    if isinstance(value, dict):
+        return {k: substitute(v, variables, names) for k, v in value.items()}
+    if isinstance(value, list):
+        return [substitute(v, variables, names) for v in value]
+    return value
+
+
+def _placeholders(value) -> set:
+    if isinstance(value, str):
+        return set(PLACEHOLDER.findall(value))
+    if isinstance(value, dict):
+        return set().union(*map(_placeholders, value.values()))
+    if isinstance(value, list):
+        return set().union(*map(_placeholders, value))
+    return set()
+
+
+def _templated(step, compiler, ui, names):
+    """Action for a step that reads saved variables: compiled again with their values when it runs."""
+    return lambda variables: compiler(substitute(step, variables, names), ui)()
+
+
+def _has_result(step) -> bool:
+    """Whether a step's action returns something worth saving: condition waits and text clicks."""
+    if step["type"] == "wait":
+        return "until" in step
+    return step["type"] == "click" and not (step.get("x") is not None and step.get("y") is not None)
+
+
+def _printable(step):
+    """The character a recorded key step types, or None if it is not plain text."""
+    if step.get("type") != "key" or not isinstance(step.get("key"), str) or "id" in step or "needs" in step:
+        return None
+    key = step["key"]
+    if key == "space":
+        return " "
+    return key if len(key) == 1 and key.isprintable() else None
+
+
+def coalesce_keys(steps: list, split_at: int = None) -> list:
+    """
+    Merges runs of consecutive printable key steps into one type step that
+    writes the whole run at once; returns (source index, step) pairs. The run
+    keeps the first key's delay and drops the gaps between keystrokes. Shift
+    presses inside a run are absorbed; single keys are left alone. No run
+    crosses split_at, so a run can start from that step.
+    """
+    merged, run = [], []
+
+    def flush():
+        chars = [_printable(step) for _, step in run]
+        if sum(1 for c in chars if c) > 1:
+            last = max(i for i, c in enumerate(chars) if c)
+            index, first = run[0]
+            merged.append((index, {"type": "type", "text": "".join(c for c in chars if c),
+                                   "delay": first.get("delay", DEFAULT_DELAY), "human_like": False}))
+            merged.extend(run[last + 1:])  # Shift presses after the last character stay as they were
+        else:
+            merged.extend(run)
+        run.clear()
+
+    for index, step in enumerate(steps):
+        if index == split_at:
+            flush()
+        if isinstance(step, dict) and (_printable(step) or
+                                       (run and step.get("type") == "key" and str(step.get("key")).lower() in SHIFT_KEYS)):
+            run.append((index, step))
+        else:
+            flush()
+            merged.append((index, step))
+    flush()
+    return merged
+
+
+def default_ui() -> UI:
+    import pyautogui
+    from src.safwanbuddy.automation.click_system import click_system
+    from src.safwanbuddy.automation.type_system import type_system
+    from src.safwanbuddy.automation.wait_conditions import wait_conditions
+    from src.safwanbuddy.core import event_bus
+    return UI(pyautogui, click_system, type_system, wait_conditions, event_bus)
+
+
+class WorkflowPlan:
+    """A workflow compiled once into bound step actions; run() executes it and times every step."""
+
+    def __init__(self, name: str, steps, source: str = None):
+        self.name = name
+        self.steps = steps
+        self.source = source
+        self.last_timings = []
+
+    def __len__(self):
+        return len(self.steps)
+
+    @property
+    def is_dag(self) -> bool:
+        """True for workflows that declare dependencies ("needs") instead of a strict order."""
+        return any(step.needs for step in self.steps)
+
+    def ancestors_of(self, ids) -> set:
+        """Every step that one of ids needs, directly or transitively; ids themselves are not included."""
+        needs = {step.id: step.needs for step in self.steps}
+        found, pending = set(), [need for i in ids for need in needs.get(i, ())]
+        while pending:
+            step_id = pending.pop()
+            if step_id not in found:
+                found.add(step_id)
+                pending.extend(needs.get(step_id, ()))
+        return found
+
+    def starts_at(self, index: int) -> bool:
+        """Whether a step begins at source index, i.e. run(start=index) skips nothing from index on."""
+        return any(step.index == index for step in self.steps)
+
+    def dependents_of(self, ids) -> set:
+        """ids plus every step that needs one of them, directly or transitively."""
+        found = set(ids)
+        changed = True
+        while changed:
+            changed = False
+            for step in self.steps:
+                if step.id not in found and found.intersection(step.needs):
+                    found.add(step.id)
+                    changed = True
+        return found
+
+    @staticmethod
+    def _act(step, variables, waiter=None):
+        if waiter is not None:
+            return step.action(waiter)
+        if step.uses:
+            return step.action(variables if variables is not None else {})
+        return step.action()
+
+    @staticmethod
+    def _finish(step, result, variables, on_step):
+        if step.save_as and variables is not None:
+            variables[step.save_as] = result
+        if on_step is not None:
+            on_step(step)
+
+    def run_dag(self, scheduler: DagScheduler, speed: float = 1.0, max_idle: float = None, completed=(),
+                variables: dict = None, on_step=None):
+        """
+        Runs the steps as a dependency graph; returns the scheduler's ScheduleReport.
+        Steps whose ids are in completed are skipped and count as satisfied dependencies.
+        on_step(step) is called from the worker thread after each step succeeds.
+        """
+        if speed <= 0:
+            raise ValueError("speed must be positive")
+        completed = set(completed)
+        # Event waits subscribe when the first step they need starts, so they see what it emits
+        arm_with, armed, lock = {}, {}, threading.Lock()
+        for step in self.steps:
+            if step.arm is not None and step.id not in completed:
+                for need in set(step.needs) - completed:
+                    arm_with.setdefault(need, []).append(step)
+
+        def node_action(step):
+            delay = (step.delay if max_idle is None else min(step.delay, max_idle)) / speed
+
+            def run_step():
+                with lock:
+                    for waiting in arm_with.get(step.id, ()):
+                        if waiting.id not in armed:
+                            armed[waiting.id] = waiting.arm()
+                    waiter = armed.pop(step.id, None)
+                if delay > 0:
+                    time.sleep(delay)
+                self._finish(step, self._act(step, variables, waiter), variables, on_step)
+            return run_step
+        try:
+            return scheduler.run(DagNode(step.id, tuple(n for n in step.needs if n not in completed), step.lane,
+                                         node_action(step), step.index)
+                                 for step in self.steps if step.id not in completed)
+        finally:
+            for waiter in armed.values():  # Waits that never ran because an earlier step failed
+                waiter.close()
+
+    def run(self, speed: float = 1.0, max_idle: float = None, sleep=time.sleep, start: int = 0,
+            variables: dict = None, on_step=None):
+        """
+        speed divides every recorded delay (2.0 replays twice as fast) and
+        max_idle caps each delay first, so long pauses in a recording collapse.
+        Explicit wait steps are not scaled.
+
+        start skips the steps recorded before that index (resuming a run);
+        results of steps with "save_as" go into variables, where later steps
+        read them through {name} placeholders, and on_step(step) is called
+        after each step succeeds.
+        """
+        if speed <= 0:
+            raise ValueError("speed must be positive")
+        timings = []
+        clock = time.perf_counter
+        steps = [step for step in self.steps if step.index >= start]
+        armed = {}  # step index -> waiter of an event wait subscribed before the step ahead of it
+        try:
+            for position, step in enumerate(steps):
+                following = steps[position + 1] if position + 1 < len(steps) else None
+                if following is not None and following.arm is not None:
+                    armed[following.index] = following.arm()
+                started = clock()
+                delay = step.delay if max_idle is None else min(step.delay, max_idle)
+                if delay > 0:
+                    sleep(delay / speed)
+                acting = clock()
+                result = self._act(step, variables, armed.pop(step.index, None))
+                finished = clock()
+                timings.append(StepTiming(step.index, step.type,
+                                          (acting - started) * 1000, (finished - acting) * 1000))
+                self._finish(step, result, variables, on_step)
+        finally:
+            for waiter in armed.values():
+                waiter.close()
+        self.last_timings = timings
+        return timings
+
+
+def _dependencies(step, index):
+    """(id, needs) of a step; ids default to the step's position in the file."""
+    step_id = step.get("id", str(index))
+    if not isinstance(step_id, str) or not step_id:
+        raise WorkflowError(f"'id' must be a non-empty string, got {step_id!r}")
+    needs = step.get("needs", [])
+    if isinstance(needs, str):
+        needs = [needs]
+    if not isinstance(needs, list) or not all(isinstance(need, str) for need in needs):
+        raise WorkflowError(f"'needs' must be a list of step ids, got {needs!r}")
+    return step_id, tuple(needs)
+
+
+def compile_workflow(workflow: dict, ui: UI = None, source: str = None, coalesce: bool = False,
+                     split_at: int = None) -> WorkflowPlan:
+    """
+    Validates every step and binds it to its handler; raises WorkflowError
+    naming the bad step. coalesce merges typed key runs (see coalesce_keys),
+    keeping a step boundary at split_at for runs that start there.
+
+    Steps may carry an "id" and "needs" (ids they depend on). Once any step
+    has needs, the workflow is a graph: steps without needs start right
+    away, and run_dag overlaps whatever the dependencies allow.
+
+    A condition wait or text click with "save_as": "name" stores its result;
+    "{name}" in the strings of other steps is replaced by that result when
+    they run, and a result that is still missing or None fails the step.
+    """
+    steps = workflow.get("steps")
+    if not isinstance(steps, list):
+        raise WorkflowError(f"{source or 'workflow'}: 'steps' must be a list")
+    ui = ui or default_ui()
+    saved = {step.get("save_as") for step in steps if isinstance(step, dict)}
+    compiled = []
+    for index, step in (coalesce_keys(steps, split_at) if coalesce else enumerate(steps)):
+        step_type = step.get("type") if isinstance(step, dict) else None
+        compiler = STEP_COMPILERS.get(step_type)
+        if compiler is None:
+            raise WorkflowError(f"{source or 'workflow'} step {index}: unknown step type {step_type!r}")
+        try:
+            delay = _number(step, "delay") if "delay" in step else DEFAULT_DELAY
+            step_id, needs = _dependencies(step, index)
+            data = step.get("data")
+            lane = lane_for(step_type, data.get("action") if isinstance(data, dict) else None, step.get("lane"))
+            save_as = step.get("save_as")
+            if save_as is not None and (not isinstance(save_as, str) or not save_as):
+                raise WorkflowError(f"'save_as' must be a variable name, got {save_as!r}")
+            if save_as is not None and not _has_result(step):
+                raise WorkflowError("'save_as' needs a step with a result (a condition wait or a text click)")
+            action = compiler(step, ui)  # Validates the step as written, placeholders included
+            uses = tuple(sorted(_placeholders(step) & saved))
+            if uses:
+                action = _templated(step, compiler, ui, uses)
+            arm = None
+            if step_type == "wait" and step.get("until") == "event" and not uses:
+                arm = partial(ui.waits.arm, dict(step))
+            compiled.append(CompiledStep(index, step_type, max(0.0, delay), action, step_id, needs, lane,
+                                         save_as, uses, arm))
+        except WorkflowError as e:
+            raise WorkflowError(f"{source or 'workflow'} step {index} ({step_type}): {e}") from None
+    plan = WorkflowPlan(workflow.get("name", source or "workflow"), compiled, source)
+    if plan.is_dag:
+        try:
+            toposort([DagNode(step.id, step.needs, step.lane, None, step.index) for step in compiled])
+        except DagError as e:
+            raise WorkflowError(f"{source or 'workflow'}: {e}") from None
+    return plan
+
+
+class PlanCache:
+    """Compiled plans by file path; a plan is recompiled when the file's mtime or size changes."""
+
+    def __init__(self, loader: Callable[[str], dict], ui: Callable[[], UI] = default_ui):
+        self.loader = loader
+        self.ui = ui
+        self._plans = {}
+        self._lock = threading.Lock()
+        self.compiles = 0
+
+    def get(self, path: str, coalesce: bool = False, split_at: int = None) -> WorkflowPlan:
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        key = (path, coalesce, split_at if coalesce else None)
+        with self._lock:
+            cached = self._plans.get(key)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+        plan = compile_workflow(self.loader(path), self.ui(), source=path, coalesce=coalesce, split_at=key[2])
+        with self._lock:
+            self._plans[key] = (stamp, plan)
+            self.compiles += 1
+        return plan
+
+    def invalidate(self, path: str = None):
+        with self._lock:
+            if path is None:
+                self._plans.clear()
+            else:
+                for key in [key for key in self._plans if key[0] == path]:
+                    del self._plans[key]
@@ -0,0 +1,128 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from src.safwanbuddy.core import logger
+
+FORMAT = "safwanbuddy-steps"
+FORMAT_VERSION = 1
+
+
+class WorkflowRecorder:
+    """
+    Streams recorded steps to an append-only JSONL file. Hook threads only
+    append (perf_counter_ns, type, fields) to a deque, which needs no lock;
+    a writer thread turns timestamps into delays, writes one compact line per
+    step and fsyncs periodically, so a crash loses at most the last interval.
+
+    File layout: a header line {"format", "version", "name", "started"},
+    then one workflow step per line ({"type", "delay", ...}).
+    """
+
+    def __init__(self, path: str, name: str = None, flush_interval: float = 0.1, fsync_interval: float = 1.0):
+        self.path = path
+        self.name = name or os.path.splitext(os.path.basename(path))[0]
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.count = 0
+        self._events = deque()
+        self._stop = threading.Event()
+        self._thread = None
+        self._file = None
+
+    @property
+    def is_recording(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        header = {"format": FORMAT, "version": FORMAT_VERSION, "name": self.name, "started": time.time()}
+        self._file.write(json.dumps(header, separators=(",", ":")) + "\n")
+        self._last_ns = time.perf_counter_ns()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="workflow-recorder", daemon=True)
+        self._thread.start()
+
+    def record(self, step_type: str, **fields):
+        """Called from hook threads; never blocks on I/O."""
+        self._events.append((time.perf_counter_ns(), step_type, fields))
+
+    def _drain(self) -> int:
+        written = 0
+        while self._events:
+            stamp, step_type, fields = self._events.popleft()
+            step = {"type": step_type, "delay": round((stamp - self._last_ns) / 1e9, 4), **fields}
+            self._last_ns = stamp
+            self._file.write(json.dumps(step, separators=(",", ":")) + "\n")
+            written += 1
+        self.count += written
+        return written
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _run(self):
+        last_sync = time.monotonic()
+        while not self._stop.wait(self.flush_interval):
+            if self._drain():
+                self._file.flush()
+            if time.monotonic() - last_sync >= self.fsync_interval:
+                self._sync()
+                last_sync = time.monotonic()
+
+    def stop(self) -> int:
+        """Writes what is still buffered, syncs and closes; returns the number of steps recorded."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._file is not None:
+            self._drain()
+            self._sync()
+            self._file.close()
+            self._file = None
+        return self.count
+
+
+def iter_recording(path: str):
+    """
+    Yields the steps of a recording one at a time. A truncated last line
+    (from a crash mid-write) is skipped with a warning; a malformed line
+    anywhere else means the file is corrupt and raises ValueError.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        bad = None  # (line number, error) of a malformed line, fatal unless it turns out to be the last
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if bad is not None:
+                raise ValueError(f"{path}:{bad[0]}: corrupt step ({bad[1]})")
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                bad = (number, e)
+                continue
+            if "format" in record and "type" not in record:
+                if record["format"] != FORMAT:
+                    raise ValueError(f"{path}: not a step recording (format {record['format']!r})")
+                continue
+            yield record
+        if bad is not None:
+            logger.warning(f"{path}:{bad[0]}: skipping truncated last step")
+
+
+def read_header(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+    return header if header.get("format") == FORMAT else {}
+
+
+def load_recording(path: str) -> dict:
+    """A recording as a workflow dict, as run_workflow and save_workflow use."""
+    header = read_header(path)
+    return {"name": header.get("name", os.path.basename(path)), "steps": list(iter_recording(path)),
+            "version": "1.0"}
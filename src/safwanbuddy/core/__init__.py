@@ -1,5 +1,15 @@
 from .config import config_manager
 from .events import event_bus
 from .logging import logger
+from .intent_registry import intent_registry
 from .plugin_loader import plugin_loader, PluginBase
-from .orchestrator import orchestrator
+
+
+def __getattr__(name):
+    # The orchestrator imports every subsystem, and those import core themselves.
+    # Loading it on first use keeps `import src.safwanbuddy.core` free of that cycle.
+    if name == "orchestrator":
+        from .orchestrator import orchestrator
+        globals()["orchestrator"] = orchestrator  # Shadow the submodule the import bound here
+        return orchestrator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
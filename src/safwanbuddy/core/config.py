@@ -33,16 +33,35 @@ class ConfigManager:
             "voice": {
                 "engine": "vosk",
                 "wake_word": "hey safwan",
-                "language": "en"
+                "language": "en",
+                "fuzzy_threshold": 0.6,
+                "fuzzy_budget_ms": 1.0,
+                "resolve_cache_size": 256
             },
             "gui": {
                 "theme": "dark",
                 "opacity": 0.9,
                 "holographic_ui": True
             },
+            "vision": {
+                "watch_screen": False,
+                "watch_fps": 5,
+                "watch_ring": 4
+            },
             "automation": {
                 "max_workers": 5,
-                "human_like": True
+                "human_like": True,
+                "replay_speed": 1.0,
+                "replay_max_idle": 2.0,
+                "coalesce_keys": True,
+                "wait_interval": 0.05,
+                "wait_timeout": 10.0,
+                "settle_duration": 0.4,
+                "settle_change_timeout": 0.5,
+                "settle_timeout": 2.0,
+                "checkpoint_dir": "data/runs",
+                "checkpoint_fsync": False,
+                "checkpoint_screen_hash": False
             }
         }
         with open(self.config_path, 'w') as f:
@@ -0,0 +1,189 @@
+import os
+import threading
+import time
+import yaml
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from src.safwanbuddy.core.events import event_bus
+from src.safwanbuddy.core.logging import logger
+from src.safwanbuddy.utils.intent_matcher import IntentMatcher, IntentMatch, trigger_phrases
+
+CONFIG_OWNER = "config"
+
+
+class IntentRegistry:
+    """
+    Central table of voice intents. Patterns come from voice_commands.yaml and
+    from plugin manifests; handlers are registered by their owning module.
+    Intents that have a handler are compiled into one shared IntentMatcher,
+    and a resolved command is routed to the single handler that owns its
+    intent. Patterns without a handler stay in the table but are not
+    matched, so they cannot shadow a routable intent earlier in the text.
+    """
+
+    def __init__(self, config_path: str = "config/voice_commands.yaml", reload_interval: float = 1.0):
+        self.config_path = config_path
+        self.reload_interval = reload_interval
+        self.version = 0
+        self._intents: Dict[str, Dict[str, Any]] = {}
+        self._handlers: Dict[str, Tuple[str, Callable]] = {}  # name -> (owner, handler)
+        self._matcher = IntentMatcher()
+        self._config_mtime = None
+        self._last_check = 0.0
+        self._lock = threading.RLock()
+        self.load_config()
+
+    def _entry(self, name: str, owner: str) -> Dict[str, Any]:
+        return self._intents.setdefault(name, {"patterns": [], "phrases": [], "owner": owner})
+
+    def load_config(self):
+        """(Re)loads config-owned intents from the YAML file; a bad file keeps the previous intents."""
+        with self._lock:
+            try:
+                self._config_mtime = os.path.getmtime(self.config_path)
+                with open(self.config_path, 'r') as f:
+                    data = yaml.safe_load(f) or {}
+                intents, commands = self._parse_config(data)
+            except (OSError, yaml.YAMLError, ValueError) as e:
+                logger.warning(f"Could not load intents from {self.config_path}: {e}")
+                return False
+
+            self._intents = {name: entry for name, entry in self._intents.items() if entry["owner"] != CONFIG_OWNER}
+            for name, (patterns, phrases) in intents.items():
+                entry = self._entry(name, CONFIG_OWNER)
+                entry["patterns"].extend(patterns)
+                entry["phrases"].extend(phrases)
+            for phrase, name in commands.items():
+                self._entry(name, CONFIG_OWNER)["phrases"].append(phrase)
+
+            self.compile()
+            logger.info(f"Loaded {len(self._intents)} intents from {self.config_path}")
+            return True
+
+    def _parse_config(self, data):
+        """({name: (patterns, phrases)}, {phrase: name}) from the parsed YAML; raises ValueError on a bad layout."""
+        if not isinstance(data, dict):
+            raise ValueError(f"expected a mapping at the top level, got {type(data).__name__}")
+        sections = {}
+        for key in ("intents", "commands"):
+            section = data.get(key) or {}
+            if not isinstance(section, dict):
+                raise ValueError(f"'{key}' must be a mapping, got {type(section).__name__}")
+            sections[key] = section
+        intents = {}
+        for name, spec in sections["intents"].items():
+            if not isinstance(spec, dict):
+                logger.warning(f"Skipping intent '{name}' in {self.config_path}: expected a mapping, got {spec!r}")
+                continue
+            patterns, phrases = spec.get("patterns") or [], spec.get("phrases") or []
+            if not isinstance(patterns, list) or not isinstance(phrases, list):
+                logger.warning(f"Skipping intent '{name}' in {self.config_path}: patterns and phrases must be lists")
+                continue
+            intents[name] = (patterns, phrases)
+        return intents, sections["commands"]
+
+    def check_reload(self):
+        """Hot-reloads the YAML file if it changed, at most once per reload_interval."""
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return
+        self._last_check = now
+        try:
+            mtime = os.path.getmtime(self.config_path)
+        except OSError:
+            return
+        if mtime != self._config_mtime:
+            logger.info("Voice command config changed, reloading intents.")
+            self.load_config()
+
+    def register(self, name: str, handler: Optional[Callable] = None, patterns: Iterable[str] = (),
+                 phrases: Iterable[str] = (), owner: str = "core") -> bool:
+        """Registers an intent's patterns and/or its handler."""
+        with self._lock:
+            routable = False
+            if handler is not None:
+                current = self._handlers.get(name)
+                if current and current[0] != owner:
+                    logger.warning(f"Intent '{name}' is already handled by {current[0]}; ignoring {owner}.")
+                    return False
+                self._handlers[name] = (owner, handler)
+                # Patterns loaded before their handler only become matchable now
+                routable = current is None and name in self._intents
+            patterns, phrases = list(patterns), list(phrases)
+            if patterns or phrases:
+                entry = self._entry(name, owner)
+                entry["patterns"].extend(patterns)
+                entry["phrases"].extend(phrases)
+            if routable or patterns or phrases:
+                self.compile()
+            return True
+
+    def register_plugin(self, plugin):
+        """Registers the intents declared in a plugin's manifest."""
+        for name, spec in getattr(plugin, "intents", {}).items():
+            handler = spec.get("handler")
+            if isinstance(handler, str):
+                handler = getattr(plugin, handler)
+            self.register(name, handler, spec.get("patterns", []), spec.get("phrases", []), owner=plugin.name)
+
+    def unregister_owner(self, owner: str):
+        with self._lock:
+            self._handlers = {n: h for n, h in self._handlers.items() if h[0] != owner}
+            self._intents = {n: e for n, e in self._intents.items() if e["owner"] != owner}
+            self.compile()
+
+    def compile(self):
+        with self._lock:
+            matcher = IntentMatcher()
+            routable = {name: entry for name, entry in self._intents.items() if name in self._handlers}
+            # Regex intents first so their captures win over bare trigger phrases
+            for name, entry in routable.items():
+                for pattern in entry["patterns"]:
+                    try:
+                        matcher.add_pattern(name, pattern)
+                    except Exception as e:
+                        logger.error(f"Invalid pattern for intent '{name}': {pattern} ({e})")
+            for name, entry in routable.items():
+                for phrase in entry["phrases"]:
+                    matcher.add_phrase(name, phrase)
+            matcher.compile()
+            self._matcher = matcher
+            self.version += 1
+        event_bus.emit("intents_changed", self.version)
+
+    def resolve(self, text: str) -> Optional[IntentMatch]:
+        self.check_reload()
+        return self._matcher.match(text)
+
+    def has_handler(self, name: str) -> bool:
+        return name in self._handlers
+
+    def owner_of(self, name: str) -> Optional[str]:
+        """The owner of the intent's handler, or None if nothing handles it."""
+        return self._handlers.get(name, (None,))[0]
+
+    def dispatch(self, name: str, args=()) -> bool:
+        """Calls the handler owning the intent. Returns False if it has none."""
+        entry = self._handlers.get(name)
+        if entry is None:
+            logger.warning(f"No handler registered for intent: {name}")
+            return False
+        entry[1](tuple(args))
+        return True
+
+    def fuzzy_phrases(self):
+        """(phrase, intent) pairs of routable intents for near-miss matching: literal phrases plus regex lead-ins."""
+        pairs = []
+        for name, entry in self._intents.items():
+            if name not in self._handlers:
+                continue
+            pairs.extend((phrase, name) for phrase in entry["phrases"])
+            for pattern in entry["patterns"]:
+                pairs.extend((phrase, name) for phrase in trigger_phrases(pattern))
+        return pairs
+
+    def list_intents(self):
+        return {name: {"owner": e["owner"], "handler": self._handlers.get(name, (None,))[0]}
+                for name, e in self._intents.items()}
+
+
+intent_registry = IntentRegistry()
@@ -9,6 +9,7 @@ from src.safwanbuddy.documents import word_generator, excel_generator, pdf_gener
 from src.safwanbuddy.core.config import config_manager
 from src.safwanbuddy.profiles.profile_manager import profile_manager
 from src.safwanbuddy.voice.speech_recognition import VoiceRecognizer
+from src.safwanbuddy.vision.screen_watcher import screen_watcher
 import threading
 import time
 import sys
@@ -55,6 +56,8 @@ class SafwanBuddyOrchestrator:
         # Start voice recognition in a separate thread
         voice_thread = threading.Thread(target=self.voice_recognizer.start_listening, daemon=True)
         voice_thread.start()
+        if config_manager.get("vision.watch_screen", False):
+            screen_watcher.start()
         logger.info("Subsystems online.")
         return True
 
@@ -80,7 +83,8 @@ class SafwanBuddyOrchestrator:
         elif action == "stop_recording":
             workflow_engine.stop_recording("last_recorded")
         elif action == "run_workflow":
-            workflow_engine.run_workflow(data.get("name", "workflow.json"))
+            workflow_engine.run_workflow(data.get("name", "workflow.json"), resume=data.get("resume", False),
+                                         from_step=data.get("from_step"))
         elif action == "fill_form":
             profile_id = profile_manager.active_profile_id
             profile = profile_manager.get_profile(profile_id)
@@ -149,6 +153,7 @@ class SafwanBuddyOrchestrator:
     def stop(self):
         logger.info("Shutting down...")
         self.voice_recognizer.stop_listening()
+        screen_watcher.stop()
         browser_controller.close()
         return True
 
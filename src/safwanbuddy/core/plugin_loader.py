@@ -3,12 +3,15 @@ import os
 import sys
 from src.safwanbuddy.core.logging import logger
 from src.safwanbuddy.core.events import event_bus
+from src.safwanbuddy.core.intent_registry import intent_registry
 
 class PluginBase:
     def __init__(self):
         self.name = "Base Plugin"
         self.description = "Base class for all plugins"
         self.event_bus = event_bus
+        # Intent manifest: {intent: {"patterns": [...], "phrases": [...], "handler": "method_name"}}
+        self.intents = {}
 
     def activate(self):
         pass
@@ -38,9 +41,16 @@ class PluginLoader:
                         if isinstance(attr, type) and issubclass(attr, PluginBase) and attr is not PluginBase:
                             plugin_instance = attr()
                             plugin_instance.activate()
+                            intent_registry.register_plugin(plugin_instance)
                             self.plugins.append(plugin_instance)
                             logger.info(f"Loaded plugin: {plugin_instance.name}")
                 except Exception as e:
                     logger.error(f"Failed to load plugin {module_name}: {e}")
 
+    def unload_plugins(self):
+        for plugin in self.plugins:
+            plugin.deactivate()
+            intent_registry.unregister_owner(plugin.name)
+        self.plugins = []
+
 plugin_loader = PluginLoader()
@@ -1,56 +1,87 @@
+import os
+import yaml
+from src.safwanbuddy.utils.intent_matcher import IntentMatcher
+from src.safwanbuddy.utils.phrase_trie import PhraseSubstituter
+
 class LanguageMapper:
-    def __init__(self):
-        # Hyderabadi/Hindi dialect mapping to system intents
-        self.mappings = {
-            "hau": "yes",
-            "nakko": "no",
-            "kaiku": "why",
-            "kaisa hai": "how are you",
-            "kya karre": "what are you doing",
-            "kya hona": "what do you want",
-            "ich": "", # emphasis suffix, often can be ignored or used for context
-            "potti": "girl",
-            "potta": "boy",
-            "baigan": "nonsense/ignore", # used in various contexts
-            "hallu": "slowly",
-            "jaldi": "quickly",
-            "shabaash": "well done",
-            "khamosh": "quiet",
-            "sunno": "listen",
-            "batao": "tell/show",
-            "khol": "open",
-            "band kar": "close"
-        }
-        
-        self.intent_patterns = {
-            "open_browser": ["browser khol", "internet chalao", "net khol"],
-            "search": ["dhundo", "search karo", "pata karo"],
-            "generate_report": ["report banao", "paper banao", "document likho"],
-            "status_check": ["kya chalra", "status kya hai", "kaam kahan tak pahuncha"],
-            "shutdown": ["chalo khuda hafiz", "band karo", "so jao"]
-        }
+    def __init__(self, pack_dir: str = "config/dialects"):
+        # Dialect packs (config/dialects/<language>.yaml) are compiled on first selection
+        self.pack_dir = pack_dir
+        self.packs = {}
+        self.active_language = None
+
+    def _read_pack(self, language: str, seen=()):
+        path = os.path.join(self.pack_dir, f"{language}.yaml")
+        if language in seen or not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f) or {}
+
+        mappings, intents = {}, {}
+        parent = data.get("extends")
+        if parent:
+            base = self._read_pack(parent, seen + (language,))
+            if base:
+                mappings.update(base["mappings"])
+                for intent, phrases in base["intents"].items():
+                    intents[intent] = list(phrases)
+        mappings.update({str(k): str(v or "") for k, v in (data.get("mappings") or {}).items()})
+        for intent, phrases in (data.get("intents") or {}).items():
+            intents.setdefault(intent, []).extend(phrases)
+        return {"name": data.get("name", language), "greeting": data.get("greeting"),
+                "mappings": mappings, "intents": intents}
+
+    def load_pack(self, language: str):
+        """Loads and compiles a dialect pack, or returns None if there is none."""
+        if language in self.packs:
+            return self.packs[language]
+        pack = self._read_pack(language)
+        if pack:
+            pack["substituter"] = PhraseSubstituter(pack["mappings"])
+            pack["matcher"] = IntentMatcher()
+            for intent, phrases in pack["intents"].items():
+                for phrase in phrases:
+                    pack["matcher"].add_phrase(intent, phrase)
+            pack["matcher"].compile()
+        self.packs[language] = pack
+        return pack
+
+    def select(self, language: str) -> bool:
+        """Makes language's pack the active one. Returns False if it has no pack."""
+        self.active_language = language if self.load_pack(language) else None
+        return self.active_language is not None
+
+    @property
+    def active_pack(self):
+        return self.packs.get(self.active_language) if self.active_language else None
 
     def normalize_input(self, text: str):
         text = text.lower().strip()
-        
-        # Replace specific dialect words
-        words = text.split()
-        normalized_words = [self.mappings.get(w, w) for w in words]
-        normalized_text = " ".join(normalized_words)
-        
+        pack = self.active_pack
+        if not pack:
+            return "unknown", text
+
+        # Replace dialect words and phrases
+        normalized_text = pack["substituter"].substitute(text)
+
         # Check for intent patterns
-        for intent, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                if pattern in text or pattern in normalized_text:
-                    return intent, text
-                    
+        match = pack["matcher"].match(text) or pack["matcher"].match(normalized_text)
+        if match:
+            return match.intent, text
+
         return "unknown", text
 
+    def variant_phrases(self):
+        """(phrase, intent) pairs for every intent phrase of the active pack."""
+        pack = self.active_pack
+        if not pack:
+            return []
+        return [(phrase, intent) for intent, phrases in pack["intents"].items() for phrase in phrases]
+
     def get_greeting(self, language="hyderabadi"):
-        if language == "hyderabadi":
-            return "Salaam! Kya hona bolo aapku?"
-        elif language == "hindi":
-            return "Namaste! Main aapki kya madad kar sakta hoon?"
+        pack = self.load_pack(language)
+        if pack and pack["greeting"]:
+            return pack["greeting"]
         return "Hello! How can I help you today?"
 
 language_mapper = LanguageMapper()
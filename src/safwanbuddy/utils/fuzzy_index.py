@@ -0,0 +1,81 @@
+import heapq
+import time
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Tuple
+
+
+class FuzzyMatch(NamedTuple):
+    intent: str
+    phrase: str
+    score: float
+    corrected: str  # Input with the matched words replaced by the phrase
+
+
+def ngrams(text: str, n: int = 3) -> set:
+    padded = f" {text} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class FuzzyResults(list):
+    """Matches best first; truncated is True if the budget ran out before every window was scored."""
+    truncated = False
+
+
+class NGramIndex:
+    """
+    Character n-gram inverted index over intent phrases for near-miss lookup
+    ("opened browser" -> "open browser"). Each query compares word windows of
+    the input against phrases of the same word count by Dice similarity and
+    stops scoring once the time budget is spent.
+    """
+
+    def __init__(self, n: int = 3):
+        self.n = n
+        self._phrases: List[Tuple[str, str, int]] = []  # (phrase, intent, gram count)
+        self._postings: Dict[Tuple[int, str], List[int]] = defaultdict(list)  # (word count, gram) -> ids
+        self._word_counts = set()
+
+    def add(self, phrase: str, intent: str):
+        phrase = " ".join(phrase.lower().split())
+        if not phrase:
+            return
+        grams = ngrams(phrase, self.n)
+        words = len(phrase.split())
+        phrase_id = len(self._phrases)
+        self._phrases.append((phrase, intent, len(grams)))
+        self._word_counts.add(words)
+        for gram in grams:
+            self._postings[(words, gram)].append(phrase_id)
+
+    def __len__(self):
+        return len(self._phrases)
+
+    def search(self, text: str, k: int = 3, min_score: float = 0.0, budget: float = 0.001) -> FuzzyResults:
+        """Returns up to k best matches (one per intent) scoring at least min_score."""
+        deadline = time.perf_counter() + budget
+        words = text.lower().split()
+        best: Dict[str, FuzzyMatch] = {}
+        postings = self._postings
+        truncated = False
+        for start in range(len(words)):
+            for count in self._word_counts:
+                if start + count > len(words):
+                    continue
+                window = " ".join(words[start:start + count])
+                grams = ngrams(window, self.n)
+                overlap: Dict[int, int] = defaultdict(int)
+                for gram in grams:
+                    for phrase_id in postings.get((count, gram), ()):
+                        overlap[phrase_id] += 1
+                for phrase_id, shared in overlap.items():
+                    phrase, intent, size = self._phrases[phrase_id]
+                    score = 2.0 * shared / (size + len(grams))
+                    if score >= min_score and (intent not in best or score > best[intent].score):
+                        corrected = " ".join(words[:start] + [phrase] + words[start + count:])
+                        best[intent] = FuzzyMatch(intent, phrase, score, corrected)
+            if start + 1 < len(words) and time.perf_counter() > deadline:
+                truncated = True
+                break
+        results = FuzzyResults(heapq.nlargest(k, best.values(), key=lambda m: m.score))
+        results.truncated = truncated
+        return results
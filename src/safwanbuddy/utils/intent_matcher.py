@@ -0,0 +1,299 @@
+"""
+Single-pass intent matching for voice commands.
+
+Precedence: the match that starts earliest in the command wins, and ties
+go to the pattern registered first. The old sequential loop returned the
+first pattern in list order that matched anywhere, so commands naming two
+intents can resolve differently: "expertly search for x" used to run a
+search for "x" and is now expert_mode with "search for x". Callers that
+need one intent to dominate should anchor its pattern.
+
+Cost: a scan does fixed work (automaton walk plus the candidate regexes),
+so the matcher is slower than the loop when there are only a few intents.
+benchmarks/bench_intent_matcher.py measures 0.3x at the 13 built-in
+intents (about 7 us per command, against ASR latency in the hundreds of
+milliseconds), 2.6x at 100 and about 70x at 5000. Plugins and dialect
+packs add intents, and the count only grows from there.
+"""
+import re
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class IntentMatch(NamedTuple):
+    intent: str
+    captures: Tuple[str, ...]
+    start: int
+    end: int
+
+
+class AhoCorasick:
+    """Multi-pattern literal matcher; finds every phrase occurrence in one scan."""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, int]]] = [[]]  # (payload, phrase length)
+        self.max_length = 0
+        self._built = True
+
+    def add(self, phrase: str, payload: int):
+        node = 0
+        for ch in phrase:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((payload, len(phrase)))
+        self.max_length = max(self.max_length, len(phrase))
+        self._built = False
+
+    def build(self):
+        queue = deque([0])
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0) if node else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+        self._built = True
+
+    def iter_matches(self, text: str):
+        """Yields (start, end, payload) for every phrase occurrence in text."""
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for payload, length in out[node]:
+                yield i + 1 - length, i + 1, payload
+
+    def __len__(self):
+        return len(self._goto)
+
+
+_REGEX_META = set(".^$*+?{}[]\\|()")
+_QUANTIFIERS = set("?*{")
+
+
+def _class_end(pattern: str, i: int) -> int:
+    """Index just past the character class opening at pattern[i]; "]" right after "[" or "[^" is literal."""
+    j = i + 1
+    if pattern[j:j + 1] == "^":
+        j += 1
+    if pattern[j:j + 1] == "]":
+        j += 1
+    while j < len(pattern):
+        if pattern[j] == "\\":
+            j += 2
+        elif pattern[j] == "]":
+            return j + 1
+        else:
+            j += 1
+    return len(pattern)
+
+
+def required_literals(pattern: str) -> Optional[List[str]]:
+    """
+    Returns literals of which at least one must occur in any match of pattern,
+    or None if none can be derived. Only top-level literal runs are considered;
+    anything inside groups, classes or escapes is treated as unknown.
+    """
+    if pattern.startswith("(?") and pattern[2:3] in ("i", "x", "s", "a", "L", "u"):
+        return None  # Inline flags change how literals compare
+    branches = [[]]
+    run = ""
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            nxt = pattern[i + 1:i + 2]
+            if depth == 0 and nxt and not nxt.isalnum():
+                run += nxt
+            else:
+                branches[-1].append(run)
+                run = ""
+            i += 2
+            continue
+        if ch == "[":
+            branches[-1].append(run)
+            run = ""
+            i = _class_end(pattern, i)
+            continue
+        if ch == "(":
+            if depth == 0:
+                branches[-1].append(run)
+                run = ""
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif depth == 0:
+            if ch == "|":
+                branches[-1].append(run)
+                run = ""
+                branches.append([])
+            elif ch in _QUANTIFIERS:
+                branches[-1].append(run[:-1])
+                run = ""
+                if ch == "{":
+                    i = pattern.find("}", i) + 1 or len(pattern)
+                    continue
+            elif ch == "+":
+                branches[-1].append(run)
+                run = ""
+            elif ch in _REGEX_META:
+                branches[-1].append(run)
+                run = ""
+            else:
+                run += ch
+        i += 1
+    branches[-1].append(run)
+
+    literals = []
+    for runs in branches:
+        best = max(runs, key=len)
+        if not best.strip():
+            return None
+        literals.append(best)
+    return literals
+
+
+class IntentMatcher:
+    """
+    Resolves a command against many intents with a single scan.
+
+    Literal phrases and the required literal of every regex pattern are loaded
+    into one Aho-Corasick automaton. A scan of the command yields phrase hits
+    directly and narrows the regexes down to the few whose literal occurred;
+    patterns without a usable literal share one named-group alternation.
+
+    The leftmost match wins; ties are broken by registration order.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[str, str, bool]] = []  # (intent, pattern, is_literal)
+        self._regexes: Dict[int, "re.Pattern"] = {}
+        self._fallback = None
+        self._fallback_groups: Dict[str, int] = {}
+        self._automaton = None
+        self._dirty = True
+
+    def add_pattern(self, intent: str, pattern: str):
+        re.compile(pattern)  # Fail early on invalid patterns
+        self._entries.append((intent, pattern, False))
+        self._dirty = True
+
+    def add_phrase(self, intent: str, phrase: str):
+        phrase = phrase.lower().strip()
+        if phrase:
+            self._entries.append((intent, phrase, True))
+            self._dirty = True
+
+    def clear(self):
+        self._entries = []
+        self._dirty = True
+
+    @property
+    def intents(self) -> List[str]:
+        return list(dict.fromkeys(intent for intent, _, _ in self._entries))
+
+    def compile(self):
+        self._regexes = {}
+        self._fallback_groups = {}
+        self._automaton = AhoCorasick()
+        fallback = []
+        for order, (intent, pattern, is_literal) in enumerate(self._entries):
+            if is_literal:
+                self._automaton.add(pattern, 2 * order)
+                continue
+            self._regexes[order] = re.compile(pattern)
+            literals = required_literals(pattern)
+            if literals:
+                for literal in literals:
+                    self._automaton.add(literal, 2 * order + 1)
+            else:
+                name = f"_i{order}"
+                fallback.append(f"(?P<{name}>{pattern})")
+                self._fallback_groups[name] = order
+
+        self._fallback = re.compile("|".join(fallback)) if fallback else None
+        self._automaton.build()
+        self._dirty = False
+
+    def match(self, text: str) -> Optional[IntentMatch]:
+        """Returns the best IntentMatch for text, or None."""
+        if self._dirty:
+            self.compile()
+
+        best = None
+        best_order = None
+        candidates = set()
+        for start, end, payload in self._automaton.iter_matches(text):
+            order, is_anchor = divmod(payload, 2)
+            if is_anchor:
+                candidates.add(order)
+            elif best is None or start < best.start or (start == best.start and order < best_order):
+                best = IntentMatch(self._entries[order][0], (), start, end)
+                best_order = order
+
+        if self._fallback is not None:
+            m = self._fallback.search(text)
+            if m:
+                candidates.add(self._fallback_groups[m.lastgroup])
+
+        for order in sorted(candidates):
+            m = self._regexes[order].search(text)
+            if m and (best is None or m.start() < best.start or (m.start() == best.start and order < best_order)):
+                best = IntentMatch(self._entries[order][0], m.groups(), m.start(), m.end())
+                best_order = order
+
+        return best
+
+
+def trigger_phrases(pattern: str, limit: int = 8) -> List[str]:
+    """
+    Expands the literal lead-in of a regex (up to its first capture group) into
+    plain phrases, e.g. "compare price (?:of )?(.+)" -> ["compare price of",
+    "compare price"]. Handles literals, optional characters and non-capturing
+    groups of literal alternatives; stops at anything else.
+    """
+    variants = [""]
+    i = 0
+    while i < len(pattern) and len(variants) <= limit:
+        ch = pattern[i]
+        if pattern.startswith("(?:", i):
+            close = pattern.find(")", i)
+            body = pattern[i + 3:close]
+            if close < 0 or any(c in _REGEX_META - {"|"} for c in body):
+                break
+            options = body.split("|")
+            i = close + 1
+            if pattern[i:i + 1] == "?":
+                options.append("")
+                i += 1
+            variants = [v + o for v in variants for o in options]
+        elif ch == "\\" and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+            variants = [v + pattern[i + 1] for v in variants]
+            i += 2
+        elif ch not in _REGEX_META:
+            if pattern[i + 1:i + 2] == "?":
+                variants = [v + c for v in variants for c in (ch, "")]
+                i += 2
+            else:
+                variants = [v + ch for v in variants]
+                i += 1
+        else:
+            break
+    phrases = [" ".join(v.split()) for v in variants[:limit]]
+    return [p for p in dict.fromkeys(phrases) if p]
@@ -0,0 +1,57 @@
+from typing import Dict
+
+
+class PhraseSubstituter:
+    """
+    Token trie for dialect lexicons. Replaces multi-word phrases ("band kar")
+    as well as single words, always taking the longest phrase that matches at
+    each position, in one left-to-right pass over the input tokens.
+    """
+
+    _END = object()
+
+    def __init__(self, mappings: Dict[str, str] = None):
+        self._root = {}
+        self.max_depth = 0
+        for phrase, replacement in (mappings or {}).items():
+            self.add(phrase, replacement)
+
+    def add(self, phrase: str, replacement: str):
+        tokens = phrase.lower().split()
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[self._END] = replacement
+        self.max_depth = max(self.max_depth, len(tokens))
+
+    def __len__(self):
+        count, stack = 0, [self._root]
+        while stack:
+            node = stack.pop()
+            count += self._END in node
+            stack.extend(child for key, child in node.items() if key is not self._END)
+        return count
+
+    def substitute(self, text: str) -> str:
+        tokens = text.split()
+        out = []
+        i = 0
+        while i < len(tokens):
+            node = self._root
+            match_end, replacement = i, None
+            j = i
+            while j < len(tokens) and tokens[j] in node:
+                node = node[tokens[j]]
+                j += 1
+                if self._END in node:
+                    match_end, replacement = j, node[self._END]
+            if replacement is None:
+                out.append(tokens[i])
+                i += 1
+            else:
+                if replacement:
+                    out.append(replacement)
+                i = match_end
+        return " ".join(out)
@@ -30,6 +30,17 @@ class WinUtils:
         except:
             return "Unknown"
 
+    @staticmethod
+    def get_active_window_rect():
+        """(x, y, width, height) of the foreground window, or None if unavailable."""
+        if platform.system() != "Windows":
+            return None
+        try:
+            left, top, right, bottom = win32gui.GetWindowRect(win32gui.GetForegroundWindow())
+            return left, top, right - left, bottom - top
+        except:
+            return None
+
     @staticmethod
     def list_windows():
         if platform.system() != "Windows":
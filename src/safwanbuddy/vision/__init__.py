@@ -0,0 +1,4 @@
+from .screen_capture import screen_capture
+from .ocr_engine import ocr_engine
+from .element_detector import element_detector
+from .template_matcher import template_matcher
@@ -1,53 +1,172 @@
 import cv2
 import numpy as np
-from src.safwanbuddy.vision.ocr_engine import ocr_engine
+from src.safwanbuddy.vision.preprocessing import to_gray
+
+# One row per detected element; boxes are (x, y, w, h) in frame coordinates
+ELEMENT_DTYPE = np.dtype([("kind", "U6"), ("x", np.int32), ("y", np.int32),
+                          ("w", np.int32), ("h", np.int32), ("score", np.float32)])
+
+BUTTON, INPUT, LABEL = "button", "input", "label"
+
+# Median glyph height (px) of 100%-scale UI text; size limits below are tuned for it
+REFERENCE_GLYPH_HEIGHT = 8
+
+# Least share of its bounding box a button's fitted polygon must fill; an L or a wedge fills far less
+MIN_RECTANGULARITY = 0.8
+
+
+def _elements(kind: str, boxes: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    out = np.empty(len(boxes), dtype=ELEMENT_DTYPE)
+    out["kind"] = kind
+    if len(boxes):
+        out["x"], out["y"], out["w"], out["h"] = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+        out["score"] = scores
+    return out
+
+
+def _bounding_rects(mask: np.ndarray) -> np.ndarray:
+    """(n, 4) int32 array of the bounding rects of the outer contours in mask."""
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    return np.array([cv2.boundingRect(c) for c in contours], dtype=np.int32).reshape(-1, 4)
+
+
+def _ink_density(integral: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """Fraction of set pixels in each box, from the integral image of a 0/255 mask."""
+    if not len(boxes):
+        return np.empty(0, dtype=np.float32)
+    x0, y0 = boxes[:, 0], boxes[:, 1]
+    x1, y1 = x0 + boxes[:, 2], y0 + boxes[:, 3]
+    total = integral[y1, x1] - integral[y0, x1] - integral[y1, x0] + integral[y0, x0]
+    return (total / (255.0 * boxes[:, 2] * boxes[:, 3])).astype(np.float32)
+
+
+def _box_ink(mask: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """Same as _ink_density, counted per box; cheaper than a full integral image for a handful of boxes."""
+    counts = [cv2.countNonZero(mask[y:y + h, x:x + w]) for x, y, w, h in boxes.tolist()]
+    return (np.array(counts, dtype=np.float64) / np.maximum(boxes[:, 2] * boxes[:, 3], 1)).astype(np.float32)
+
+
+def text_scale(rects: np.ndarray, min_glyphs: int = 20) -> float:
+    """
+    Display scale estimated from the ink rects of a frame: the median height
+    of glyph-shaped boxes against REFERENCE_GLYPH_HEIGHT. Frames with too
+    little text count as 100%, and smaller text never tightens the limits.
+    """
+    h = rects[:, 3]
+    glyphs = h[(h >= 4) & (h <= 120) & (rects[:, 2] <= 2 * h)]
+    if len(glyphs) < min_glyphs:
+        return 1.0
+    return float(np.clip(np.median(glyphs) / REFERENCE_GLYPH_HEIGHT, 1.0, 4.0))
+
+
+def _button_shaped(w, h):
+    """Aspect and size of a typical button; works on scalars and arrays."""
+    aspect = w / np.maximum(h, 1)
+    return (aspect > 2) & (aspect < 6) & (w > 50) & (h > 20)
+
+
+def _centers_inside(boxes: np.ndarray, containers: np.ndarray) -> np.ndarray:
+    """Mask of boxes whose center lies inside any of containers."""
+    if not len(boxes) or not len(containers):
+        return np.zeros(len(boxes), dtype=bool)
+    cx = (boxes[:, 0] + boxes[:, 2] / 2)[:, None]
+    cy = (boxes[:, 1] + boxes[:, 3] / 2)[:, None]
+    x, y, w, h = (containers[:, i][None, :] for i in range(4))
+    return ((cx >= x) & (cx < x + w) & (cy >= y) & (cy < y + h)).any(axis=1)
+
 
 class ElementDetector:
-    def __init__(self):
-        pass
+    def __init__(self, label_gap: int = 9, scale: float = None):
+        # Horizontal gap (px at 100%) bridged when merging glyphs into one label
+        self.label_gap = label_gap
+        # Display scale the pixel limits are multiplied by; None estimates it per frame from the text
+        self.scale = scale
+
+    @staticmethod
+    def _buttons(gray: np.ndarray):
+        """Rectangular edge contours. Cheap shape filter first, polygon fit only on the few survivors."""
+        edged = cv2.Canny(cv2.GaussianBlur(gray, (5, 5), 0), 50, 150)
+        contours, _ = cv2.findContours(edged, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        rects = np.array([cv2.boundingRect(c) for c in contours], dtype=np.int32).reshape(-1, 4)
+        boxes, scores = [], []
+        for i in np.flatnonzero(_button_shaped(rects[:, 2], rects[:, 3])):
+            approx = cv2.approxPolyDP(contours[i], 0.02 * cv2.arcLength(contours[i], True), True)
+            if len(approx) != 4:
+                continue
+            # The polygon's box can be smaller than the contour's, so check its shape again
+            x, y, bw, bh = cv2.boundingRect(approx)
+            fill = min(1.0, cv2.contourArea(approx) / max(1, bw * bh))
+            if _button_shaped(bw, bh) and fill >= MIN_RECTANGULARITY:
+                boxes.append((x, y, bw, bh))
+                scores.append(fill)
+        return np.array(boxes, dtype=np.int32).reshape(-1, 4), np.array(scores, dtype=np.float32)
+
+    @staticmethod
+    def _inputs(rects: np.ndarray, density, scale: float):
+        w, h = rects[:, 2], rects[:, 3]
+        inputs = rects[(w / np.maximum(h, 1) > 4) & (w > 100) & (h > 20) & (h < 50 * scale)]
+        # A field is mostly its border, so a hollow box scores highest
+        return inputs, 1 - density(inputs)
+
+    def _labels(self, thresh: np.ndarray, integral: np.ndarray, containers: np.ndarray, scale: float):
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (int(round(self.label_gap * scale)), 1))
+        labels = _bounding_rects(cv2.dilate(thresh, kernel))
+        w, h = labels[:, 2], labels[:, 3]
+        labels = labels[(h >= 8) & (h <= 40 * scale) & (w >= h)]
+        scores = _ink_density(integral, labels)
+        labels, scores = labels[scores > 0.1], scores[scores > 0.1]
+        # Captions inside buttons and text typed into fields are not standalone labels
+        inside = _centers_inside(labels, containers)
+        return labels[~inside], scores[~inside]
+
+    def detect(self, image: np.ndarray, kinds=(BUTTON, INPUT, LABEL)) -> np.ndarray:
+        """
+        Single pass over the frame: grayscale, edges and threshold are computed
+        once and shared, and candidate boxes are filtered as NumPy arrays.
+        Returns a structured array (ELEMENT_DTYPE) of the requested kinds.
+
+        Only the stages the kinds need run: buttons need the edge pass, inputs
+        the threshold pass, and labels both (captions inside buttons and
+        fields are dropped).
+
+        Upper size limits and the label gap grow with the display scale
+        (text_scale), so fields and word gaps at 150-200% still qualify.
+        """
+        gray = to_gray(image)
+        none = np.empty((0, 4), dtype=np.int32), np.empty(0, dtype=np.float32)
+        buttons = self._buttons(gray) if BUTTON in kinds or LABEL in kinds else none
+        inputs = labels = none
+        if INPUT in kinds or LABEL in kinds:
+            # Inputs and labels both come from the dark-on-light threshold
+            _, thresh = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY_INV)
+            rects = _bounding_rects(thresh)
+            scale = self.scale or text_scale(rects)
+            if LABEL in kinds:
+                # Labels are many small boxes; one integral image answers all their densities
+                integral = cv2.integral(thresh)
+                inputs = self._inputs(rects, lambda boxes: _ink_density(integral, boxes), scale)
+                labels = self._labels(thresh, integral, np.concatenate([buttons[0], inputs[0]]), scale)
+            else:
+                inputs = self._inputs(rects, lambda boxes: _box_ink(thresh, boxes), scale)
+
+        found = {BUTTON: buttons, INPUT: inputs, LABEL: labels}
+        return np.concatenate([_elements(kind, *found[kind]) for kind in (BUTTON, INPUT, LABEL) if kind in kinds])
 
     def detect_elements(self, image: np.ndarray):
-        # This would use computer vision to find buttons, fields, etc.
-        # For now, we'll use OCR to find clickable text as a proxy for elements
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        # Placeholder for more advanced detection
-        return ocr_engine.extract_text(image)
+        """Typed UI elements of the frame; see detect."""
+        return self.detect(image)
+
+    @staticmethod
+    def boxes(elements: np.ndarray, kind: str):
+        selected = elements[elements["kind"] == kind]
+        return list(zip(*(selected[field].tolist() for field in ("x", "y", "w", "h"))))
 
     def find_buttons(self, image: np.ndarray):
         """Detect rectangular button-like elements."""
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        blur = cv2.GaussianBlur(gray, (5, 5), 0)
-        edged = cv2.Canny(blur, 50, 150)
-        
-        contours, _ = cv2.findContours(edged, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        buttons = []
-        for cnt in contours:
-            peri = cv2.arcLength(cnt, True)
-            approx = cv2.approxPolyDP(cnt, 0.02 * peri, True)
-            
-            if len(approx) == 4: # Rectangular
-                x, y, w, h = cv2.boundingRect(approx)
-                aspect_ratio = float(w) / h
-                if 2 < aspect_ratio < 6 and w > 50 and h > 20: # Typical button shape
-                    buttons.append((x, y, w, h))
-        
-        return buttons
+        return self.boxes(self.detect(image, (BUTTON,)), BUTTON)
 
     def find_input_fields(self, image: np.ndarray):
         """Detect potential input field elements."""
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        _, thresh = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY_INV)
-        
-        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        fields = []
-        for cnt in contours:
-            x, y, w, h = cv2.boundingRect(cnt)
-            aspect_ratio = float(w) / h
-            if aspect_ratio > 4 and w > 100 and 20 < h < 50:
-                fields.append((x, y, w, h))
-        
-        return fields
+        return self.boxes(self.detect(image, (INPUT,)), INPUT)
 
 element_detector = ElementDetector()
@@ -0,0 +1,173 @@
+import sys
+import threading
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from typing import NamedTuple
+import numpy as np
+
+HEADER_FIELDS = 4  # generation, height, width, channels
+HEADER_ALIGN = 64
+
+
+class StaleFrameError(RuntimeError):
+    """The slot was rewritten: the reference's frame no longer exists."""
+
+
+class FrameRef(NamedTuple):
+    """Picklable handle to a frame in a FrameRing; a few bytes instead of the pixels."""
+    ring: str  # shared memory block name
+    slots: int
+    slot_bytes: int
+    slot: int
+    generation: int
+    shape: tuple
+
+
+def _data_offset(slots: int) -> int:
+    return -(-slots * HEADER_FIELDS * 8 // HEADER_ALIGN) * HEADER_ALIGN
+
+
+def _layout(buf, slots: int, slot_bytes: int):
+    """(header, data) arrays over a ring block: a small int64 header, then the slots."""
+    header = np.ndarray((slots, HEADER_FIELDS), dtype=np.int64, buffer=buf)
+    data = np.ndarray((slots, slot_bytes), dtype=np.uint8, buffer=buf, offset=_data_offset(slots))
+    return header, data
+
+
+class FrameRing:
+    """
+    Fixed ring of uint8 frame slots in one shared memory block. Each write
+    bumps the slot's generation counter, so a FrameRef names exactly one
+    frame. The owning process keeps a refcount per slot; a slot is only
+    reused once every lease on it has been released, and readers in other
+    processes check the generation to detect misuse.
+    """
+
+    def __init__(self, slots: int = 4, slot_bytes: int = 3840 * 2160 * 3):
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.shm = shared_memory.SharedMemory(create=True, size=_data_offset(slots) + slots * slot_bytes)
+        self.name = self.shm.name
+        self._header, self._data = _layout(self.shm.buf, slots, slot_bytes)
+        self._header[:] = 0
+        self._refcounts = [0] * slots
+        self._generation = 0
+        self._cond = threading.Condition()
+        self.closed = False
+
+    def _reserve(self, timeout: float) -> int:
+        """Picks the free slot holding the oldest frame, waiting up to timeout for a release."""
+        free = lambda: [i for i, refs in enumerate(self._refcounts) if refs == 0]
+        if not self._cond.wait_for(free, timeout):
+            raise TimeoutError("No free frame slot: every slot is still leased")
+        return min(free(), key=lambda i: self._header[i, 0])
+
+    @contextmanager
+    def writing(self, shape, timeout: float = 1.0):
+        """
+        Reserves a slot and yields (FrameRef, writable view) for filling in place,
+        e.g. as the dst of cv2.cvtColor. The caller holds one lease on the frame.
+        """
+        shape = tuple(int(v) for v in shape)
+        nbytes = int(np.prod(shape))
+        if nbytes > self.slot_bytes:
+            raise ValueError(f"Frame of {nbytes} bytes exceeds the {self.slot_bytes}-byte slots")
+        with self._cond:
+            slot = self._reserve(timeout)
+            self._refcounts[slot] = 1
+            self._generation += 1
+            generation = self._generation
+            self._header[slot, 0] = -1  # Being written
+        view = self._data[slot, :nbytes].reshape(shape)
+        try:
+            yield FrameRef(self.name, self.slots, self.slot_bytes, slot, generation, shape), view
+        except BaseException:
+            self.release_slot(slot)
+            raise
+        height, width, channels = (shape + (1, 1))[:3]
+        self._header[slot] = (generation, height, width, channels)
+
+    def write(self, image: np.ndarray, timeout: float = 1.0) -> FrameRef:
+        """Copies image into a free slot; the caller holds one lease on the returned frame."""
+        with self.writing(image.shape, timeout) as (ref, view):
+            view[...] = image
+        return ref
+
+    def acquire(self, ref: FrameRef) -> FrameRef:
+        """Adds a lease, e.g. for each task handed to a worker."""
+        with self._cond:
+            if int(self._header[ref.slot, 0]) != ref.generation:
+                raise StaleFrameError(f"Slot {ref.slot} no longer holds generation {ref.generation}")
+            self._refcounts[ref.slot] += 1
+        return ref
+
+    def release(self, ref: FrameRef):
+        self.release_slot(ref.slot)
+
+    def release_slot(self, slot: int):
+        with self._cond:
+            self._refcounts[slot] = max(0, self._refcounts[slot] - 1)
+            self._cond.notify_all()
+
+    def view(self, ref: FrameRef) -> np.ndarray:
+        """Read-only view of a frame in the owning process."""
+        if int(self._header[ref.slot, 0]) != ref.generation:
+            raise StaleFrameError(f"Slot {ref.slot} no longer holds generation {ref.generation}")
+        view = self._data[ref.slot, :int(np.prod(ref.shape))].reshape(ref.shape)
+        view.flags.writeable = False
+        return view
+
+    def leased(self) -> int:
+        with self._cond:
+            return sum(1 for refs in self._refcounts if refs)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        del self._header, self._data
+        self.shm.close()
+        if sys.version_info < (3, 13):
+            # A reader started by multiprocessing shares this process's resource_tracker, so its
+            # unregister (see _attach_block) also dropped ours; unlink would then fail to unregister
+            resource_tracker.register(self.shm._name, "shared_memory")
+        self.shm.unlink()
+
+
+# Reader side: blocks attached by this process, by name (kept small; rings are few and long-lived)
+_attached = {}
+
+
+def _attach_block(ref: FrameRef):
+    block = _attached.get(ref.ring)
+    if block is None:
+        if len(_attached) >= 4:
+            # Drop the oldest ring; its arrays go with the tuple before the mapping closes
+            oldest = _attached.pop(next(iter(_attached)))[0]
+            oldest.close()
+        # Only the owning ring may unlink the block. Attaching registers it with this process's
+        # resource_tracker, which would unlink it (or warn of a leak) when the reader exits;
+        # 3.13+ can skip that, older versions have to unregister right after attaching
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=ref.ring, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=ref.ring)
+            resource_tracker.unregister(shm._name, "shared_memory")
+        block = _attached[ref.ring] = (shm, *_layout(shm.buf, ref.slots, ref.slot_bytes))
+    return block
+
+
+@contextmanager
+def attach_frame(ref: FrameRef):
+    """
+    Zero-copy read-only view of a frame from another process. Views must not
+    outlive the with block; the generation is checked on entry and exit.
+    """
+    _, header, data = _attach_block(ref)
+    if int(header[ref.slot, 0]) != ref.generation:
+        raise StaleFrameError(f"Slot {ref.slot} no longer holds generation {ref.generation}")
+    view = data[ref.slot, :int(np.prod(ref.shape))].reshape(ref.shape)
+    view.flags.writeable = False
+    yield view
+    if int(header[ref.slot, 0]) != ref.generation:
+        raise StaleFrameError(f"Slot {ref.slot} was rewritten while being read")
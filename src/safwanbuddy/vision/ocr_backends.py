@@ -0,0 +1,123 @@
+import os
+import queue
+import threading
+from contextlib import contextmanager
+import numpy as np
+import pytesseract
+
+# Optional: a persistent in-process engine instead of one tesseract process per call
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+DATA_KEYS = ("text", "conf", "left", "top", "width", "height", "block_num", "par_num", "line_num")
+
+
+class PytesseractBackend:
+    """Spawns the tesseract CLI per call; always available."""
+    name = "pytesseract"
+
+    def __init__(self, tesseract_cmd: str = None):
+        if tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    @staticmethod
+    def _config(psm: int = None, whitelist: str = None) -> str:
+        parts = []
+        if psm is not None:
+            parts.append(f"--psm {psm}")
+        if whitelist:
+            parts.append(f"-c tessedit_char_whitelist={whitelist}")
+        return " ".join(parts)
+
+    def image_to_data(self, image: np.ndarray, lang: str = "eng", psm: int = None, whitelist: str = None) -> dict:
+        return pytesseract.image_to_data(image, lang=lang, config=self._config(psm, whitelist),
+                                         output_type=pytesseract.Output.DICT)
+
+    def image_to_string(self, image: np.ndarray, lang: str = "eng", psm: int = None, whitelist: str = None) -> str:
+        return pytesseract.image_to_string(image, lang=lang, config=self._config(psm, whitelist))
+
+
+class TesserocrBackend:
+    """
+    Keeps warm PyTessBaseAPI engines (traineddata loaded once) in a pool per
+    language, so parallel callers each borrow their own engine. Images are
+    handed over as raw NumPy bytes; nothing touches the disk.
+    """
+    name = "tesserocr"
+
+    def __init__(self, pool_size: int = None, tessdata_path: str = None):
+        self.pool_size = pool_size or max(1, (os.cpu_count() or 2) // 2)
+        self.tessdata_path = tessdata_path
+        self._pools = {}
+        self._created = {}
+        self._lock = threading.Lock()
+
+    def _new_engine(self, lang: str):
+        if self.tessdata_path:
+            return tesserocr.PyTessBaseAPI(path=self.tessdata_path, lang=lang)
+        return tesserocr.PyTessBaseAPI(lang=lang)
+
+    @contextmanager
+    def engine(self, lang: str = "eng"):
+        with self._lock:
+            pool = self._pools.setdefault(lang, queue.Queue())
+            api = None
+            if pool.empty() and self._created.get(lang, 0) < self.pool_size:
+                self._created[lang] = self._created.get(lang, 0) + 1
+                api = self._new_engine(lang)
+        if api is None:
+            api = pool.get()
+        try:
+            yield api
+        finally:
+            api.Clear()
+            pool.put(api)
+
+    @staticmethod
+    def _set_image(api, image: np.ndarray, psm: int = None, whitelist: str = None):
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+        height, width = image.shape[:2]
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        api.SetPageSegMode(tesserocr.PSM.AUTO if psm is None else psm)
+        api.SetVariable("tessedit_char_whitelist", whitelist or "")
+        api.SetImageBytes(image.tobytes(), width, height, channels, width * channels)
+
+    def image_to_data(self, image: np.ndarray, lang: str = "eng", psm: int = None, whitelist: str = None) -> dict:
+        data = {key: [] for key in DATA_KEYS}
+        RIL = tesserocr.RIL
+        with self.engine(lang) as api:
+            self._set_image(api, image, psm, whitelist)
+            api.Recognize()
+            iterator = api.GetIterator()
+            if iterator is None:
+                return data
+            block = par = line = 0
+            for word in tesserocr.iterate_level(iterator, RIL.WORD):
+                if word.IsAtBeginningOf(RIL.BLOCK):
+                    block, par, line = block + 1, 0, 0
+                if word.IsAtBeginningOf(RIL.PARA):
+                    par, line = par + 1, 0
+                if word.IsAtBeginningOf(RIL.TEXTLINE):
+                    line += 1
+                text = word.GetUTF8Text(RIL.WORD)
+                box = word.BoundingBox(RIL.WORD)
+                if not text or box is None:
+                    continue
+                x1, y1, x2, y2 = box
+                for key, value in zip(DATA_KEYS, (text, word.Confidence(RIL.WORD), x1, y1, x2 - x1, y2 - y1, block, par, line)):
+                    data[key].append(value)
+        return data
+
+    def image_to_string(self, image: np.ndarray, lang: str = "eng", psm: int = None, whitelist: str = None) -> str:
+        with self.engine(lang) as api:
+            self._set_image(api, image, psm, whitelist)
+            return api.GetUTF8Text()
+
+
+def create_backend(preferred: str = "auto", tesseract_cmd: str = None, pool_size: int = None):
+    """Returns the tesserocr backend when available (or requested), else pytesseract."""
+    if preferred in ("auto", "tesserocr") and tesserocr is not None:
+        return TesserocrBackend(pool_size=pool_size)
+    return PytesseractBackend(tesseract_cmd)
@@ -1,43 +1,101 @@
-import pytesseract
-import cv2
 import numpy as np
+from src.safwanbuddy.vision.ocr_backends import create_backend
+from src.safwanbuddy.vision.ocr_frame import OCRFrame
+from src.safwanbuddy.vision.parallel_ocr import ParallelOCR
+from src.safwanbuddy.vision.preprocessing import PreprocessPipeline
+from src.safwanbuddy.vision.screen_capture import screen_capture
+from src.safwanbuddy.vision.tile_cache import TileOCRCache
+
+# Tesseract page segmentation: scattered UI labels, and a crop holding one line of text
+PSM_SPARSE_TEXT = 11
+PSM_SINGLE_LINE = 7
+
+
+def hint_whitelist(text: str) -> str:
+    """Character whitelist for an expected text: its characters in both cases."""
+    chars = set(text.replace(" ", "")) | set(text.lower().replace(" ", "")) | set(text.upper().replace(" ", ""))
+    return "".join(sorted(chars))
+
+
+def grow_region(region, factor: float, bounds):
+    """Scales an (x, y, w, h) region about its center, clipped to (width, height) bounds."""
+    x, y, w, h = region
+    width, height = bounds
+    new_w, new_h = min(width, max(w + 1, int(w * factor))), min(height, max(h + 1, int(h * factor)))
+    new_x = max(0, min(width - new_w, int(x + w / 2 - new_w / 2)))
+    new_y = max(0, min(height - new_h, int(y + h / 2 - new_h / 2)))
+    return new_x, new_y, new_w, new_h
+
 
 class OCREngine:
-    def __init__(self, tesseract_cmd: str = None):
-        if tesseract_cmd:
-            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    def __init__(self, tesseract_cmd: str = None, backend: str = "auto", preprocess: PreprocessPipeline = None):
+        # Warm tesserocr engines when installed, otherwise one tesseract process per call
+        self.backend = create_backend(backend, tesseract_cmd)
+        self.preprocess = preprocess or PreprocessPipeline()
+        self.tile_cache = TileOCRCache(self.recognize)
+        # Worker processes start on the first parallel call
+        self.parallel = ParallelOCR(backend=backend, tesseract_cmd=tesseract_cmd, preprocess=self.preprocess)
 
     def _preprocess(self, image: np.ndarray) -> np.ndarray:
-        """Preprocessing for better OCR results."""
-        if len(image.shape) == 3:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = image
-            
-        # Denoising
-        denoised = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
-        
-        # Thresholding
-        _, thresh = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        
-        return thresh
+        """Preprocessing for better OCR results; see PreprocessPipeline.timings for the cost."""
+        return self.preprocess(image)
 
     def extract_text(self, image: np.ndarray) -> str:
         processed = self._preprocess(image)
-        return pytesseract.image_to_string(processed)
+        return self.backend.image_to_string(processed)
 
-    def find_text(self, image: np.ndarray, target_text: str):
+    def recognize(self, image: np.ndarray, lang: str = "eng", psm: int = None, whitelist: str = None,
+                  offset=(0, 0)) -> OCRFrame:
+        """Runs OCR once and returns an indexed OCRFrame for any number of lookups."""
         processed = self._preprocess(image)
         # Using image_to_data for positional information
-        data = pytesseract.image_to_data(processed, output_type=pytesseract.Output.DICT)
-        
-        matches = []
-        n_boxes = len(data['text'])
-        for i in range(n_boxes):
-            if target_text.lower() in data['text'][i].lower():
-                (x, y, w, h) = (data['left'][i], data['top'][i], data['width'][i], data['height'][i])
-                matches.append((x, y, w, h, data['conf'][i]))
-        
-        return matches
+        data = self.backend.image_to_data(processed, lang=lang, psm=psm, whitelist=whitelist)
+        return OCRFrame(data, scale=processed.shape[1] / image.shape[1], offset=offset)
+
+    def recognize_cached(self, image: np.ndarray) -> OCRFrame:
+        """Like recognize, but only re-runs OCR on tiles that changed since earlier frames."""
+        return self.tile_cache.recognize(image)
+
+    def recognize_parallel(self, image: np.ndarray) -> OCRFrame:
+        """Tiled OCR across a process pool for 4K and multi-monitor frames."""
+        if max(image.shape[:2]) <= self.parallel.tile_size:
+            return self.recognize(image)
+        return self.parallel.recognize(image)
+
+    def locate_text(self, target_text: str, region=None, image: np.ndarray = None, whitelist=None,
+                    lang: str = "eng", psm: int = PSM_SPARSE_TEXT, growth: float = 2.0, monitor_id: int = 1):
+        """
+        Targeted lookup for text expected near region (x, y, w, h). Only that crop
+        is captured and OCRed, in sparse-text mode; on a miss the region grows
+        by growth about its center until it spans the whole screen (or image).
+        whitelist=True restricts recognition to the characters of target_text.
+        Returns (x, y, w, h, conf) matches in screen (or image) coordinates.
+        """
+        if whitelist is True:
+            whitelist = hint_whitelist(target_text)
+        if image is not None:
+            bounds = image.shape[1], image.shape[0]
+        else:
+            bounds = screen_capture.monitor_size(monitor_id)
+        region = region or (0, 0, *bounds)
+
+        while True:
+            x, y, w, h = region
+            if image is not None:
+                crop = image[y:y + h, x:x + w]
+            else:
+                crop = screen_capture.capture(monitor_id, region=region)
+            matches = self.recognize(crop, lang=lang, psm=psm, whitelist=whitelist, offset=(x, y)).find_text(target_text)
+            if matches or (w, h) == bounds:
+                return matches
+            region = grow_region(region, growth, bounds)
+
+    def find_text(self, image, target_text: str, parallel: bool = False):
+        """Accepts a frame image or an OCRFrame already recognized from it."""
+        if isinstance(image, OCRFrame):
+            frame = image
+        else:
+            frame = self.recognize_parallel(image) if parallel else self.recognize(image)
+        return frame.find_text(target_text)
 
 ocr_engine = OCREngine()
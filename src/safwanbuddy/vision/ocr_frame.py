@@ -0,0 +1,88 @@
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+
+class OCRFrame:
+    """
+    Recognition result for one captured frame. Tesseract runs once; words and
+    lines are indexed so any number of find_text lookups are answered from
+    memory. Boxes are (x, y, w, h) in frame coordinates.
+    """
+
+    def __init__(self, data: Dict[str, list], scale: float = 1.0, offset: Tuple[int, int] = (0, 0)):
+        # data follows pytesseract.image_to_data(output_type=Output.DICT)
+        self.words: List[dict] = []
+        self.lines: Dict[tuple, List[int]] = defaultdict(list)
+        self._vocabulary: Dict[str, List[int]] = defaultdict(list)
+        self._cache: Dict[str, list] = {}
+
+        ox, oy = offset
+        texts = data.get("text", [])
+        pages = data.get("page_num") or [1] * len(texts)
+        for i, text in enumerate(texts):
+            text = str(text).strip()
+            conf = float(data["conf"][i])
+            if not text or conf < 0:
+                continue
+            line_key = (pages[i], data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            self.add_word(text,
+                          int(data["left"][i] / scale) + ox, int(data["top"][i] / scale) + oy,
+                          int(round(data["width"][i] / scale)), int(round(data["height"][i] / scale)),
+                          conf, line_key)
+
+    def add_word(self, text: str, x: int, y: int, w: int, h: int, conf: float, line_key: tuple):
+        index = len(self.words)
+        self.words.append({"text": text, "box": (x, y, w, h), "conf": conf, "line": line_key})
+        self.lines[line_key].append(index)
+        self._vocabulary[text.lower()].append(index)
+        self._cache.clear()
+
+    @classmethod
+    def from_words(cls, words: List[dict]):
+        """Builds a frame from word dicts as produced by another frame's .words."""
+        frame = cls({})
+        for word in words:
+            frame.add_word(word["text"], *word["box"], word["conf"], word["line"])
+        return frame
+
+    @property
+    def text(self) -> str:
+        return "\n".join(" ".join(self.words[i]["text"] for i in indices) for indices in self.lines.values())
+
+    def _containing(self, token: str) -> List[int]:
+        """Indices of words containing token, scanning the vocabulary rather than every word."""
+        exact = self._vocabulary.get(token)
+        hits = [i for word, indices in self._vocabulary.items() if token in word and word != token for i in indices]
+        return sorted((exact or []) + hits)
+
+    def find_text(self, target_text: str):
+        """
+        Returns (x, y, w, h, conf) for every occurrence of target_text. A single
+        word matches any word containing it; a phrase matches consecutive words
+        of one line, returning their union box and lowest confidence.
+        """
+        query = target_text.lower().strip()
+        if query in self._cache:
+            return self._cache[query]
+
+        tokens = query.split()
+        matches = []
+        if len(tokens) == 1:
+            for i in self._containing(tokens[0]):
+                word = self.words[i]
+                matches.append((*word["box"], word["conf"]))
+        elif tokens:
+            for i in self._containing(tokens[0]):
+                line = self.lines[self.words[i]["line"]]
+                pos = line.index(i)
+                span = line[pos:pos + len(tokens)]
+                if len(span) < len(tokens):
+                    continue
+                if all(token in self.words[j]["text"].lower() for token, j in zip(tokens[1:], span[1:])):
+                    boxes = [self.words[j]["box"] for j in span]
+                    x0, y0 = min(b[0] for b in boxes), min(b[1] for b in boxes)
+                    x1, y1 = max(b[0] + b[2] for b in boxes), max(b[1] + b[3] for b in boxes)
+                    matches.append((x0, y0, x1 - x0, y1 - y0, min(self.words[j]["conf"] for j in span)))
+
+        self._cache[query] = matches
+        return matches
@@ -0,0 +1,86 @@
+from src.safwanbuddy.vision.ocr_frame import OCRFrame
+from src.safwanbuddy.vision.tile_cache import regroup_lines
+from src.safwanbuddy.vision.vision_service import VisionService
+
+
+def tile_rects(width: int, height: int, tile_size: int, overlap: int):
+    """Overlapping (x0, y0, x1, y1) tiles covering the frame."""
+    step = max(1, tile_size - overlap)
+
+    def starts(length):
+        positions = [0]
+        while positions[-1] + tile_size < length:
+            positions.append(positions[-1] + step)
+        return positions
+
+    return [(x, y, min(width, x + tile_size), min(height, y + tile_size))
+            for y in starts(height) for x in starts(width)]
+
+
+def _owned(box, rect, width: int, height: int, overlap: int) -> bool:
+    """A word belongs to the tile whose core (tile minus half of each inner overlap) holds its center."""
+    x, y, w, h = box
+    cx, cy = x + w / 2, y + h / 2
+    x0, y0, x1, y1 = rect
+    half = overlap / 2
+    left = x0 + half if x0 > 0 else 0
+    top = y0 + half if y0 > 0 else 0
+    right = x1 - half if x1 < width else width
+    bottom = y1 - half if y1 < height else height
+    return left <= cx < right and top <= cy < bottom
+
+
+def _overlap_ratio(a, b) -> float:
+    ix = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+    iy = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    if ix <= 0 or iy <= 0:
+        return 0.0
+    return ix * iy / min(a[2] * a[3], b[2] * b[3])
+
+
+def merge_tile_words(results, width: int, height: int, overlap: int):
+    """
+    Combines per-tile words into one list: each tile keeps the words centered
+    in its core, and any remaining duplicate (same text, mostly overlapping
+    box) from a word cut differently by two tiles is dropped.
+    """
+    merged = []
+    for rect, words in results:
+        for word in words:
+            if not _owned(word["box"], rect, width, height, overlap):
+                continue
+            duplicate = any(other["text"].lower() == word["text"].lower() and _overlap_ratio(other["box"], word["box"]) > 0.5
+                            for other in merged)
+            if not duplicate:
+                merged.append(word)
+    return regroup_lines(merged)
+
+
+class ParallelOCR:
+    """
+    OCR for large or multi-monitor frames: the frame is written once into the
+    vision service's shared memory ring and overlapping tiles are recognized
+    across its process pool, each worker holding its own warm backend.
+    """
+
+    def __init__(self, workers: int = None, tile_size: int = 1024, overlap: int = 96,
+                 backend: str = "auto", tesseract_cmd: str = None, preprocess=None, service: VisionService = None):
+        # overlap should exceed the tallest expected text line so every word is whole in some tile
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.service = service or VisionService(workers, backend=backend, tesseract_cmd=tesseract_cmd,
+                                                preprocess=preprocess)
+
+    def recognize(self, image) -> OCRFrame:
+        height, width = image.shape[:2]
+        ref = self.service.put(image)
+        try:
+            rects = tile_rects(width, height, self.tile_size, self.overlap)
+            futures = [(rect, self.service.ocr(ref, rect)) for rect in rects]
+            results = [(rect, future.result()) for rect, future in futures]
+        finally:
+            self.service.release(ref)
+        return OCRFrame.from_words(merge_tile_words(results, width, height, self.overlap))
+
+    def shutdown(self):
+        self.service.shutdown()
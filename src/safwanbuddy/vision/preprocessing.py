@@ -0,0 +1,103 @@
+import time
+import cv2
+import numpy as np
+
+# Second-difference kernel: flat and linear regions cancel, iid noise leaves 6 sigma of spread
+_NOISE_KERNEL = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], dtype=np.float32)
+
+
+def to_gray(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 2:
+        return image
+    code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+    return cv2.cvtColor(image, code)
+
+
+def estimate_noise(gray: np.ndarray) -> float:
+    """
+    Fast estimate of the noise sigma of a grayscale image. Uses the median
+    filter response, so the sparse strong edges of UI text do not count as noise.
+    """
+    if min(gray.shape[:2]) < 3:
+        return 0.0
+    response = cv2.filter2D(gray, cv2.CV_32F, _NOISE_KERNEL)
+    # A strided sample keeps the median cheap on full-screen frames
+    return float(np.median(np.abs(response[1:-1:3, 1:-1:3]))) / (0.6745 * 6)
+
+
+class PreprocessPipeline:
+    """
+    OCR preprocessing in cheap, configurable stages: grayscale, rescale, a
+    denoise that in "auto" mode only runs when the noise estimate calls for
+    it, then Otsu or adaptive thresholding. The stage timings (ms) of the
+    last run are kept in .timings.
+
+    Instances are plain picklable callables, so the same pipeline can be
+    handed to ParallelOCR workers. Callers get the applied scale from the
+    output width; OCRFrame maps boxes back with it.
+    """
+
+    def __init__(self, scale: float = 1.0, max_width: int = None, denoise="auto", noise_threshold: float = 3.0,
+                 threshold: str = "otsu", block_size: int = 31, offset: int = 10):
+        self.scale = scale
+        self.max_width = max_width
+        self.denoise = denoise  # True, False or "auto"
+        self.noise_threshold = noise_threshold
+        self.threshold = threshold  # "otsu", "adaptive" or None
+        self.block_size = block_size
+        self.offset = offset
+        self.timings = {}
+        self.last_noise = None
+        self.last_denoised = False
+
+    def _scale_for(self, width: int) -> float:
+        scale = self.scale
+        if self.max_width and width * scale > self.max_width:
+            scale = self.max_width / width
+        return scale
+
+    def __call__(self, image: np.ndarray) -> np.ndarray:
+        timings = {}
+        clock = time.perf_counter()
+
+        def lap(stage):
+            nonlocal clock
+            now = time.perf_counter()
+            timings[stage] = (now - clock) * 1000
+            clock = now
+
+        gray = to_gray(image)
+        lap("gray")
+
+        scale = self._scale_for(gray.shape[1])
+        if scale != 1.0:
+            interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=interpolation)
+            lap("scale")
+
+        denoise = self.denoise
+        if denoise == "auto":
+            self.last_noise = estimate_noise(gray)
+            denoise = self.last_noise >= self.noise_threshold
+            lap("noise_estimate")
+        if denoise:
+            gray = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
+            lap("denoise")
+        self.last_denoised = bool(denoise)
+
+        if self.threshold == "otsu":
+            _, gray = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            lap("threshold")
+        elif self.threshold == "adaptive":
+            gray = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY,
+                                         self.block_size, self.offset)
+            lap("threshold")
+
+        timings["total"] = sum(timings.values())
+        self.timings = timings
+        return gray
+
+    def __repr__(self):
+        return (f"PreprocessPipeline(scale={self.scale}, max_width={self.max_width}, denoise={self.denoise!r}, "
+                f"threshold={self.threshold!r})")
+
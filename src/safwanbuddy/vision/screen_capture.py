@@ -1,18 +1,82 @@
+import threading
 import mss
 import numpy as np
-from PIL import Image
+import cv2
+
+# cv2 conversions out of mss's native BGRA layout
+_CONVERSIONS = {
+    "bgr": (cv2.COLOR_BGRA2BGR, 3),
+    "rgb": (cv2.COLOR_BGRA2RGB, 3),
+    "gray": (cv2.COLOR_BGRA2GRAY, None),
+}
 
 class ScreenCapture:
     def __init__(self):
-        self.sct = mss.mss()
+        # mss handles are per thread and need a display, so they are opened on first use;
+        # reuse buffers are per thread too, so concurrent captures never share one
+        self._local = threading.local()
+
+    @property
+    def sct(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = self._local.sct = mss.mss()
+        return sct
+
+    def _grab_area(self, monitor_id: int, region=None) -> dict:
+        """Turns an optional (left, top, width, height) region, relative to the monitor, into an mss area."""
+        monitor = self.sct.monitors[monitor_id]
+        if region is None:
+            return monitor
+        left, top, width, height = region
+        left = max(0, min(int(left), monitor["width"] - 1))
+        top = max(0, min(int(top), monitor["height"] - 1))
+        return {
+            "left": monitor["left"] + left,
+            "top": monitor["top"] + top,
+            "width": max(1, min(int(width), monitor["width"] - left)),
+            "height": max(1, min(int(height), monitor["height"] - top)),
+        }
+
+    def grab_bgra(self, monitor_id: int = 1, region=None) -> np.ndarray:
+        """Returns an (h, w, 4) BGRA view over the mss buffer without copying."""
+        screenshot = self.sct.grab(self._grab_area(monitor_id, region))
+        return np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(screenshot.height, screenshot.width, 4)
+
+    def _buffer(self, mode: str, shape) -> np.ndarray:
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+        buf = buffers.get(mode)
+        if buf is None or buf.shape != shape:
+            buf = buffers[mode] = np.empty(shape, dtype=np.uint8)
+        return buf
+
+    def capture(self, monitor_id: int = 1, region=None, mode: str = "bgr", out: np.ndarray = None, reuse: bool = False):
+        """
+        Captures the monitor (or a region of it) as a NumPy array.
+
+        mode is "bgr" (OpenCV order, default), "rgb", "gray" or "bgra" (zero-copy view).
+        The conversion writes into out if given; with reuse=True it writes into a
+        buffer owned by the calling thread that its next reuse capture overwrites.
+        """
+        bgra = self.grab_bgra(monitor_id, region)
+        if mode == "bgra":
+            return bgra
+
+        code, channels = _CONVERSIONS[mode]
+        if out is None and reuse:
+            shape = bgra.shape[:2] + ((channels,) if channels else ())
+            out = self._buffer(mode, shape)
+        if out is None:
+            return cv2.cvtColor(bgra, code)
+        return cv2.cvtColor(bgra, code, dst=out)
+
+    def capture_gray(self, monitor_id: int = 1, region=None, out: np.ndarray = None, reuse: bool = False):
+        return self.capture(monitor_id, region, mode="gray", out=out, reuse=reuse)
 
-    def capture(self, monitor_id: int = 1):
-        # monitor 1 is usually the full screen
+    def monitor_size(self, monitor_id: int = 1):
         monitor = self.sct.monitors[monitor_id]
-        screenshot = self.sct.grab(monitor)
-        
-        # Convert to numpy array for OpenCV/other processing
-        img = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
-        return np.array(img)
+        return monitor["width"], monitor["height"]
 
 screen_capture = ScreenCapture()
@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import deque
+from typing import NamedTuple, Optional
+import numpy as np
+from src.safwanbuddy.core import config_manager, event_bus, logger
+from src.safwanbuddy.vision.screen_capture import ScreenCapture, screen_capture
+from src.safwanbuddy.vision.tile_cache import TileHasher
+
+
+class WatchedFrame(NamedTuple):
+    seq: int
+    timestamp: float
+    image: np.ndarray  # BGR, read-only: shared by every consumer
+    dirty: list  # (x, y, w, h) rects changed since the previous frame
+
+
+class ScreenWatcher:
+    """
+    Captures one monitor at a fixed rate on a background thread into a ring
+    of recent frames. Consumers read the latest frame instead of capturing
+    their own, and "screen_changed" is emitted with the dirty rectangles
+    whenever tiles differ from the previous frame.
+    """
+
+    def __init__(self, fps: float = None, ring_size: int = None, monitor_id: int = 1, tile_size: int = 64):
+        self.fps = fps or config_manager.get("vision.watch_fps", 5)
+        self.monitor_id = monitor_id
+        self.hasher = TileHasher(tile_size)
+        self.frames = deque(maxlen=ring_size or config_manager.get("vision.watch_ring", 4))
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._seq = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="screen-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Screen watcher started at {self.fps} fps")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run(self):
+        # mss handles are per thread, so the watcher owns its own capture
+        capture = ScreenCapture()
+        interval = 1.0 / self.fps
+        previous = None
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            try:
+                image = capture.capture(self.monitor_id)
+                image.flags.writeable = False
+                hashes = self.hasher.hash_tiles(image)
+                height, width = image.shape[:2]
+                dirty = [(x, y, min(w, width - x), min(h, height - y))
+                         for x, y, w, h in TileHasher.dirty_rects(previous, hashes, self.hasher.tile_size)]
+                previous = hashes
+                with self._lock:
+                    self._seq += 1
+                    frame = WatchedFrame(self._seq, time.time(), image, dirty)
+                    self.frames.append(frame)
+                if dirty:
+                    event_bus.emit("screen_changed", {"seq": frame.seq, "rects": dirty, "timestamp": frame.timestamp})
+            except Exception as e:
+                logger.error(f"Screen watcher capture failed: {e}")
+            self._stop.wait(max(0.0, interval - (time.perf_counter() - started)))
+
+    def latest(self, max_age: float = None) -> Optional[WatchedFrame]:
+        """Newest frame in the ring, or None if there is none (or it is older than max_age seconds)."""
+        with self._lock:
+            frame = self.frames[-1] if self.frames else None
+        if frame is None or (max_age is not None and time.time() - frame.timestamp > max_age):
+            return None
+        return frame
+
+    def frames_since(self, seq: int):
+        """Frames still in the ring that are newer than seq."""
+        with self._lock:
+            return [frame for frame in self.frames if frame.seq > seq]
+
+    def latest_or_capture(self, max_age: float = None) -> np.ndarray:
+        """
+        Latest watched image if fresh enough (default: within two frame
+        intervals), otherwise a direct capture. Treat the result as read-only.
+        """
+        if max_age is None:
+            max_age = 2.0 / self.fps
+        frame = self.latest(max_age) if self.is_running else None
+        if frame is not None:
+            return frame.image
+        return screen_capture.capture(self.monitor_id)
+
+screen_watcher = ScreenWatcher()
@@ -0,0 +1,106 @@
+from collections import defaultdict
+import numpy as np
+
+
+def _box(item):
+    return tuple(int(v) for v in item[:4])
+
+
+class SpatialIndex:
+    """
+    Uniform grid over the boxes of one frame (OCR words and detected elements),
+    for neighbourhood queries such as "the input field right of this label".
+    Items are (box, kind, payload); boxes are (x, y, w, h).
+    """
+
+    def __init__(self, cell_size: int = 64):
+        self.cell_size = cell_size
+        self.items = []
+        self._cells = defaultdict(list)
+
+    def _cells_for(self, x, y, w, h):
+        c = self.cell_size
+        for row in range(int(y) // c, int(y + max(h, 1) - 1) // c + 1):
+            for col in range(int(x) // c, int(x + max(w, 1) - 1) // c + 1):
+                yield row, col
+
+    def insert(self, box, kind: str, payload=None) -> int:
+        index = len(self.items)
+        box = _box(box)
+        self.items.append((box, kind, payload))
+        for cell in self._cells_for(*box):
+            self._cells[cell].append(index)
+        return index
+
+    @classmethod
+    def from_frame(cls, frame=None, elements: np.ndarray = None, cell_size: int = 64):
+        """Indexes an OCRFrame's words (kind "word") and ElementDetector.detect rows (their own kinds)."""
+        index = cls(cell_size)
+        if frame is not None:
+            for word in frame.words:
+                index.insert(word["box"], "word", word["text"])
+        if elements is not None:
+            for row in elements:
+                index.insert((row["x"], row["y"], row["w"], row["h"]), str(row["kind"]), float(row["score"]))
+        return index
+
+    def query(self, rect, kind: str = None):
+        """Indices of items intersecting rect (x, y, w, h), optionally of one kind."""
+        x, y, w, h = rect
+        seen = set()
+        for cell in self._cells_for(x, y, w, h):
+            for i in self._cells.get(cell, ()):
+                if i in seen:
+                    continue
+                seen.add(i)
+                (bx, by, bw, bh), item_kind, _ = self.items[i]
+                if kind and item_kind != kind:
+                    continue
+                if bx < x + w and bx + bw > x and by < y + h and by + bh > y:
+                    yield i
+
+    def _right_of(self, box, kind: str, max_distance: int):
+        """(gap, index) for kind items on the same row to the right of box."""
+        x, y, w, h = box
+        for i in self.query((x + w, y - h, max_distance, 3 * h), kind):
+            bx, by, bw, bh = self.items[i][0]
+            # Same row: the candidate spans the label's vertical center
+            if bx >= x + w - 2 and by <= y + h / 2 <= by + bh:
+                yield bx - (x + w), i
+
+    def _below(self, box, kind: str, max_distance: int):
+        """(gap, index) for kind items under box that overlap it horizontally."""
+        x, y, w, h = box
+        for i in self.query((x, y + h, w, max_distance), kind):
+            bx, by, bw, bh = self.items[i][0]
+            if by >= y + h - 2:
+                yield by - (y + h), i
+
+    def nearest_right(self, box, kind: str = "input", max_distance: int = 600):
+        found = min(self._right_of(_box(box), kind, max_distance), default=None)
+        return self.items[found[1]] if found else None
+
+    def nearest_below(self, box, kind: str = "input", max_distance: int = 120):
+        found = min(self._below(_box(box), kind, max_distance), default=None)
+        return self.items[found[1]] if found else None
+
+    def resolve_fields(self, labels: dict, kind: str = "input", max_right: int = 600, max_below: int = 120):
+        """
+        Batched label-to-field association: labels maps a name to its label box.
+        Every (label, candidate) pair to the right or below is ranked by gap and
+        assigned greedily, so two labels never claim the same field.
+        Returns name -> field box, or None where nothing fits.
+        """
+        pairs = []
+        for name, box in labels.items():
+            box = _box(box)
+            pairs.extend((gap, name, i) for gap, i in self._right_of(box, kind, max_right))
+            pairs.extend((gap, name, i) for gap, i in self._below(box, kind, max_below))
+
+        resolved = dict.fromkeys(labels)
+        taken = set()
+        for gap, name, i in sorted(pairs, key=lambda p: p[0]):
+            if resolved[name] is None and i not in taken:
+                resolved[name] = self.items[i][0]
+                taken.add(i)
+        return resolved
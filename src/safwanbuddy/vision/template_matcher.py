@@ -0,0 +1,160 @@
+import os
+import cv2
+import numpy as np
+from src.safwanbuddy.utils.lru_cache import LRUCache
+from src.safwanbuddy.vision.preprocessing import to_gray
+from src.safwanbuddy.vision.tile_cache import TileHasher
+
+TEMPLATE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class TemplateLibrary:
+    """
+    Named icon templates (<template_dir>/<name>.png), loaded once on first use.
+    Each template is kept as a pyramid over display scale factors, and every
+    level also has a coarse copy for the first search pass.
+    """
+
+    def __init__(self, template_dir: str = "assets/templates", scales=(0.75, 1.0, 1.25, 1.5, 2.0), coarse: float = 0.5):
+        self.template_dir = template_dir
+        self.scales = scales
+        self.coarse = coarse
+        self.templates = {}  # name -> [(scale, full, coarse or None)]
+        self._loaded = False
+
+    def load(self):
+        self._loaded = True
+        if not os.path.isdir(self.template_dir):
+            return
+        for filename in sorted(os.listdir(self.template_dir)):
+            name, ext = os.path.splitext(filename)
+            if ext.lower() not in TEMPLATE_EXTENSIONS or name in self.templates:
+                continue
+            image = cv2.imread(os.path.join(self.template_dir, filename), cv2.IMREAD_GRAYSCALE)
+            if image is not None:
+                self.add(name, image)
+
+    def add(self, name: str, image: np.ndarray):
+        """Registers a template from an image (BGR, BGRA or grayscale)."""
+        gray = to_gray(image)
+        levels = []
+        for scale in self.scales:
+            full = gray if scale == 1.0 else cv2.resize(gray, None, fx=scale, fy=scale,
+                                                        interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC)
+            coarse = cv2.resize(full, None, fx=self.coarse, fy=self.coarse, interpolation=cv2.INTER_AREA)
+            # Too few pixels to correlate reliably at the coarse level; searched at full resolution instead
+            levels.append((scale, full, coarse if min(coarse.shape) >= 8 else None))
+        self.templates[name] = levels
+
+    def get(self, name: str):
+        if not self._loaded:
+            self.load()
+        return self.templates.get(name)
+
+    def names(self):
+        if not self._loaded:
+            self.load()
+        return sorted(self.templates)
+
+
+def _peaks(scores: np.ndarray, threshold: float, size, limit: int):
+    """Up to limit (x, y, score) maxima of a matchTemplate result, suppressing a template-sized area around each."""
+    scores = scores.copy()
+    h, w = size
+    peaks = []
+    while len(peaks) < limit:
+        _, value, _, (x, y) = cv2.minMaxLoc(scores)
+        if value < threshold:
+            break
+        peaks.append((x, y, value))
+        scores[max(0, y - h // 2):y + h // 2 + 1, max(0, x - w // 2):x + w // 2 + 1] = -1
+    return peaks
+
+
+def _overlap(a, b) -> float:
+    ix = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+    iy = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    if ix <= 0 or iy <= 0:
+        return 0.0
+    return ix * iy / min(a[2] * a[3], b[2] * b[3])
+
+
+class TemplateMatcher:
+    """
+    Finds library templates on a frame. Each pyramid level is first correlated
+    against a downscaled frame, then only small windows around the coarse peaks
+    are matched at full resolution. Results are cached by the hash of the
+    searched pixels, so an unchanged screen costs one tile hash.
+    """
+
+    def __init__(self, library: TemplateLibrary = None, threshold: float = 0.85, coarse_margin: float = 0.15,
+                 max_candidates: int = 5, cache_size: int = 256):
+        self.library = library or TemplateLibrary()
+        self.threshold = threshold
+        self.coarse_threshold = threshold - coarse_margin
+        self.max_candidates = max_candidates
+        self.hasher = TileHasher(64)
+        self.cache = LRUCache(maxsize=cache_size)
+
+    def match(self, image: np.ndarray, name: str, region=None):
+        """
+        Returns (x, y, w, h, score) for each occurrence of template name, best
+        first, in frame coordinates. region (x, y, w, h) limits the search.
+        """
+        levels = self.library.get(name)
+        if not levels:
+            return []
+        gray = to_gray(image)
+        ox, oy = 0, 0
+        if region:
+            region = tuple(int(v) for v in region)  # Lists (e.g. from workflow YAML) are not hashable
+            ox, oy, rw, rh = region
+            gray = gray[oy:oy + rh, ox:ox + rw]
+
+        key = (name, region or None, self.hasher.hash_region(gray))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        c = self.library.coarse
+        coarse_frame = cv2.resize(gray, None, fx=c, fy=c, interpolation=cv2.INTER_AREA)
+        found = []
+        for scale, full, coarse in levels:
+            th, tw = full.shape
+            if th > gray.shape[0] or tw > gray.shape[1]:
+                continue
+            if coarse is None or coarse.shape[0] > coarse_frame.shape[0] or coarse.shape[1] > coarse_frame.shape[1]:
+                scores = cv2.matchTemplate(gray, full, cv2.TM_CCOEFF_NORMED)
+                found.extend((x, y, tw, th, s) for x, y, s in _peaks(scores, self.threshold, full.shape, self.max_candidates))
+                continue
+
+            scores = cv2.matchTemplate(coarse_frame, coarse, cv2.TM_CCOEFF_NORMED)
+            pad = int(np.ceil(1 / c)) + 2
+            for cx, cy, _ in _peaks(scores, self.coarse_threshold, coarse.shape, self.max_candidates):
+                # Refine around the coarse peak at full resolution
+                x0, y0 = max(0, int(cx / c) - pad), max(0, int(cy / c) - pad)
+                window = gray[y0:y0 + th + 2 * pad, x0:x0 + tw + 2 * pad]
+                if window.shape[0] < th or window.shape[1] < tw:
+                    continue
+                _, score, _, (fx, fy) = cv2.minMaxLoc(cv2.matchTemplate(window, full, cv2.TM_CCOEFF_NORMED))
+                if score >= self.threshold:
+                    found.append((x0 + fx, y0 + fy, tw, th, score))
+
+        # The same icon matches at neighbouring scales; keep the best box per location
+        results = []
+        for x, y, w, h, score in sorted(found, key=lambda m: -m[4]):
+            box = (x + ox, y + oy, w, h)
+            if all(_overlap(box, kept) <= 0.5 for kept in results):
+                results.append((*box, float(score)))
+        self.cache.put(key, results)
+        return results
+
+    def find(self, image: np.ndarray, name: str, region=None):
+        """Best match or None."""
+        matches = self.match(image, name, region)
+        return matches[0] if matches else None
+
+    def stats(self):
+        return self.cache.stats()
+
+template_matcher = TemplateMatcher()
@@ -0,0 +1,159 @@
+import hashlib
+import cv2
+import numpy as np
+from src.safwanbuddy.utils.lru_cache import LRUCache
+from src.safwanbuddy.vision.ocr_frame import OCRFrame
+from src.safwanbuddy.vision.preprocessing import to_gray
+
+
+class TileHasher:
+    """
+    Hashes fixed-size tiles of a grayscale frame in one vectorized step: each
+    tile's hash is a dot product of its pixels with a fixed random uint64
+    weight matrix (wrapping mod 2**64), so any pixel change alters the hash.
+    """
+
+    def __init__(self, tile_size: int = 128, seed: int = 0x5AFE):
+        self.tile_size = tile_size
+        rng = np.random.default_rng(seed)
+        self._weights = rng.integers(1, 2 ** 63, size=(tile_size, tile_size), dtype=np.uint64)
+
+    def grid_shape(self, shape):
+        t = self.tile_size
+        return -(-shape[0] // t), -(-shape[1] // t)
+
+    def hash_tiles(self, image: np.ndarray) -> np.ndarray:
+        """Returns a (rows, cols) uint64 array of tile hashes."""
+        gray = to_gray(image)
+        t = self.tile_size
+        rows, cols = self.grid_shape(gray.shape)
+        if gray.shape != (rows * t, cols * t):
+            padded = np.zeros((rows * t, cols * t), dtype=np.uint8)
+            padded[:gray.shape[0], :gray.shape[1]] = gray
+            gray = padded
+        tiles = gray.reshape(rows, t, cols, t)
+        return np.einsum("rhcw,hw->rc", tiles, self._weights, dtype=np.uint64)
+
+    def hash_region(self, image: np.ndarray) -> int:
+        """
+        Single hash for an arbitrary region (e.g. a cached template or text box).
+        Digests the whole tile grid and the region size, so swapping or moving
+        tiles changes the hash; every tile shares one weight matrix, so
+        combining the tile hashes without their positions would not.
+        """
+        hashes = self.hash_tiles(image)
+        digest = hashlib.blake2b(hashes.tobytes(), digest_size=8, person=b"tile-region")
+        digest.update(np.asarray(image.shape[:2], dtype=np.int64).tobytes())
+        return int.from_bytes(digest.digest(), "little")
+
+    @staticmethod
+    def dirty_rects(previous: np.ndarray, current: np.ndarray, tile_size: int):
+        """Merges changed tiles into (x, y, w, h) rectangles, one per connected group."""
+        if previous is None or previous.shape != current.shape:
+            rows, cols = current.shape
+            return [(0, 0, cols * tile_size, rows * tile_size)]
+        changed = (previous != current).astype(np.uint8)
+        if not changed.any():
+            return []
+        count, _, stats, _ = cv2.connectedComponentsWithStats(changed, connectivity=8)
+        return [(int(x) * tile_size, int(y) * tile_size, int(w) * tile_size, int(h) * tile_size)
+                for x, y, w, h, _ in stats[1:count]]
+
+
+def regroup_lines(words):
+    """Re-assigns line keys by geometry so phrases that straddle tiles still match."""
+    rows = []  # [center, height, words]
+    for word in sorted(words, key=lambda w: w["box"][1] + w["box"][3] / 2):
+        x, y, w, h = word["box"]
+        center = y + h / 2
+        if rows and abs(center - rows[-1][0]) < max(h, rows[-1][1]) / 2:
+            rows[-1][2].append(word)
+        else:
+            rows.append([center, h, [word]])
+
+    regrouped = []
+    line = 0
+    for _, _, row in rows:
+        row.sort(key=lambda w: w["box"][0])
+        for i, word in enumerate(row):
+            if i:
+                prev = row[i - 1]["box"]
+                if word["box"][0] - (prev[0] + prev[2]) > 2 * max(word["box"][3], prev[3]):
+                    line += 1
+            regrouped.append(dict(word, line=(0, 0, 0, line)))
+        line += 1
+    return regrouped
+
+
+class TileOCRCache:
+    """
+    Recognizes a frame by tiles, caching each tile's words by the hash of the
+    tile and its neighbours (the OCR crop includes a margin around the tile).
+    Only connected groups of dirty tiles are sent to OCR; an unchanged frame
+    returns the previous OCRFrame without any recognition.
+    """
+
+    def __init__(self, recognize_fn, tile_size: int = 128, margin: int = 24, maxsize: int = 2048):
+        self.recognize_fn = recognize_fn
+        self.hasher = TileHasher(tile_size)
+        self.margin = margin
+        self.cache = LRUCache(maxsize=maxsize)
+        self._last_hashes = None
+        self._last_frame = None
+        self.last_dirty = 0
+
+    def _tile_keys(self, hashes: np.ndarray):
+        padded = np.pad(hashes, 1)
+        rows, cols = hashes.shape
+        neighbourhood = np.stack([padded[dy:dy + rows, dx:dx + cols] for dy in range(3) for dx in range(3)], axis=-1)
+        return {(r, c): neighbourhood[r, c].tobytes() for r in range(rows) for c in range(cols)}
+
+    def recognize(self, image: np.ndarray) -> OCRFrame:
+        hashes = self.hasher.hash_tiles(image)
+        if self._last_hashes is not None and np.array_equal(hashes, self._last_hashes):
+            self.last_dirty = 0
+            return self._last_frame
+
+        t, m = self.hasher.tile_size, self.margin
+        height, width = image.shape[:2]
+        keys = self._tile_keys(hashes)
+        tile_words = {}
+        dirty = np.zeros(hashes.shape, dtype=np.uint8)
+        for tile, key in keys.items():
+            cached = self.cache.get(key)
+            if cached is None:
+                dirty[tile] = 1
+            else:
+                tile_words[tile] = cached
+        self.last_dirty = int(dirty.sum())
+
+        if self.last_dirty:
+            count, _, stats, _ = cv2.connectedComponentsWithStats(dirty, connectivity=8)
+            for c0, r0, cw, rh in stats[1:count, :4].tolist():
+                # One OCR call per group, with a margin so words cut by the tile grid stay whole
+                x0, y0 = max(0, c0 * t - m), max(0, r0 * t - m)
+                x1, y1 = min(width, (c0 + cw) * t + m), min(height, (r0 + rh) * t + m)
+                frame = self.recognize_fn(image[y0:y1, x0:x1])
+                found = {(r, c): [] for r in range(r0, r0 + rh) for c in range(c0, c0 + cw) if dirty[r, c]}
+                for word in frame.words:
+                    x, y, w, h = word["box"]
+                    tile = (int((y0 + y + h / 2) // t), int((x0 + x + w / 2) // t))
+                    if tile in found:
+                        # Stored relative to the tile so the entry is position independent
+                        rel = (x0 + x - tile[1] * t, y0 + y - tile[0] * t, w, h)
+                        found[tile].append({"text": word["text"], "box": rel, "conf": word["conf"], "line": word["line"]})
+                for tile, words in found.items():
+                    self.cache.put(keys[tile], words)
+                    tile_words[tile] = words
+
+        words = []
+        for (r, c), entries in tile_words.items():
+            for word in entries:
+                x, y, w, h = word["box"]
+                words.append(dict(word, box=(x + c * t, y + r * t, w, h)))
+        self._last_hashes = hashes
+        self._last_frame = OCRFrame.from_words(regroup_lines(words))
+        return self._last_frame
+
+    def stats(self):
+        return {"last_dirty_tiles": self.last_dirty, **self.cache.stats()}
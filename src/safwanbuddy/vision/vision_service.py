@@ -0,0 +1,140 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+from src.safwanbuddy.vision.element_detector import ElementDetector
+from src.safwanbuddy.vision.frame_ring import FrameRef, FrameRing, attach_frame
+from src.safwanbuddy.vision.ocr_backends import create_backend
+from src.safwanbuddy.vision.ocr_frame import OCRFrame
+from src.safwanbuddy.vision.preprocessing import PreprocessPipeline
+
+# Per-process state, set up once by _init_worker
+_backend = None
+_preprocess = None
+_detector = None
+
+
+def _init_worker(backend: str, tesseract_cmd: str, preprocess):
+    global _backend, _preprocess, _detector
+    # Parallelism comes from the pool; keep Tesseract and OpenCV single-threaded per worker
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    cv2.setNumThreads(1)
+    _backend = create_backend(backend, tesseract_cmd, pool_size=1)
+    _preprocess = preprocess
+    _detector = ElementDetector()
+
+
+def _crop(frame, rect):
+    if rect is None:
+        return frame, 0, 0
+    x0, y0, x1, y1 = rect
+    return frame[y0:y1, x0:x1], x0, y0
+
+
+def _ocr_task(ref: FrameRef, rect, lang: str, psm: int, whitelist: str):
+    """Runs in a worker: OCRs a (x0, y0, x1, y1) rect of a ring frame, returns words in frame coordinates."""
+    with attach_frame(ref) as frame:
+        image, x0, y0 = _crop(frame, rect)
+        processed = _preprocess(image)
+        data = _backend.image_to_data(processed, lang=lang, psm=psm, whitelist=whitelist)
+        return OCRFrame(data, scale=processed.shape[1] / image.shape[1], offset=(x0, y0)).words
+
+
+def _detect_task(ref: FrameRef, rect):
+    """Runs in a worker: ElementDetector.detect on a rect of a ring frame, in frame coordinates."""
+    with attach_frame(ref) as frame:
+        image, x0, y0 = _crop(frame, rect)
+        elements = _detector.detect(image)
+    elements["x"] += x0
+    elements["y"] += y0
+    return elements
+
+
+class VisionService:
+    """
+    Process pool for OCR and element detection. Frames go into a shared
+    memory FrameRing once (captures are converted straight into a slot) and
+    tasks carry only a FrameRef, so no pixels are pickled. Every submitted
+    task holds a lease on its frame until it completes.
+    """
+
+    def __init__(self, workers: int = None, slots: int = 4, backend: str = "auto",
+                 tesseract_cmd: str = None, preprocess=None):
+        self.workers = workers or os.cpu_count() or 2
+        self.slots = slots
+        self.backend = backend
+        self.tesseract_cmd = tesseract_cmd
+        self.preprocess = preprocess or PreprocessPipeline()
+        self.ring = None
+        self._rings = {}
+        self._lock = threading.RLock()
+        self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                             initargs=(self.backend, self.tesseract_cmd, self.preprocess))
+        return self._pool
+
+    def _ring_for(self, nbytes: int) -> FrameRing:
+        """The current ring, replaced by a larger one when a frame no longer fits its slots."""
+        with self._lock:
+            if self.ring is None or self.ring.slot_bytes < nbytes:
+                old = self.ring
+                self.ring = FrameRing(self.slots, nbytes)
+                self._rings[self.ring.name] = self.ring
+                if old is not None:
+                    self._retire(old)
+            return self.ring
+
+    def _retire(self, ring: FrameRing):
+        # A replaced ring is closed once its last lease is released
+        if ring is not self.ring and not ring.leased():
+            ring.close()
+            self._rings.pop(ring.name, None)
+
+    def put(self, image) -> FrameRef:
+        """Copies a frame into the ring. The caller holds one lease; release it when done."""
+        return self._ring_for(image.nbytes).write(image)
+
+    def capture(self, capture, monitor_id: int = 1, region=None) -> FrameRef:
+        """Captures straight into a ring slot (BGR), with no intermediate frame. Release when done."""
+        bgra = capture.grab_bgra(monitor_id, region)
+        shape = bgra.shape[:2] + (3,)
+        with self._ring_for(bgra.shape[0] * bgra.shape[1] * 3).writing(shape) as (ref, view):
+            cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=view)
+        return ref
+
+    def view(self, ref: FrameRef):
+        """Read-only view of a ring frame in this process."""
+        return self._rings[ref.ring].view(ref)
+
+    def release(self, ref: FrameRef):
+        with self._lock:
+            ring = self._rings.get(ref.ring)
+            if ring is not None:
+                ring.release(ref)
+                self._retire(ring)
+
+    def submit(self, task, ref: FrameRef, *args):
+        self._rings[ref.ring].acquire(ref)
+        future = self._executor().submit(task, ref, *args)
+        future.add_done_callback(lambda _: self.release(ref))
+        return future
+
+    def ocr(self, ref: FrameRef, rect=None, lang: str = "eng", psm: int = None, whitelist: str = None):
+        """Future of the OCR words of a frame (or of an (x0, y0, x1, y1) rect of it)."""
+        return self.submit(_ocr_task, ref, rect, lang, psm, whitelist)
+
+    def detect(self, ref: FrameRef, rect=None):
+        """Future of ElementDetector.detect for a frame (or a rect of it)."""
+        return self.submit(_detect_task, ref, rect)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        for ring in list(self._rings.values()):
+            ring.close()
+        self._rings.clear()
+        self.ring = None
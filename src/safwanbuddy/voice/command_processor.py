@@ -1,6 +1,14 @@
-import re
-from src.safwanbuddy.core import event_bus, logger
-from src.safwanbuddy.voice import tts_manager, language_manager
+from src.safwanbuddy.core import event_bus, logger, intent_registry, config_manager
+from src.safwanbuddy.voice import tts_manager
+# voice/__init__ imports this module before language_manager, so the package
+# attribute would still be the submodule here; import the instance directly
+from src.safwanbuddy.voice.language_manager import language_manager
+from src.safwanbuddy.utils.fuzzy_index import NGramIndex
+from src.safwanbuddy.utils.intent_matcher import IntentMatch
+from src.safwanbuddy.utils.lru_cache import LRUCache
+
+_MISS = object()
+OWNER = "command_processor"
 
 class CommandProcessor:
     def __init__(self):
@@ -8,22 +16,37 @@ class CommandProcessor:
         self.wake_word = "hey safwan"
         self.is_active = False
         
-        # Define intent patterns
-        self.intents = [
-            (r"(?:open|launch) (?:the )?browser", "open_browser"),
-            (r"(?:fill|complete) (?:the )?form", "fill_form"),
-            (r"search (?:for )?(.+)", "search"),
-            (r"type (?:my )?email", "type_email"),
-            (r"call (.+)", "call"),
-            (r"(?:send|message) (?:to )?(.+?) (?:saying|with) (.+)", "message"),
-            (r"record (?:a )?workflow", "record_workflow"),
-            (r"stop recording", "stop_recording"),
-            (r"run workflow (.+)", "run_workflow"),
-            (r"compare price (?:of )?(.+)", "compare_price"),
-            (r"generate (?:a )?report", "generate_report"),
-            (r"set language to (.+)", "set_language"),
-            (r"expertly (.*)", "expert_mode"),
-        ]
+        # Intent patterns live in config/voice_commands.yaml; this maps them to actions
+        self.handlers = {
+            "open_browser": lambda args: event_bus.emit("automation_request", {"action": "open_browser"}),
+            "fill_form": lambda args: event_bus.emit("automation_request", {"action": "fill_form"}),
+            "search": lambda args: event_bus.emit("automation_request", {"action": "search", "query": args[0] if args else ""}),
+            "type_email": lambda args: event_bus.emit("automation_request", {"action": "type_profile", "field": "email"}),
+            "call": lambda args: event_bus.emit("social_request", {"action": "call", "name": args[0]}),
+            "message": lambda args: event_bus.emit("social_request", {"action": "message", "name": args[0], "message": args[1]}),
+            "record_workflow": lambda args: event_bus.emit("automation_request", {"action": "record_workflow"}),
+            "stop_recording": lambda args: event_bus.emit("automation_request", {"action": "stop_recording"}),
+            "run_workflow": lambda args: event_bus.emit("automation_request", {"action": "run_workflow", "name": args[0]}),
+            "compare_price": lambda args: event_bus.emit("web_request", {"action": "compare_price", "product": args[0]}),
+            "generate_report": lambda args: event_bus.emit("document_request", {"action": "generate_report"}),
+            "set_language": self._set_language,
+            "expert_mode": lambda args: event_bus.emit("expert_task_request", args[0] if args else "general task"),
+            "shutdown": self._shutdown,
+            "status_check": self._status_check,
+        }
+        for intent, handler in self.handlers.items():
+            intent_registry.register(intent, handler, owner=OWNER)
+
+        # Near-miss fallback for ASR errors, rebuilt when intents or language change
+        self.fuzzy_threshold = float(config_manager.get("voice.fuzzy_threshold", 0.6))
+        self.fuzzy_budget = float(config_manager.get("voice.fuzzy_budget_ms", 1.0)) / 1000.0
+        self._fuzzy_index = None
+        self._fuzzy_key = None
+
+        # Memoized (language, text) -> IntentMatch or None
+        self.resolve_cache = LRUCache(maxsize=int(config_manager.get("voice.resolve_cache_size", 256)))
+        event_bus.subscribe("intents_changed", self.resolve_cache.clear)
+        event_bus.subscribe("language_changed", self.resolve_cache.clear)
 
     def process_command(self, text: str):
         text = text.lower().strip()
@@ -45,6 +68,8 @@ class CommandProcessor:
                 remaining = normalized.split(self.wake_word)[-1].strip()
                 if remaining:
                     self.execute_action(remaining)
+            else:
+                self._dispatch_plugin(normalized)
             return
 
         if any(word in normalized for word in ["stop listening", "goodbye", "exit", "quit", "khuda hafiz"]):
@@ -58,65 +83,90 @@ class CommandProcessor:
     def execute_action(self, command: str):
         event_bus.emit("system_state", "processing")
         
-        found_intent = False
-        for pattern, action in self.intents:
-            match = re.search(pattern, command)
-            if match:
-                found_intent = True
-                groups = match.groups()
-                self._dispatch(action, groups)
-                break
-        
-        if not found_intent:
+        match = self.resolve(command)
+        if not match or not intent_registry.has_handler(match.intent):
             logger.warning(f"Unknown command: {command}")
             event_bus.emit("unknown_command", command)
             event_bus.emit("system_state", "error")
             tts_manager.speak("I'm sorry, I didn't understand that command.")
         else:
+            self._dispatch(match.intent, match.captures)
             if self.is_active:
                 event_bus.emit("system_state", "listening")
 
+    def resolve(self, command: str):
+        """Resolves a command to an IntentMatch (or None), memoized per language."""
+        intent_registry.check_reload()
+        text = " ".join(command.split())
+        # The registry version guards against entries stored while a reload was in flight
+        key = (language_manager.current_language, intent_registry.version, text)
+        match = self.resolve_cache.get(key, _MISS)
+        if match is _MISS:
+            match, complete = intent_registry.resolve(text), True
+            if match is None:
+                match, complete = self._fuzzy_resolve(text)
+            # A miss from a search the time budget cut short may hit next time
+            if match is not None or complete:
+                self.resolve_cache.put(key, match)
+        return match
+
+    def get_cache_stats(self):
+        return {
+            "resolve": self.resolve_cache.stats(),
+            "normalize": language_manager.normalize_cache.stats()
+        }
+
+    def _fuzzy_resolve(self, command: str):
+        """(match or None, whether the search scored the whole command within its budget)."""
+        key = (intent_registry.version, language_manager.current_language)
+        if self._fuzzy_key != key:
+            self._fuzzy_index = NGramIndex()
+            for phrase, intent in intent_registry.fuzzy_phrases() + language_manager.variant_phrases():
+                self._fuzzy_index.add(phrase, intent)
+            self._fuzzy_key = key
+
+        candidates = self._fuzzy_index.search(command, k=3, min_score=self.fuzzy_threshold, budget=self.fuzzy_budget)
+        for candidate in candidates:
+            # Re-resolve the corrected text so regex intents still get their captures
+            match = intent_registry.resolve(candidate.corrected)
+            if not match or match.intent != candidate.intent:
+                dialect_intent, _ = language_manager.process_speech(candidate.corrected)
+                match = IntentMatch(dialect_intent, (), 0, len(candidate.corrected)) if dialect_intent == candidate.intent else None
+            if match:
+                logger.info(f"Fuzzy matched '{command}' as '{candidate.corrected}' (score {candidate.score:.2f})")
+                return match, True
+        return None, not candidates.truncated
+
+    def _dispatch_plugin(self, command: str):
+        """
+        Plugins used to subscribe to voice_command themselves and heard every
+        command, wake word or not; their intents keep that. Only exact matches
+        count here, so idle speech is never fuzzy-matched into an action.
+        """
+        match = intent_registry.resolve(" ".join(command.split()))
+        if match and intent_registry.owner_of(match.intent) not in (None, OWNER):
+            self._dispatch(match.intent, match.captures)
+
     def _dispatch(self, action, args):
         logger.info(f"Dispatching action: {action} with args: {args}")
-        
-        if action == "open_browser":
-            event_bus.emit("automation_request", {"action": "open_browser"})
-        elif action == "fill_form":
-            event_bus.emit("automation_request", {"action": "fill_form"})
-        elif action == "search":
-            event_bus.emit("automation_request", {"action": "search", "query": args[0]})
-        elif action == "type_email":
-            event_bus.emit("automation_request", {"action": "type_profile", "field": "email"})
-        elif action == "call":
-            event_bus.emit("social_request", {"action": "call", "name": args[0]})
-        elif action == "message":
-            event_bus.emit("social_request", {"action": "message", "name": args[0], "message": args[1]})
-        elif action == "record_workflow":
-            event_bus.emit("automation_request", {"action": "record_workflow"})
-        elif action == "stop_recording":
-            event_bus.emit("automation_request", {"action": "stop_recording"})
-        elif action == "run_workflow":
-            event_bus.emit("automation_request", {"action": "run_workflow", "name": args[0]})
-        elif action == "compare_price":
-            event_bus.emit("web_request", {"action": "compare_price", "product": args[0]})
-        elif action == "generate_report":
-            event_bus.emit("document_request", {"action": "generate_report"})
-        elif action == "set_language":
-            lang = args[0]
-            if "hindi" in lang: code = "hi"
-            elif "english" in lang: code = "en"
-            elif "hyderabadi" in lang: code = "hyderabadi"
-            else: code = "en"
-            language_manager.set_language(code)
-            tts_manager.speak(f"Language set to {lang}")
-        elif action == "expert_mode":
-            event_bus.emit("expert_task_request", args[0] if args else "general task")
-        elif action == "shutdown":
-            self.is_active = False
-            event_bus.emit("system_state", "idle")
-            tts_manager.speak("Khuda Hafiz! System shutting down.")
-        elif action == "status_check":
-            event_bus.emit("system_control", {"action": "get_stats"})
-            tts_manager.speak("Checking system status for you.")
+        intent_registry.dispatch(action, args)
+
+    def _set_language(self, args):
+        lang = args[0]
+        if "hindi" in lang: code = "hi"
+        elif "english" in lang: code = "en"
+        elif "hyderabadi" in lang: code = "hyderabadi"
+        else: code = "en"
+        language_manager.set_language(code)
+        tts_manager.speak(f"Language set to {lang}")
+
+    def _shutdown(self, args):
+        self.is_active = False
+        event_bus.emit("system_state", "idle")
+        tts_manager.speak("Khuda Hafiz! System shutting down.")
+
+    def _status_check(self, args):
+        event_bus.emit("system_control", {"action": "get_stats"})
+        tts_manager.speak("Checking system status for you.")
 
 command_processor = CommandProcessor()
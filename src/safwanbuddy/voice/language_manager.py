@@ -1,4 +1,6 @@
+from src.safwanbuddy.core import event_bus
 from src.safwanbuddy.profiles.language_mapper import language_mapper
+from src.safwanbuddy.utils.lru_cache import LRUCache
 
 class LanguageManager:
     def __init__(self):
@@ -8,20 +10,34 @@ class LanguageManager:
             "hyderabadi": "Hyderabadi"
         }
         self.current_language = "en"
+        self.normalize_cache = LRUCache(maxsize=512)
+        event_bus.subscribe("intents_changed", self.normalize_cache.clear)
 
     def process_speech(self, text: str):
         """Processes recognized speech according to current language and dialect."""
-        if self.current_language in ["hyderabadi", "hi"]:
-            intent, normalized = language_mapper.normalize_input(text)
-            return intent, normalized
+        if language_mapper.active_pack:
+            key = (self.current_language, text)
+            result = self.normalize_cache.get(key)
+            if result is None:
+                result = language_mapper.normalize_input(text)
+                self.normalize_cache.put(key, result)
+            return result
         return "unknown", text
 
+    def variant_phrases(self):
+        """Dialect intent phrases for the current language, if it has any."""
+        return language_mapper.variant_phrases()
+
     def get_response_greeting(self):
         return language_mapper.get_greeting(self.current_language)
 
     def set_language(self, lang_code: str):
         if lang_code in self.supported_languages:
             self.current_language = lang_code
+            # Loads the language's dialect pack the first time it is selected
+            language_mapper.select(lang_code)
+            self.normalize_cache.clear()
+            event_bus.emit("language_changed", lang_code)
             return True
         return False
 
@@ -0,0 +1,127 @@
+import os
+
+import pytest
+import yaml
+
+from src.safwanbuddy.core import event_bus, intent_registry
+
+from src.safwanbuddy.voice import tts_manager
+from src.safwanbuddy.voice.command_processor import command_processor
+from src.safwanbuddy.voice.language_manager import language_manager
+
+CORPUS = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "data", "asr_near_misses.yaml")
+
+with open(CORPUS, "r", encoding="utf-8") as f:
+    NEAR_MISSES = yaml.safe_load(f)
+
+
+@pytest.fixture(autouse=True)
+def quiet(monkeypatch):
+    monkeypatch.setattr(tts_manager, "speak", lambda text: None)
+    yield
+    language_manager.set_language("en")
+
+
+def routed(intent):
+    """The intent a command should resolve to: intents nothing handles are not matched."""
+    return intent if intent is not None and intent_registry.has_handler(intent) else None
+
+
+def resolve_case(case):
+    language_manager.set_language(case.get("language", "en"))
+    match = command_processor.resolve(case["text"])
+    return match.intent if match else None
+
+
+@pytest.mark.parametrize("case", NEAR_MISSES, ids=lambda case: case["text"])
+def test_near_misses_never_resolve_to_the_wrong_intent(case):
+    assert resolve_case(case) in (routed(case["intent"]), None)
+
+
+def test_near_miss_recall_through_the_processor():
+    expected = [case for case in NEAR_MISSES if routed(case["intent"]) is not None]
+    found = [case for case in expected if resolve_case(case) == case["intent"]]
+    assert len(found) / len(expected) >= 0.95
+
+
+@pytest.fixture
+def emitted():
+    """(event, data) pairs emitted on the request and state channels during a test."""
+    events = []
+    listeners = {name: (lambda data, name=name: events.append((name, data)))
+                 for name in ("automation_request", "web_request", "unknown_command", "system_state")}
+    for name, listener in listeners.items():
+        event_bus.subscribe(name, listener)
+    yield events
+    for name, listener in listeners.items():
+        event_bus.unsubscribe(name, listener)
+
+
+def test_execute_action_dispatches_with_captures(emitted):
+    command_processor.execute_action("search for  cheap   flights")
+    assert ("automation_request", {"action": "search", "query": "cheap flights"}) in emitted
+
+
+def test_execute_action_routes_fuzzy_matches(emitted):
+    command_processor.execute_action("compare prize of laptop")
+    assert ("web_request", {"action": "compare_price", "product": "laptop"}) in emitted
+
+
+def test_execute_action_reports_unknown_commands(emitted):
+    command_processor.execute_action("bake me a cake")
+    assert ("unknown_command", "bake me a cake") in emitted
+    assert ("system_state", "error") in emitted
+
+
+def test_dialect_command_runs_end_to_end(emitted):
+    language_manager.set_language("hyderabadi")
+    command_processor.process_command("Browser kholo")
+    assert ("automation_request", {"action": "open_browser"}) in emitted
+
+
+def test_resolutions_are_memoized_and_dropped_on_intent_changes():
+    command_processor.resolve("open browser")
+    hits = command_processor.resolve_cache.hits
+    command_processor.resolve("open  browser")
+    assert command_processor.resolve_cache.hits == hits + 1
+
+    language_manager.set_language("hyderabadi")
+    language_manager.process_speech("browser kholo")
+    event_bus.emit("intents_changed")
+    stats = command_processor.get_cache_stats()
+    assert stats["resolve"]["size"] == 0 and stats["normalize"]["size"] == 0
+
+
+def test_misses_cut_short_by_the_fuzzy_budget_are_not_memoized(monkeypatch):
+    command_processor.resolve_cache.clear()
+    monkeypatch.setattr(command_processor, "fuzzy_budget", 0.0)
+    assert command_processor.resolve("bake me a cake please") is None
+    assert len(command_processor.resolve_cache) == 0
+
+    monkeypatch.setattr(command_processor, "fuzzy_budget", 1.0)
+    assert command_processor.resolve("bake me a cake please") is None
+    assert len(command_processor.resolve_cache) == 1
+
+
+def test_unhandled_phrase_does_not_hide_a_later_command(emitted):
+    command_processor.execute_action("take a screenshot then open browser")
+    assert ("automation_request", {"action": "open_browser"}) in emitted
+
+
+@pytest.fixture
+def plugin_calls():
+    calls = []
+    intent_registry.register("weather", lambda args: calls.append(args), patterns=["weather in (.+)"], owner="Weather")
+    yield calls
+    intent_registry.unregister_owner("Weather")
+
+
+def test_plugin_intents_run_without_the_wake_word(plugin_calls, emitted):
+    assert not command_processor.is_active
+    command_processor.process_command("Weather in Pune")
+    assert plugin_calls == [("pune",)]
+    command_processor.process_command("search for flights")  # Core intents still wait for the wake word
+    command_processor.process_command("wether in pune")  # And idle speech is never fuzzy-matched
+    assert plugin_calls == [("pune",)]
+    assert not [event for event in emitted if event[0] == "automation_request"]
+    assert not command_processor.is_active
@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+
+from src.safwanbuddy.automation.dag_scheduler import (
+    IO_LANE, UI_LANE, DagError, DagNode, DagScheduler, NodeTiming, critical_path, lane_for, toposort,
+)
+
+
+def node(node_id, needs=(), lane=IO_LANE, action=None, order=0):
+    return DagNode(node_id, tuple(needs), lane, action or (lambda: None), order)
+
+
+def sleeper(seconds, log=None, name=None):
+    def run():
+        if log is not None:
+            log.append(name)
+        time.sleep(seconds)
+    return run
+
+
+def test_toposort_respects_needs_and_file_order():
+    nodes = [node("c", ["a", "b"], order=2), node("b", order=1), node("a", order=0), node("d", ["a"], order=3)]
+    assert [n.id for n in toposort(nodes)] == ["a", "b", "c", "d"]
+
+
+@pytest.mark.parametrize("nodes, message", [
+    ([node("a"), node("a")], "Duplicate step id 'a'"),
+    ([node("a", ["ghost"])], "unknown step"),
+    ([node("a", ["b"]), node("b", ["a"]), node("c")], "cycle among steps a, b"),
+])
+def test_toposort_rejects_bad_graphs(nodes, message):
+    with pytest.raises(DagError, match=message):
+        toposort(nodes)
+
+
+def test_lane_for():
+    assert lane_for("notification") == IO_LANE
+    assert lane_for("web_request", "compare_price") == IO_LANE
+    assert lane_for("web_request", "search") == UI_LANE
+    assert lane_for("automation_request", "click_text") == UI_LANE
+    assert lane_for("notification", lane=UI_LANE) == UI_LANE
+    assert lane_for("automation_request", lane="gpu") == UI_LANE  # Unknown lanes fall back to the default
+
+
+def test_ui_steps_never_overlap_and_keep_file_order():
+    log = []
+    nodes = [node(f"ui{i}", lane=UI_LANE, action=sleeper(0.02, log, f"ui{i}"), order=i) for i in range(4)]
+    report = DagScheduler(4).run(nodes)
+    assert log == ["ui0", "ui1", "ui2", "ui3"]
+    spans = sorted((t.start_ms, t.end_ms) for t in report.timings.values())
+    assert all(start >= end for (_, end), (start, _) in zip(spans, spans[1:]))
+
+
+def test_io_steps_run_concurrently():
+    barrier = threading.Barrier(3, timeout=2)
+    nodes = [node(f"io{i}", action=barrier.wait) for i in range(3)]
+    DagScheduler(3).run(nodes)  # Would time out if the three did not run at the same time
+
+
+def test_dependents_wait_for_their_needs():
+    finished = []
+    nodes = [node("fetch", action=sleeper(0.03, finished, "fetch")),
+             node("report", ["fetch"], action=lambda: finished.append("report"))]
+    report = DagScheduler(2).run(nodes)
+    assert finished == ["fetch", "report"]
+    assert report.timings["report"].start_ms >= report.timings["fetch"].end_ms
+
+
+def test_first_failure_is_raised_after_running_steps_finish():
+    ran = []
+    nodes = [node("slow", action=sleeper(0.05, ran, "slow")),
+             node("bad", action=lambda: 1 / 0),
+             node("after", ["bad"], action=lambda: ran.append("after")),
+             node("later", ["slow"], action=lambda: ran.append("later"))]
+    with pytest.raises(ZeroDivisionError):
+        DagScheduler(2).run(nodes)
+    assert ran == ["slow"]  # slow finished, nothing new started once bad failed
+
+
+def test_should_continue_stops_new_steps():
+    ran = []
+    nodes = [node("a", lane=UI_LANE, action=lambda: ran.append("a"), order=0),
+             node("b", ["a"], lane=UI_LANE, action=lambda: ran.append("b"), order=1)]
+    report = DagScheduler().run(nodes, should_continue=lambda: not ran)
+    assert ran == ["a"]
+    assert report.critical_path == []  # Incomplete runs report no critical path
+
+
+def test_report_covers_serial_and_critical_time():
+    nodes = [node("a", action=sleeper(0.03)), node("b", action=sleeper(0.03)), node("c", ["a"], action=sleeper(0.03))]
+    report = DagScheduler(2).run(nodes)
+    assert report.critical_path == ["a", "c"]
+    assert report.serial_ms >= 90 and report.critical_ms >= 60
+    assert report.total_ms < report.serial_ms
+
+
+def test_critical_path_follows_the_longest_chain():
+    nodes = [node("a"), node("b"), node("c", ["a", "b"]), node("d")]
+    timings = {"a": NodeTiming("a", IO_LANE, 0, 10), "b": NodeTiming("b", IO_LANE, 0, 30),
+               "c": NodeTiming("c", IO_LANE, 30, 35), "d": NodeTiming("d", IO_LANE, 0, 20)}
+    assert critical_path(nodes, timings) == (35, ["b", "c"])
+    assert critical_path([], {}) == (0.0, [])
@@ -0,0 +1,85 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.safwanbuddy.vision.element_detector import BUTTON, INPUT, LABEL, ElementDetector, text_scale
+
+
+@pytest.fixture(scope="module")
+def form():
+    """A label, an input field with typed text, and a button with a caption."""
+    image = np.full((200, 600, 3), 245, dtype=np.uint8)
+    cv2.putText(image, "Email", (20, 48), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (30, 30, 30), 2, cv2.LINE_AA)
+    cv2.rectangle(image, (150, 26), (500, 62), (255, 255, 255), -1)
+    cv2.rectangle(image, (150, 26), (500, 62), (150, 150, 150), 1)
+    cv2.putText(image, "me", (160, 52), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (30, 30, 30), 1, cv2.LINE_AA)
+    cv2.rectangle(image, (20, 120), (170, 164), (60, 120, 200), -1)
+    cv2.rectangle(image, (20, 120), (170, 164), (40, 80, 160), 2)
+    cv2.putText(image, "Submit", (45, 150), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2, cv2.LINE_AA)
+    return image
+
+
+def near(box, expected, tolerance=4):
+    return all(abs(a - b) <= tolerance for a, b in zip(box, expected))
+
+
+def test_detect_finds_each_kind_once(form):
+    elements = ElementDetector().detect(form)
+    kinds = sorted(str(k) for k in elements["kind"])
+    assert kinds == [BUTTON, INPUT, LABEL]  # Text inside the field and the button is not a label
+    assert (elements["score"] > 0).all()
+
+
+def test_wrappers_return_plain_int_boxes(form):
+    detector = ElementDetector()
+    (button,) = detector.find_buttons(form)
+    (field,) = detector.find_input_fields(form)
+    assert near(button, (20, 120, 151, 45)) and near(field, (150, 26, 351, 37))
+    assert all(type(v) is int for v in button + field)
+
+
+@pytest.mark.parametrize("kinds", [(BUTTON,), (INPUT,), (LABEL,), (BUTTON, INPUT), (INPUT, LABEL)])
+def test_requested_kinds_match_the_full_pass(form, kinds):
+    detector = ElementDetector()
+    full = detector.detect(form)
+    subset = detector.detect(form, kinds)
+    assert set(str(k) for k in subset["kind"]) <= set(kinds)
+    expected = full[np.isin(full["kind"], kinds)]
+    assert subset[["kind", "x", "y", "w", "h"]].tolist() == expected[["kind", "x", "y", "w", "h"]].tolist()
+    np.testing.assert_allclose(subset["score"], expected["score"], rtol=1e-5)
+
+
+def test_l_shaped_contour_is_not_a_button():
+    image = np.full((200, 400, 3), 245, dtype=np.uint8)
+    # Its bounding box (200x41) is button-shaped and the fitted polygon has four corners, but it fills ~10%
+    cv2.rectangle(image, (50, 50), (250, 56), (30, 30, 30), -1)
+    cv2.rectangle(image, (50, 50), (55, 90), (30, 30, 30), -1)
+    cv2.rectangle(image, (100, 120), (250, 160), (60, 120, 200), -1)
+    (button,) = ElementDetector().find_buttons(image)
+    assert near(button, (100, 120, 151, 41))
+
+
+def test_blank_frame_has_no_elements():
+    assert len(ElementDetector().detect(np.full((100, 100), 245, dtype=np.uint8))) == 0
+
+
+def test_text_scale_follows_glyph_height():
+    glyphs = np.array([[i * 20, 0, 10, 16] for i in range(30)], dtype=np.int32)
+    assert text_scale(glyphs) == 2.0
+    assert text_scale(glyphs[:5]) == 1.0  # Too little text to tell
+    assert text_scale(np.array([[0, 0, 4, 5]] * 30, dtype=np.int32)) == 1.0  # Small text keeps the 100% limits
+
+
+@pytest.mark.parametrize("dpi", [1.5, 2.0])
+def test_high_dpi_fields_and_labels_are_found(dpi):
+    """Two-word labels and fields at a scale where fixed pixel limits split or drop them."""
+    font_scale, thickness = 0.55 * dpi, max(1, int(round(dpi)))
+    image = np.full((int(420 * dpi), int(900 * dpi), 3), 245, dtype=np.uint8)
+    for row in range(6):
+        y = int((30 + row * 60) * dpi)
+        cv2.putText(image, "Postal code", (int(20 * dpi), y + int(22 * dpi)), cv2.FONT_HERSHEY_SIMPLEX,
+                    font_scale, (30, 30, 30), thickness, cv2.LINE_AA)
+        cv2.rectangle(image, (int(200 * dpi), y), (int(600 * dpi), y + int(32 * dpi)), (150, 150, 150), 1)
+    elements = ElementDetector().detect(image, (INPUT, LABEL))
+    assert (elements["kind"] == INPUT).sum() == 6
+    assert (elements["kind"] == LABEL).sum() == 6
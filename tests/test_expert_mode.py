@@ -0,0 +1,58 @@
+import pytest
+
+from src.safwanbuddy.automation import expert_mode
+from src.safwanbuddy.automation.expert_mode import TaskPlanner
+
+
+@pytest.fixture
+def settles(monkeypatch):
+    calls = []
+    monkeypatch.setattr(expert_mode.wait_conditions, "stable", lambda region=None, **kwargs: calls.append(region))
+    monkeypatch.setattr(expert_mode.event_bus, "emit", lambda *args, **kwargs: None)
+    return calls
+
+
+def run(step):
+    TaskPlanner()._run_step(0, step, 1, [])
+
+
+@pytest.mark.parametrize("step", [
+    {"type": "expert_event", "data": {"status": "started"}},
+    {"type": "notification", "data": {"message": "done"}},
+    {"type": "system_control", "data": {"action": "flush_dns"}},
+    {"type": "automation_request", "data": {"action": "list_windows"}},
+    {"type": "automation_request", "data": {"action": "click_text", "text": "OK"}, "settle": False},
+])
+def test_steps_without_input_do_not_settle(settles, step):
+    run(step)
+    assert settles == []
+
+
+@pytest.mark.parametrize("step", [
+    {"type": "automation_request", "data": {"action": "click_text", "text": "OK"}},
+    {"type": "web_request", "data": {"action": "search", "query": "news"}},
+    {"type": "voice_command", "data": "open notepad"},
+    {"type": "system_control", "data": {"action": "flush_dns"}, "settle": True},
+])
+def test_input_steps_settle_the_whole_screen(settles, step):
+    run(step)
+    assert settles == [None]
+
+
+def test_settle_is_scoped_to_the_step_region(settles):
+    run({"type": "automation_request", "data": {"action": "click_text", "text": "OK"}, "region": [10, 20, 300, 40]})
+    run({"type": "automation_request", "data": {"action": "type_profile", "region": [0, 0, 50, 50]}})
+    assert settles == [(10, 20, 300, 40), (0, 0, 50, 50)]
+
+
+def test_event_wait_catches_the_event_the_step_before_emits(monkeypatch):
+    planner = TaskPlanner()
+    monkeypatch.setattr(planner, "_log_history", lambda goal, steps, status: results.append(status))
+    results = []
+    planner.is_running = True
+    planner._execute_steps("save", [
+        {"type": "document_request", "data": {"action": "saved"}},
+        {"type": "wait", "data": {"until": "event", "event": "document_request", "match": {"action": "saved"},
+                                  "timeout": 0.05}},
+    ])
+    assert results == ["completed"]
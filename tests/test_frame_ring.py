@@ -0,0 +1,109 @@
+import os
+import subprocess
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from src.safwanbuddy.vision.frame_ring import FrameRing, StaleFrameError, attach_frame
+
+
+@pytest.fixture
+def ring():
+    ring = FrameRing(slots=2, slot_bytes=64 * 48 * 3)
+    yield ring
+    ring.close()
+
+
+def frame(value, shape=(48, 64, 3)):
+    return np.full(shape, value, dtype=np.uint8)
+
+
+def checksum(ref):
+    with attach_frame(ref) as view:
+        return int(view.sum()), view.shape, view.flags.writeable
+
+
+def test_write_and_view_round_trip(ring):
+    ref = ring.write(frame(7))
+    view = ring.view(ref)
+    assert view.shape == (48, 64, 3) and (view == 7).all()
+    assert not view.flags.writeable
+    assert ring.leased() == 1
+    ring.release(ref)
+    assert ring.leased() == 0
+
+
+def test_smaller_frames_share_the_slot_size(ring):
+    ref = ring.write(frame(3, (10, 20)))
+    assert ring.view(ref).shape == (10, 20)
+    with pytest.raises(ValueError):
+        ring.write(frame(0, (100, 100, 3)))
+
+
+def test_leased_slots_are_never_overwritten(ring):
+    first, second = ring.write(frame(1)), ring.write(frame(2))
+    with pytest.raises(TimeoutError):
+        ring.write(frame(3), timeout=0.05)
+    ring.release(second)
+    third = ring.write(frame(3))
+    assert third.slot == second.slot
+    assert (ring.view(first) == 1).all()
+
+
+def test_oldest_free_slot_is_reused_first(ring):
+    first = ring.write(frame(1))
+    second = ring.write(frame(2))
+    ring.release(second)
+    ring.release(first)
+    assert ring.write(frame(3)).slot == first.slot
+
+
+def test_stale_references_are_detected(ring):
+    old = ring.write(frame(1))
+    ring.release(old)
+    ring.release(ring.write(frame(2)))
+    ring.write(frame(3))  # Takes old's slot
+    with pytest.raises(StaleFrameError):
+        ring.view(old)
+    with pytest.raises(StaleFrameError):
+        ring.acquire(old)
+
+
+def test_writer_waits_for_a_release(ring):
+    refs = [ring.write(frame(i)) for i in range(2)]
+    threading.Timer(0.05, ring.release, args=(refs[0],)).start()
+    assert ring.write(frame(9), timeout=2.0).slot == refs[0].slot
+
+
+def test_failed_write_gives_the_slot_back(ring):
+    with pytest.raises(RuntimeError):
+        with ring.writing((48, 64, 3)) as (ref, view):
+            raise RuntimeError("capture failed")
+    assert ring.leased() == 0
+    with pytest.raises(StaleFrameError):
+        ring.view(ref)
+
+
+def test_other_processes_read_without_copying(ring):
+    ref = ring.write(frame(5))
+    ring.acquire(ref)
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(checksum, ref).result(timeout=30) == (5 * 48 * 64 * 3, (48, 64, 3), False)
+    ring.release(ref)
+    assert ring.leased() == 1
+
+
+def test_block_outlives_readers_with_their_own_resource_tracker(ring):
+    ref = ring.write(frame(7))
+    root = os.path.join(os.path.dirname(__file__), "..")
+    code = ("import sys; sys.path.insert(0, sys.argv[1])\n"
+            "from src.safwanbuddy.vision.frame_ring import FrameRef, attach_frame\n"
+            f"with attach_frame(FrameRef(*{tuple(ref)!r})) as view: print(int(view.sum()))")
+    reader = subprocess.run([sys.executable, "-c", code, root], capture_output=True, text=True, timeout=60)
+    assert reader.stdout.strip() == str(7 * 48 * 64 * 3) and "leaked" not in reader.stderr
+    assert int(ring.view(ref).sum()) == 7 * 48 * 64 * 3
+    shared_memory.SharedMemory(name=ref.ring).close()  # Still there after the reader exited
@@ -0,0 +1,51 @@
+from src.safwanbuddy.utils.fuzzy_index import NGramIndex, ngrams
+
+
+def build(*pairs):
+    index = NGramIndex()
+    for phrase, intent in pairs:
+        index.add(phrase, intent)
+    return index
+
+
+def test_ngrams_pad_word_boundaries():
+    assert ngrams("ab") == {" ab", "ab "}
+
+
+def test_near_miss_is_corrected_in_place():
+    index = build(("open browser", "open_browser"), ("fill form", "fill_form"))
+    best = index.search("please opened browser now", min_score=0.6)[0]
+    assert best.intent == "open_browser"
+    assert best.corrected == "please open browser now"
+    assert 0.6 <= best.score < 1.0
+
+
+def test_phrases_only_compete_with_windows_of_their_word_count():
+    index = build(("browser", "one_word"))
+    assert [m.corrected for m in index.search("open browser")] == ["open browser"]
+    assert index.search("openbrowser", min_score=0.9) == []
+
+
+def test_one_result_per_intent_best_first():
+    index = build(("fill form", "fill_form"), ("fill the form", "fill_form"), ("fill forms", "other"))
+    results = index.search("fill the forms", k=3)
+    assert len({m.intent for m in results}) == len(results)
+    assert [m.score for m in results] == sorted((m.score for m in results), reverse=True)
+
+
+def test_threshold_and_empty_phrases():
+    index = build(("", "nothing"), ("   ", "nothing"), ("stop recording", "stop_recording"))
+    assert len(index) == 1
+    assert index.search("generate report", min_score=0.6) == []
+
+
+def test_exhausted_budget_still_returns_what_was_scored():
+    index = build(("open browser", "open_browser"))
+    results = index.search("open browser", budget=0)
+    assert results[0].score == 1.0 and results.truncated
+
+
+def test_search_that_scores_every_window_is_not_truncated():
+    index = build(("open browser", "open_browser"))
+    assert not index.search("please open browser", budget=1.0).truncated
+    assert not index.search("browser", budget=0).truncated  # Nothing left to skip
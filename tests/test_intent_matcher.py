@@ -0,0 +1,119 @@
+import re
+
+import pytest
+
+from src.safwanbuddy.utils.intent_matcher import AhoCorasick, IntentMatcher, required_literals, trigger_phrases
+
+
+@pytest.mark.parametrize("pattern, literals", [
+    ("stop recording", ["stop recording"]),
+    ("(?:open|launch) (?:the )?browser", ["browser"]),
+    ("search (?:for )?(.+)", ["search "]),
+    ("(.+) please", [" please"]),
+    ("colou?r", ["colo"]),  # The optional character is not required
+    ("ab+c", ["ab"]),
+    ("x{2}yz", ["yz"]),
+    ("foo\\.bar", ["foo.bar"]),
+    ("[abc]def", ["def"]),
+    ("[\\]abcdef]x", ["x"]),  # Escaped "]" does not end the class
+    ("[^]abcdef]x", ["x"]),  # Nor does a leading "]"
+    ("open|close (.+)", ["open", "close "]),  # One literal per top-level branch
+])
+def test_required_literals(pattern, literals):
+    assert required_literals(pattern) == literals
+    for literal in literals:
+        assert literal in pattern.replace("\\", "")
+
+
+@pytest.mark.parametrize("pattern", [
+    "(.+)", "(?:a|b)", "\\w+", "open|(.+)", "(?i)open browser", "[a-z]+",
+])
+def test_required_literals_gives_up_when_nothing_is_required(pattern):
+    assert required_literals(pattern) is None
+
+
+@pytest.mark.parametrize("pattern, texts", [
+    ("(?:fill|complete) (?:the )?form", ["fill form", "complete the form"]),
+    ("run workflow (.+)", ["please run workflow daily"]),
+    ("go (?:to )?(?:home|work)|stop", ["go home", "go to work", "stop"]),
+    ("[\\]abcdef]x", ["ax", "]x"]),
+    ("[^]abcdef]x", ["zx"]),
+])
+def test_every_match_contains_a_required_literal(pattern, texts):
+    literals = required_literals(pattern)
+    for text in texts:
+        assert re.search(pattern, text)
+        assert any(literal in text for literal in literals)
+
+
+@pytest.mark.parametrize("pattern, text", [("[\\]abcdef]x", "ax"), ("[^]abcdef]x", "zx")])
+def test_bracket_literals_do_not_hide_class_matches(pattern, text):
+    matcher = IntentMatcher()
+    matcher.add_pattern("odd", pattern)
+    assert matcher.match(text) == ("odd", (), 0, 2)
+
+
+def test_aho_corasick_reports_every_occurrence():
+    automaton = AhoCorasick()
+    for payload, phrase in enumerate(["he", "she", "his", "hers"]):
+        automaton.add(phrase, payload)
+    found = sorted(automaton.iter_matches("ushers"))
+    assert found == [(1, 4, 1), (2, 4, 0), (2, 6, 3)]
+
+
+def test_aho_corasick_rebuilds_after_late_additions():
+    automaton = AhoCorasick()
+    automaton.add("open", 0)
+    assert list(automaton.iter_matches("reopen")) == [(2, 6, 0)]
+    automaton.add("pen", 1)
+    assert sorted(automaton.iter_matches("reopen")) == [(2, 6, 0), (3, 6, 1)]
+    assert automaton.max_length == 4
+
+
+class CountingRegex:
+    def __init__(self, regex, calls):
+        self.regex, self.calls = regex, calls
+
+    def search(self, text):
+        self.calls.append(self.regex.pattern)
+        return self.regex.search(text)
+
+
+def test_prefilter_only_runs_regexes_whose_literal_occurred():
+    matcher = IntentMatcher()
+    matcher.add_pattern("search", "search (?:for )?(.+)")
+    matcher.add_pattern("call", "call (.+)")
+    matcher.add_pattern("run_workflow", "run workflow (.+)")
+    matcher.compile()
+    calls = []
+    matcher._regexes = {order: CountingRegex(regex, calls) for order, regex in matcher._regexes.items()}
+    assert matcher.match("search for cats").captures == ("cats",)
+    assert calls == ["search (?:for )?(.+)"]
+    assert matcher.match("nothing to see") is None
+    assert calls == ["search (?:for )?(.+)"]
+
+
+def test_patterns_without_literals_use_the_fallback_alternation():
+    matcher = IntentMatcher()
+    matcher.add_pattern("anything", "(.+) now")
+    matcher.add_pattern("number", "\\d+")
+    assert matcher.match("call 911").intent == "number"
+    assert matcher.match("leave now").captures == ("leave",)
+
+
+def test_leftmost_match_wins_then_registration_order():
+    matcher = IntentMatcher()
+    matcher.add_pattern("search", "search (?:for )?(.+)")
+    matcher.add_pattern("expert_mode", "expertly (.*)")
+    matcher.add_phrase("browser", "open browser")
+    matcher.add_phrase("browser_alias", "open browser")
+    # A pattern sequence would pick search here; the earliest match in the text wins instead
+    assert matcher.match("expertly search for x") == ("expert_mode", ("search for x",), 0, 21)
+    assert matcher.match("open browser").intent == "browser"
+    assert matcher.match("Open Browser") is None  # Callers lowercase; phrases are stored lowercased
+
+
+def test_trigger_phrases_expand_lead_ins():
+    assert trigger_phrases("compare price (?:of )?(.+)") == ["compare price of", "compare price"]
+    assert trigger_phrases("(?:open|launch) (?:the )?browser") == [
+        "open the browser", "open browser", "launch the browser", "launch browser"]
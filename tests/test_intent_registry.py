@@ -0,0 +1,119 @@
+import os
+import types
+
+import pytest
+
+from src.safwanbuddy.core.intent_registry import IntentRegistry
+
+CONFIG = """
+intents:
+  open_browser:
+    patterns: ["(?:open|launch) (?:the )?browser"]
+  search:
+    patterns: ["search (?:for )?(.+)"]
+commands:
+  "take a screenshot": "screenshot"
+  "open browser": "open_browser"
+"""
+
+
+@pytest.fixture
+def config(tmp_path):
+    path = tmp_path / "voice_commands.yaml"
+    path.write_text(CONFIG)
+    return path
+
+
+@pytest.fixture
+def registry(config):
+    calls = []
+    registry = IntentRegistry(str(config), reload_interval=0)
+    for name in ("open_browser", "search"):
+        registry.register(name, lambda args, name=name: calls.append((name, args)), owner="test")
+    registry.calls = calls
+    return registry
+
+
+def rewrite(path, text):
+    """Writes text and moves the mtime forward, so coarse filesystem clocks still see a change."""
+    mtime = os.stat(path).st_mtime_ns
+    path.write_text(text)
+    os.utime(path, ns=(mtime + 1_000_000_000, mtime + 1_000_000_000))
+
+
+def test_resolved_intents_route_to_their_handler(registry):
+    match = registry.resolve("search for cheap flights")
+    assert registry.dispatch(match.intent, match.captures)
+    assert registry.calls == [("search", ("cheap flights",))]
+
+
+def test_intents_without_a_handler_do_not_shadow_routable_ones(registry):
+    assert registry.resolve("take a screenshot then open browser").intent == "open_browser"
+    assert registry.resolve("take a screenshot") is None
+    assert "screenshot" not in {intent for _, intent in registry.fuzzy_phrases()}
+    assert not registry.dispatch("screenshot")
+
+
+def test_registering_a_handler_makes_loaded_patterns_matchable(registry):
+    version = registry.version
+    registry.register("screenshot", lambda args: None, owner="capture_plugin")
+    assert registry.version == version + 1
+    assert registry.resolve("take a screenshot then open browser").intent == "screenshot"
+
+
+def test_second_owner_cannot_take_over_a_handler(registry):
+    assert not registry.register("search", lambda args: None, owner="other")
+    assert registry.list_intents()["search"]["handler"] == "test"
+
+
+def test_plugin_intents_register_and_unregister(registry):
+    plugin = types.SimpleNamespace(name="weather", calls=[])
+    plugin.forecast = lambda args: plugin.calls.append(args)
+    plugin.intents = {"forecast": {"handler": "forecast", "patterns": ["weather in (.+)"]}}
+    registry.register_plugin(plugin)
+    match = registry.resolve("weather in pune")
+    registry.dispatch(match.intent, match.captures)
+    assert plugin.calls == [("pune",)]
+
+    registry.unregister_owner("weather")
+    assert registry.resolve("weather in pune") is None
+
+
+def test_yaml_edits_are_hot_reloaded(registry, config):
+    changed = []
+    from src.safwanbuddy.core.events import event_bus
+    event_bus.subscribe("intents_changed", changed.append)
+    try:
+        rewrite(config, CONFIG.replace("(?:open|launch)", "(?:open|launch|start)"))
+        assert registry.resolve("start the browser").intent == "open_browser"
+        assert changed and changed[-1] == registry.version
+    finally:
+        event_bus.unsubscribe("intents_changed", changed.append)
+    assert registry.calls == []  # Handlers survive the reload
+
+
+def test_broken_yaml_keeps_the_previous_intents(registry, config):
+    rewrite(config, "intents: [unclosed")
+    assert registry.resolve("open browser").intent == "open_browser"
+
+
+@pytest.mark.parametrize("text", ["- just\n- a list\n", "intents: [open, search]\n", "commands: nope\n"])
+def test_badly_shaped_yaml_keeps_the_previous_intents(registry, config, text):
+    rewrite(config, text)
+    assert registry.resolve("search for flights").intent == "search"
+    assert registry.resolve("open browser").intent == "open_browser"
+
+
+def test_intents_without_a_body_are_skipped(registry, config):
+    rewrite(config, CONFIG.replace("  open_browser:\n    patterns", "  empty:\n  odd: 3\n  open_browser:\n    patterns"))
+    assert registry.resolve("search for flights").intent == "search"
+    assert registry.resolve("launch browser").intent == "open_browser"
+    assert "empty" not in registry.list_intents()
+
+
+def test_reload_is_throttled(config):
+    registry = IntentRegistry(str(config), reload_interval=3600)
+    registry.register("open_browser", lambda args: None)
+    registry.check_reload()
+    rewrite(config, CONFIG.replace("(?:open|launch)", "(?:start)"))
+    assert registry.resolve("open browser").intent == "open_browser"
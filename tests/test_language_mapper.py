@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from src.safwanbuddy.profiles.language_mapper import LanguageMapper
+
+PACKS = os.path.join(os.path.dirname(__file__), "..", "config", "dialects")
+
+
+@pytest.fixture
+def mapper():
+    return LanguageMapper(PACKS)
+
+
+@pytest.mark.parametrize("language", ["hi", "hyderabadi"])
+@pytest.mark.parametrize("text, intent", [
+    ("kya chalra", "status_check"),
+    ("bhai kaam kahan tak pahuncha", "status_check"),
+    ("paper banao", "generate_report"),
+    ("chalo khuda hafiz", "shutdown"),
+    ("browser khol", "open_browser"),
+])
+def test_baseline_phrases_resolve_in_hindi_and_hyderabadi(mapper, language, text, intent):
+    assert mapper.select(language)
+    assert mapper.normalize_input(text) == (intent, text)
+
+
+def test_child_pack_inherits_and_adds_mappings(mapper):
+    mapper.select("hyderabadi")
+    pack = mapper.active_pack
+    assert pack["greeting"].startswith("Salaam")
+    assert pack["substituter"].substitute("hau band kar") == "yes close"
+
+
+def test_packs_load_once_and_unknown_languages_have_none(mapper):
+    mapper.select("hi")
+    pack = mapper.active_pack
+    assert mapper.select("hi") and mapper.active_pack is pack
+    assert not mapper.select("en")
+    assert mapper.normalize_input("kya chalra") == ("unknown", "kya chalra")
+    assert mapper.variant_phrases() == []
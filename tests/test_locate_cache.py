@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from src.safwanbuddy.automation.locate_cache import LocateCache
+from src.safwanbuddy.utils.win_utils import WinUtils
+
+BOX = (40, 20, 30, 10)
+
+
+def screen(label=200, background=30):
+    """A gray screen with the remembered label drawn at BOX."""
+    image = np.full((100, 160), background, dtype=np.uint8)
+    x, y, w, h = BOX
+    image[y + 3:y + 7, x + 2:x + w - 2] = label
+    return image
+
+
+def grabber(image):
+    calls = []
+
+    def grab(box):
+        calls.append(box)
+        x, y, w, h = box
+        return image[y:y + h, x:x + w]
+    grab.calls = calls
+    return grab
+
+
+class FakeOCR:
+    def __init__(self, found):
+        self.found = found
+        self.calls = []
+
+    def __call__(self, image, box):
+        self.calls.append((image.shape, box))
+        return [(*box, 90.0)] if self.found else []
+
+
+@pytest.fixture
+def cache():
+    cache = LocateCache(max_diff=6.0)
+    cache.remember("save", BOX, screen())
+    return cache
+
+
+def test_unchanged_pixels_verify_without_ocr(cache):
+    grab, ocr = grabber(screen()), FakeOCR(found=False)
+    assert cache.verify("save", grab, ocr) == BOX
+    assert grab.calls == [BOX] and ocr.calls == []
+    assert cache.counters["pixel_verified"] == 1
+
+
+def test_changed_pixels_fall_back_to_ocr_of_the_box(cache):
+    hovered = screen(background=90)  # Hover highlight: same label, different pixels
+    ocr = FakeOCR(found=True)
+    assert cache.verify("save", grabber(hovered), ocr) == BOX
+    assert ocr.calls == [((10, 30), BOX)]
+    assert cache.counters["ocr_verified"] == 1
+
+    # The new pixels are stored, so the next lookup is a pixel hit again
+    ocr.found = False
+    assert cache.verify("save", grabber(hovered), ocr) == BOX
+    assert cache.counters["pixel_verified"] == 1 and len(ocr.calls) == 1
+
+
+def test_failed_ocr_forgets_the_entry(cache):
+    ocr = FakeOCR(found=False)
+    assert cache.verify("save", grabber(screen(label=30)), ocr) is None
+    assert cache.counters["verify_failed"] == 1
+    grab = grabber(screen())
+    assert cache.verify("save", grab, ocr) is None  # Gone, not re-checked
+    assert grab.calls == [] and len(ocr.calls) == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_unknown_key_is_a_miss(cache):
+    grab = grabber(screen())
+    assert cache.verify("open", grab, FakeOCR(found=True)) is None
+    assert grab.calls == []
+    stats = cache.stats()
+    assert stats["misses"] == 1 and stats["hits"] == 0
+
+
+def test_key_changes_with_the_window(monkeypatch):
+    window = {"title": "Editor", "rect": (0, 0, 800, 600)}
+    monkeypatch.setattr(WinUtils, "get_active_window_title", staticmethod(lambda: window["title"]))
+    monkeypatch.setattr(WinUtils, "get_active_window_rect", staticmethod(lambda: window["rect"]))
+    cache = LocateCache()
+    key = cache.key(" Save ")
+    assert key == ("save", "Editor", (0, 0, 800, 600))
+    cache.remember(key, BOX, screen())
+    window["rect"] = (100, 0, 800, 600)  # Window moved: the remembered box is not looked up
+    assert cache.key("Save") != key
+    assert cache.verify(cache.key("Save"), grabber(screen()), FakeOCR(found=True)) is None
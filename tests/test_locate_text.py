@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from src.safwanbuddy.vision.ocr_engine import PSM_SPARSE_TEXT, OCREngine, grow_region, hint_whitelist
+from src.safwanbuddy.vision.screen_capture import screen_capture
+from src.safwanbuddy.vision.ocr_frame import OCRFrame
+
+SAVE = (300, 200, 40, 12)  # Where "Save" is on the 640x480 screen
+
+
+def fake_recognize(calls, box=SAVE):
+    """Stands in for OCREngine.recognize: reads "Save" when the crop holds all of it."""
+    def recognize(crop, lang="eng", psm=None, whitelist=None, offset=(0, 0)):
+        calls.append({"offset": offset, "size": crop.shape[1::-1], "psm": psm, "whitelist": whitelist})
+        x, y, w, h = box
+        ox, oy = offset
+        inside = ox <= x and oy <= y and x + w <= ox + crop.shape[1] and y + h <= oy + crop.shape[0]
+        data = {"text": ["Save"] if inside else [], "left": [x - ox], "top": [y - oy], "width": [w],
+                "height": [h], "conf": [95], "block_num": [1], "par_num": [1], "line_num": [1]}
+        return OCRFrame(data, offset=offset)
+    return recognize
+
+
+@pytest.fixture
+def engine():
+    engine = OCREngine()
+    engine.calls = []
+    engine.recognize = fake_recognize(engine.calls)
+    return engine
+
+
+def test_hint_whitelist_has_both_cases_and_no_spaces():
+    assert hint_whitelist("Save As") == "AESVaesv"
+    assert hint_whitelist("Ok 2") == "2KOko"
+
+
+@pytest.mark.parametrize("region, expected", [
+    ((100, 100, 50, 20), (75, 90, 100, 40)),  # Grows about its center
+    ((0, 0, 50, 20), (0, 0, 100, 40)),  # Top-left corner: pushed back inside
+    ((600, 470, 40, 10), (560, 460, 80, 20)),  # Bottom-right corner
+    ((10, 10, 500, 400), (0, 0, 640, 480)),  # Never larger than the screen
+])
+def test_grow_region_is_clamped_to_the_screen(region, expected):
+    assert grow_region(region, 2.0, (640, 480)) == expected
+
+
+def test_grow_region_always_grows():
+    assert grow_region((10, 10, 1, 1), 1.0, (640, 480))[2:] == (2, 2)
+
+
+def test_hinted_region_holding_the_text_is_the_only_crop(engine):
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+    matches = engine.locate_text("save", region=(280, 190, 100, 40), image=image, whitelist=True)
+    assert matches == [(300, 200, 40, 12, 95.0)]
+    assert engine.calls == [{"offset": (280, 190), "size": (100, 40), "psm": PSM_SPARSE_TEXT,
+                             "whitelist": hint_whitelist("save")}]
+
+
+def test_missed_hint_grows_until_it_finds_the_text(engine):
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+    matches = engine.locate_text("Save", region=(20, 20, 60, 30), image=image)
+    assert matches == [(300, 200, 40, 12, 95.0)]
+    sizes = [call["size"] for call in engine.calls]
+    assert sizes[0] == (60, 30) and len(sizes) > 2
+    assert all(a[0] < b[0] for a, b in zip(sizes, sizes[1:]))
+
+
+def test_hint_in_the_opposite_corner_falls_back_to_the_full_screen(engine):
+    engine.recognize = fake_recognize(engine.calls, box=(0, 468, 40, 12))
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+    assert engine.locate_text("Save", region=(600, 0, 40, 12), image=image) == [(0, 468, 40, 12, 95.0)]
+    assert engine.calls[-1] == {"offset": (0, 0), "size": (640, 480), "psm": PSM_SPARSE_TEXT, "whitelist": None}
+
+
+def test_text_missing_everywhere_stops_at_the_full_screen(engine):
+    engine.recognize = lambda crop, **kwargs: engine.calls.append(crop.shape) or OCRFrame({})
+    assert engine.locate_text("Nope", region=(20, 20, 60, 30), image=np.zeros((480, 640), np.uint8)) == []
+    assert engine.calls[-1] == (480, 640)
+
+
+def test_screen_lookups_capture_only_the_region(engine, monkeypatch):
+    captured = []
+
+    def capture(monitor_id=1, region=None, mode="bgr"):
+        captured.append(region)
+        return np.zeros((region[3], region[2], 3), dtype=np.uint8)
+    monkeypatch.setattr(screen_capture, "monitor_size", lambda monitor_id=1: (640, 480))
+    monkeypatch.setattr(screen_capture, "capture", capture)
+    assert engine.locate_text("Save", region=(0, 0, 80, 40))
+    assert captured[0] == (0, 0, 80, 40)
+    assert all(region[:2] == (0, 0) for region in captured)  # Clamped at the screen's top-left edge
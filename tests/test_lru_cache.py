@@ -0,0 +1,69 @@
+import threading
+
+from src.safwanbuddy.utils.lru_cache import LRUCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert len(cache) == 2
+
+
+def test_stored_none_is_a_hit_not_a_miss():
+    cache, missing = LRUCache(), object()
+    cache.put("k", None)
+    assert cache.get("k", missing) is None
+    assert cache.get("other", missing) is missing
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_pop_and_clear():
+    cache = LRUCache()
+    cache.put("a", 1)
+    assert cache.pop("a") == 1 and cache.pop("a", "gone") == "gone"
+    cache.put("b", 2)
+    cache.clear("event payload")
+    assert len(cache) == 0
+
+
+def test_stats():
+    cache = LRUCache(maxsize=4)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+    cache.clear()
+    assert cache.stats() == {"size": 0, "maxsize": 4, "hits": 2, "misses": 1,
+                             "hit_ratio": 2 / 3, "invalidations": 1}
+
+
+def test_concurrent_puts_stay_bounded():
+    cache = LRUCache(maxsize=50)
+
+    def fill(offset):
+        for i in range(2000):
+            cache.put(offset + i, i)
+            cache.get(offset + i // 2)
+    threads = [threading.Thread(target=fill, args=(n * 10000,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache) == 50
+
+
+def test_membership_and_len_wait_for_a_writer():
+    cache = LRUCache()
+    cache.put("a", 1)
+    seen = []
+    with cache._lock:  # A put() in progress on another thread
+        reader = threading.Thread(target=lambda: seen.append(("a" in cache, len(cache))))
+        reader.start()
+        reader.join(timeout=0.05)
+        assert reader.is_alive() and seen == []
+    reader.join()
+    assert seen == [(True, 1)]
@@ -0,0 +1,55 @@
+from src.safwanbuddy.vision.ocr_frame import OCRFrame
+
+
+def tesseract_data(words):
+    """image_to_data-style dict from (text, left, top, width, height, conf, line_num) tuples."""
+    data = {key: [] for key in ("text", "left", "top", "width", "height", "conf",
+                                "page_num", "block_num", "par_num", "line_num")}
+    for text, left, top, width, height, conf, line in words:
+        for key, value in zip(("text", "left", "top", "width", "height", "conf", "page_num", "block_num",
+                               "par_num", "line_num"), (text, left, top, width, height, conf, 1, 1, 1, line)):
+            data[key].append(value)
+    return data
+
+
+def frame(scale=1.0, offset=(0, 0)):
+    return OCRFrame(tesseract_data([
+        ("Save", 10, 10, 40, 12, 96, 1), ("As", 55, 10, 20, 12, 80, 1), ("", 0, 0, 0, 0, -1, 1),
+        ("Cancel", 90, 10, 50, 12, 91, 1),
+        ("Autosave", 10, 40, 70, 12, 88, 2), ("on", 85, 40, 20, 12, 70, 2), ("noise", 0, 0, 5, 5, -1, 2),
+    ]), scale, offset)
+
+
+def test_empty_and_negative_confidence_entries_are_dropped():
+    assert [w["text"] for w in frame().words] == ["Save", "As", "Cancel", "Autosave", "on"]
+    assert frame().text == "Save As Cancel\nAutosave on"
+
+
+def test_single_word_matches_any_word_containing_it():
+    assert frame().find_text("SAVE") == [(10, 10, 40, 12, 96.0), (10, 40, 70, 12, 88.0)]
+
+
+def test_phrase_matches_consecutive_words_of_one_line():
+    assert frame().find_text("save as") == [(10, 10, 65, 12, 80.0)]
+    assert frame().find_text("as cancel") == [(55, 10, 85, 12, 80.0)]
+    assert frame().find_text("cancel autosave") == []  # Crosses a line break
+    assert frame().find_text("on please") == []  # Runs past the end of the line
+
+
+def test_boxes_are_mapped_back_from_scaled_and_cropped_images():
+    found = frame(scale=2.0, offset=(100, 200)).find_text("cancel")
+    assert found == [(145, 205, 25, 6, 91.0)]
+
+
+def test_lookups_are_cached_until_a_word_is_added():
+    f = frame()
+    first = f.find_text("on")
+    assert f.find_text(" ON ") is first
+    f.add_word("online", 0, 80, 50, 12, 90.0, (1, 1, 1, 3))
+    assert len(f.find_text("on")) == len(first) + 1
+
+
+def test_from_words_round_trips():
+    original = frame()
+    copy = OCRFrame.from_words(original.words)
+    assert copy.words == original.words and copy.text == original.text
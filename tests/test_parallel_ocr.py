@@ -0,0 +1,55 @@
+import pytest
+
+from src.safwanbuddy.vision.ocr_frame import OCRFrame
+from src.safwanbuddy.vision.parallel_ocr import merge_tile_words, tile_rects
+
+
+def word(text, x, y, w=30, h=12, conf=90.0):
+    return {"text": text, "box": (x, y, w, h), "conf": conf, "line": (0, 0, 0, 0)}
+
+
+@pytest.mark.parametrize("width, height", [(1000, 700), (1024, 1024), (2500, 1300), (300, 200)])
+def test_tiles_cover_the_frame_and_clip_at_the_edges(width, height):
+    rects = tile_rects(width, height, tile_size=1024, overlap=96)
+    assert all(0 <= x0 < x1 <= width and 0 <= y0 < y1 <= height for x0, y0, x1, y1 in rects)
+    assert max(x1 for _, _, x1, _ in rects) == width and max(y1 for _, _, _, y1 in rects) == height
+    for x in range(0, width, 37):
+        for y in range(0, height, 37):
+            assert any(x0 <= x < x1 and y0 <= y < y1 for x0, y0, x1, y1 in rects)
+
+
+def test_neighbouring_tiles_overlap_by_the_overlap():
+    rects = tile_rects(2500, 500, tile_size=1024, overlap=96)
+    assert [(x0, x1) for x0, _, x1, _ in rects] == [(0, 1024), (928, 1952), (1856, 2500)]
+    assert tile_rects(300, 200, tile_size=1024, overlap=96) == [(0, 0, 300, 200)]
+
+
+def test_word_inside_the_overlap_is_kept_once():
+    a, b = (0, 0, 100, 50), (60, 0, 160, 50)  # Overlap 40: a's core ends and b's starts at x=80
+    results = [(a, [word("Hello", 64, 10)]), (b, [word("Hello", 64, 10)])]
+    merged = merge_tile_words(results, 160, 50, overlap=40)
+    assert [(w["text"], w["box"]) for w in merged] == [("Hello", (64, 10, 30, 12))]
+
+
+def test_duplicate_cut_differently_by_two_tiles_is_dropped():
+    a, b = (0, 0, 100, 50), (60, 0, 160, 50)
+    # Centers 79 and 81 fall in different cores, so each tile owns its copy
+    results = [(a, [word("Hello", 70, 10, w=18)]), (b, [word("Hello", 72, 10, w=18)])]
+    merged = merge_tile_words(results, 160, 50, overlap=40)
+    assert [w["box"] for w in merged] == [(70, 10, 18, 12)]
+
+
+def test_word_cut_at_a_seam_comes_from_the_tile_that_saw_it_whole():
+    a, b = (0, 0, 100, 50), (60, 0, 160, 50)
+    # a sees "Subm" clipped at its right edge; the whole word is centered in b's core
+    results = [(a, [word("Subm", 85, 10, w=15)]), (b, [word("Submit", 85, 10, w=40)])]
+    merged = merge_tile_words(results, 160, 50, overlap=40)
+    assert [w["text"] for w in merged] == ["Submit"]
+
+
+def test_phrase_straddling_tiles_lands_on_one_line():
+    a, b = (0, 0, 100, 50), (60, 0, 160, 50)
+    results = [(a, [word("Save", 40, 20)]), (b, [word("changes", 80, 21, w=40)])]
+    merged = merge_tile_words(results, 160, 50, overlap=40)
+    assert len({w["line"] for w in merged}) == 1
+    assert OCRFrame.from_words(merged).find_text("save changes")
@@ -0,0 +1,35 @@
+from src.safwanbuddy.utils.phrase_trie import PhraseSubstituter
+
+
+def test_single_words_are_replaced():
+    assert PhraseSubstituter({"hau": "yes", "nakko": "no"}).substitute("hau nakko maybe") == "yes no maybe"
+
+
+def test_longest_phrase_wins_at_each_position():
+    trie = PhraseSubstituter({"band": "stop", "band kar": "close", "band kar do": "close it"})
+    assert trie.substitute("window band kar") == "window close"
+    assert trie.substitute("band kar do abhi") == "close it abhi"
+    assert trie.substitute("band") == "stop"
+
+
+def test_partial_phrase_falls_back_to_word_by_word():
+    trie = PhraseSubstituter({"kya karre": "what are you doing", "kya": "what"})
+    assert trie.substitute("kya hona") == "what hona"
+
+
+def test_empty_replacement_drops_the_phrase():
+    assert PhraseSubstituter({"ich": ""}).substitute("aisa ich hai") == "aisa hai"
+
+
+def test_keys_are_case_and_space_insensitive():
+    trie = PhraseSubstituter({"  Band   Kar ": "close", "": "ignored"})
+    assert len(trie) == 1 and trie.max_depth == 2
+    assert trie.substitute("band  kar") == "close"
+
+
+def test_later_additions_override_and_extend():
+    trie = PhraseSubstituter({"khol": "open"})
+    trie.add("khol", "open up")
+    trie.add("khol do", "open it")
+    assert len(trie) == 2
+    assert trie.substitute("khol khol do") == "open up open it"
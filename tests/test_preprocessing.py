@@ -0,0 +1,56 @@
+import pickle
+
+import cv2
+import numpy as np
+import pytest
+
+from src.safwanbuddy.vision.preprocessing import PreprocessPipeline, estimate_noise, to_gray
+
+
+def screen(sigma=0.0, seed=0):
+    """A small synthetic UI crop: light background, dark text strokes, optional gaussian noise."""
+    image = np.full((90, 240), 235, dtype=np.uint8)
+    cv2.putText(image, "Save as", (10, 55), cv2.FONT_HERSHEY_SIMPLEX, 1.0, 30, 2, cv2.LINE_AA)
+    image = image.astype(np.float32)
+    if sigma:
+        image += np.random.default_rng(seed).normal(0, sigma, image.shape)
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def test_noise_estimate_tracks_sigma_and_ignores_text_edges():
+    assert estimate_noise(screen()) < 1.0
+    for sigma in (5, 10, 20):
+        assert estimate_noise(screen(sigma)) == pytest.approx(sigma, rel=0.3)
+    assert estimate_noise(np.zeros((2, 50), dtype=np.uint8)) == 0.0
+
+
+def test_auto_denoise_only_runs_on_noisy_frames():
+    pipeline = PreprocessPipeline(denoise="auto", noise_threshold=3.0)
+    pipeline(screen())
+    assert not pipeline.last_denoised and "denoise" not in pipeline.timings
+    pipeline(screen(10))
+    assert pipeline.last_denoised and pipeline.last_noise > 3.0 and "denoise" in pipeline.timings
+
+
+@pytest.mark.parametrize("denoise, expected", [(True, True), (False, False)])
+def test_fixed_denoise_skips_the_estimate(denoise, expected):
+    pipeline = PreprocessPipeline(denoise=denoise)
+    pipeline(screen(10))
+    assert pipeline.last_denoised is expected and "noise_estimate" not in pipeline.timings
+
+
+def test_stages_and_output():
+    image = cv2.cvtColor(screen(), cv2.COLOR_GRAY2BGR)
+    pipeline = PreprocessPipeline(scale=2.0, max_width=360, denoise=False, threshold="otsu")
+    out = pipeline(image)
+    assert out.shape == (135, 360)  # max_width caps the 2x scale at 1.5x
+    assert set(np.unique(out)) <= {0, 255}
+    assert set(pipeline.timings) == {"gray", "scale", "threshold", "total"}
+
+    raw = PreprocessPipeline(denoise=False, threshold=None)(image)
+    assert np.array_equal(raw, to_gray(image))
+
+
+def test_pipeline_is_picklable_for_workers():
+    pipeline = pickle.loads(pickle.dumps(PreprocessPipeline(threshold="adaptive", block_size=15)))
+    assert pipeline(screen()).shape == (90, 240)
@@ -0,0 +1,64 @@
+import json
+import os
+
+import numpy as np
+
+from src.safwanbuddy.automation.run_checkpoint import CheckpointStore, _jsonable, hash_distance, screen_hash
+
+
+def test_save_and_load_round_trip(tmp_path):
+    store = CheckpointStore(str(tmp_path / "runs"))
+    source = tmp_path / "flow.json"
+    source.write_text("{}", encoding="utf-8")
+    store.save(str(source), {"stamp": store.stamp(str(source)), "next": 3, "completed": ["a"],
+                             "variables": {"total": 5, "crop": np.zeros((2, 2))}})
+    state = store.load(str(source))
+    assert state["next"] == 3 and state["completed"] == ["a"]
+    assert state["variables"] == {"total": 5}  # The array does not survive JSON and is dropped
+    assert state["stamp"] == store.stamp(str(source))
+    assert state["source"] == os.path.abspath(source)
+    assert os.listdir(store.directory) == [os.path.basename(store.path_for(str(source)))]  # No temp file left
+
+
+def test_load_returns_none_for_missing_or_corrupt_state(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    assert store.load("flow.json") is None
+    with open(store.path_for("flow.json"), "w", encoding="utf-8") as f:
+        f.write('{"next": ')
+    assert store.load("flow.json") is None
+
+
+def test_clear_removes_state_and_stray_temp_file(tmp_path):
+    store = CheckpointStore(str(tmp_path), fsync=True)
+    store.save("flow.json", {"next": 1})
+    open(f"{store.path_for('flow.json')}.tmp", "w").close()
+    store.clear("flow.json")
+    assert os.listdir(tmp_path) == []
+    store.clear("flow.json")  # Nothing left to remove is fine
+
+
+def test_paths_differ_for_same_name_in_different_directories(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    a, b = store.path_for("one/flow.json"), store.path_for("two/flow.json")
+    assert a != b and os.path.basename(a).startswith("flow-") and a.endswith(".run.json")
+    assert store.path_for("one/flow.json") == a
+
+
+def test_jsonable_keeps_only_serializable_values():
+    kept = _jsonable({"n": 1, "s": "x", "l": [1, "a"], "obj": object(), "set": {1}})
+    assert kept == {"n": 1, "s": "x", "l": [1, "a"]}
+    json.dumps(kept)
+
+
+def test_screen_hash_tolerates_noise_but_not_a_new_screen():
+    rng = np.random.default_rng(0)
+    screen = np.zeros((120, 160), dtype=np.uint8)
+    screen[:, :80] = 200
+    noisy = np.clip(screen.astype(int) + rng.integers(-10, 10, screen.shape), 0, 255).astype(np.uint8)
+    other = np.zeros_like(screen)
+    other[:60] = 200  # Split the other way
+    h = screen_hash(screen)
+    assert len(h) == 64
+    assert hash_distance(h, h) == 0
+    assert hash_distance(h, screen_hash(noisy)) <= 4
+    assert hash_distance(h, screen_hash(other)) > 32
@@ -0,0 +1,80 @@
+import importlib
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.safwanbuddy.vision.screen_capture import ScreenCapture
+
+capture_module = importlib.import_module("src.safwanbuddy.vision.screen_capture")
+
+MONITOR = {"left": 100, "top": 50, "width": 8, "height": 6}
+
+
+class FakeMSS:
+    """mss handle over a BGRA screen whose blue channel is the column and green the row."""
+
+    def __init__(self):
+        self.monitors = [MONITOR, MONITOR]
+        self.areas = []
+        self.thread = threading.current_thread()
+        rows, cols = np.mgrid[0:MONITOR["height"], 0:MONITOR["width"]]
+        self.screen = np.stack([cols, rows, np.full_like(rows, 7), np.full_like(rows, 255)], axis=-1).astype(np.uint8)
+
+    def grab(self, area):
+        self.areas.append(area)
+        x, y = area["left"] - MONITOR["left"], area["top"] - MONITOR["top"]
+        pixels = np.ascontiguousarray(self.screen[y:y + area["height"], x:x + area["width"]])
+        return SimpleNamespace(raw=bytearray(pixels.tobytes()), width=area["width"], height=area["height"])
+
+
+@pytest.fixture
+def handles(monkeypatch):
+    handles = []
+
+    def open_handle():
+        handles.append(FakeMSS())
+        return handles[-1]
+    monkeypatch.setattr(capture_module, "mss", SimpleNamespace(mss=open_handle))
+    return handles
+
+
+def test_regions_are_clamped_to_the_monitor(handles):
+    capture = ScreenCapture()
+    image = capture.capture(region=(6, 4, 10, 10))
+    assert handles[0].areas == [{"left": 106, "top": 54, "width": 2, "height": 2}]
+    assert image.shape == (2, 2, 3)
+    assert image[0, 0].tolist() == [6, 4, 7]  # BGR
+    assert capture.capture(region=(2, 1, 3, 2), mode="rgb")[1, 2].tolist() == [7, 2, 4]
+    assert capture.monitor_size() == (8, 6)
+
+
+def test_bgra_is_a_view_of_the_grabbed_buffer(handles):
+    capture = ScreenCapture()
+    bgra = capture.capture(mode="bgra")
+    assert bgra.shape == (6, 8, 4) and not bgra.flags.owndata
+    assert bgra[5, 3].tolist() == [3, 5, 7, 255]
+
+
+def test_reuse_writes_into_one_buffer_per_mode(handles):
+    capture = ScreenCapture()
+    first = capture.capture(mode="gray", reuse=True)
+    second = capture.capture(mode="gray", reuse=True)
+    assert second is first
+    assert capture.capture(mode="bgr", reuse=True) is not first
+    assert capture.capture(region=(0, 0, 4, 4), mode="gray", reuse=True).shape == (4, 4)  # New shape, new buffer
+    out = np.empty((6, 8), np.uint8)
+    assert capture.capture_gray(out=out) is out
+
+
+def test_threads_get_their_own_handles_and_buffers(handles):
+    capture = ScreenCapture()
+    main = capture.capture(mode="gray", reuse=True)
+    results = []
+    worker = threading.Thread(target=lambda: results.append(capture.capture(mode="gray", reuse=True)))
+    worker.start()
+    worker.join()
+    assert results[0] is not main
+    assert [handle.thread for handle in handles] == [threading.current_thread(), worker]
+    assert capture.capture(mode="gray", reuse=True) is main
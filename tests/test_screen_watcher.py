@@ -0,0 +1,88 @@
+import threading
+import time
+
+import numpy as np
+
+from src.safwanbuddy.core import event_bus
+from src.safwanbuddy.vision import screen_watcher as watcher_module
+from src.safwanbuddy.vision.screen_watcher import ScreenWatcher
+
+
+class FakeCapture:
+    """Replays a fixed list of screens, then repeats the last one."""
+
+    def __init__(self, screens):
+        self.screens = list(screens)
+        self.calls = 0
+        self.threads = set()
+
+    def capture(self, monitor_id=1, region=None, mode="bgr"):
+        self.threads.add(threading.current_thread().name)
+        image = self.screens[min(self.calls, len(self.screens) - 1)]
+        self.calls += 1
+        return image.copy()
+
+
+def wait_for(check, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not check():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_watcher_emits_changes_and_shuts_its_thread_down(monkeypatch):
+    blank = np.zeros((100, 150, 3), dtype=np.uint8)
+    changed = blank.copy()
+    changed[70:80, 130:140] = 255
+    fake = FakeCapture([blank, blank, changed])
+    monkeypatch.setattr(watcher_module, "ScreenCapture", lambda: fake)
+    events = []
+    event_bus.subscribe("screen_changed", events.append)
+    watcher = ScreenWatcher(fps=200, ring_size=3, tile_size=64)
+    try:
+        watcher.start()
+        watcher.start()  # Already running: no second thread
+        assert watcher.is_running
+        wait_for(lambda: fake.calls >= 5)
+    finally:
+        watcher.stop()
+        event_bus.unsubscribe("screen_changed", events.append)
+    assert not watcher.is_running and watcher._thread is None
+    assert fake.threads == {"screen-watcher"}
+
+    # First frame is all dirty, the unchanged one emits nothing, the edit is clipped to the screen
+    assert [event["rects"] for event in events] == [[(0, 0, 150, 100)], [(128, 64, 22, 36)]]
+    assert [event["seq"] for event in events] == [1, 3]
+
+    calls = fake.calls
+    time.sleep(0.05)
+    assert fake.calls == calls  # Nothing captures after stop()
+    frames = watcher.frames_since(0)
+    assert len(frames) == 3 and frames[-1].seq == calls
+    assert not frames[-1].image.flags.writeable
+
+
+def test_latest_or_capture_falls_back_when_stopped(monkeypatch):
+    direct = np.ones((4, 4, 3), dtype=np.uint8)
+    monkeypatch.setattr(watcher_module.screen_capture, "capture", lambda monitor_id=1, **kwargs: direct)
+    watcher = ScreenWatcher(fps=200)
+    assert watcher.latest() is None
+    assert watcher.latest_or_capture() is direct
+
+
+def test_capture_errors_do_not_kill_the_thread(monkeypatch):
+    class Flaky(FakeCapture):
+        def capture(self, monitor_id=1, region=None, mode="bgr"):
+            if self.calls == 0:
+                self.calls += 1
+                raise OSError("display gone")
+            return super().capture(monitor_id, region, mode)
+    fake = Flaky([np.zeros((8, 8, 3), dtype=np.uint8)])
+    monkeypatch.setattr(watcher_module, "ScreenCapture", lambda: fake)
+    watcher = ScreenWatcher(fps=200)
+    try:
+        watcher.start()
+        wait_for(lambda: watcher.latest() is not None)
+    finally:
+        watcher.stop()
+    assert watcher.latest().seq >= 1
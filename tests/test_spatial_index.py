@@ -0,0 +1,53 @@
+import numpy as np
+
+from src.safwanbuddy.vision.element_detector import ELEMENT_DTYPE
+from src.safwanbuddy.vision.ocr_frame import OCRFrame
+from src.safwanbuddy.vision.spatial_index import SpatialIndex
+
+
+def index_of(*items, cell_size=64):
+    index = SpatialIndex(cell_size)
+    for box, kind in items:
+        index.insert(box, kind)
+    return index
+
+
+def test_query_returns_each_intersecting_item_once():
+    index = index_of(((0, 0, 200, 20), "input"), ((300, 300, 10, 10), "word"), ((50, 5, 10, 10), "word"))
+    assert sorted(index.query((40, 0, 30, 30))) == [0, 2]  # The wide box spans several cells
+    assert list(index.query((40, 0, 30, 30), "word")) == [2]
+    assert list(index.query((210, 0, 50, 50))) == []  # Shares a cell but does not touch
+
+
+def test_edges_only_touching_do_not_intersect():
+    index = index_of(((0, 0, 64, 64), "input"))
+    assert list(index.query((64, 0, 10, 10))) == []
+
+
+def test_nearest_right_stays_on_the_label_row():
+    index = index_of(((300, 8, 200, 30), "input"), ((150, 10, 200, 30), "input"), ((120, 60, 200, 30), "input"))
+    assert index.nearest_right((10, 10, 80, 20))[0] == (150, 10, 200, 30)
+    assert index.nearest_right((10, 10, 80, 20), max_distance=50) is None
+
+
+def test_nearest_below_needs_horizontal_overlap():
+    index = index_of(((200, 40, 200, 30), "input"), ((10, 50, 200, 30), "input"))
+    assert index.nearest_below((10, 10, 80, 20))[0] == (10, 50, 200, 30)
+
+
+def test_resolve_fields_never_assigns_one_field_twice():
+    index = index_of(((150, 10, 200, 30), "input"), ((10, 90, 200, 30), "input"))
+    labels = {"name": (10, 15, 80, 20), "email": (10, 60, 80, 20), "phone": (10, 500, 80, 20)}
+    assert index.resolve_fields(labels) == {
+        "name": (150, 10, 200, 30),
+        "email": (10, 90, 200, 30),  # Also below name, but 10 px from email against 55 from name
+        "phone": None,
+    }
+
+
+def test_from_frame_indexes_words_and_elements():
+    frame = OCRFrame.from_words([{"text": "Email", "box": (10, 10, 50, 15), "conf": 95.0, "line": (1, 1, 1, 1)}])
+    elements = np.array([("input", 100, 5, 200, 30, 0.9)], dtype=ELEMENT_DTYPE)
+    index = SpatialIndex.from_frame(frame, elements)
+    assert [item[1:] for item in index.items] == [("word", "Email"), ("input", np.float32(0.9))]
+    assert index.resolve_fields({"Email": frame.find_text("email")[0]}) == {"Email": (100, 5, 200, 30)}
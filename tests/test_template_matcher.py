@@ -0,0 +1,60 @@
+import numpy as np
+
+from src.safwanbuddy.vision.template_matcher import TemplateLibrary, TemplateMatcher
+
+
+def icon():
+    image = np.full((24, 24), 40, dtype=np.uint8)
+    image[4:20, 4:20] = 220
+    image[9:15, 9:15] = 90
+    return image
+
+
+def matcher():
+    library = TemplateLibrary(template_dir="missing", scales=(1.0,))
+    library.add("gear", icon())
+    return TemplateMatcher(library, cache_size=8)
+
+
+def frame_with_icon_at(x, y):
+    frame = np.full((128, 128), 128, dtype=np.uint8)
+    frame[y:y + 24, x:x + 24] = icon()
+    return frame
+
+
+def test_finds_the_icon_in_frame_coordinates():
+    found = matcher().find(frame_with_icon_at(70, 10), "gear")
+    assert found[:4] == (70, 10, 24, 24) and found[4] > 0.99
+
+
+def test_unchanged_frame_is_answered_from_the_cache():
+    m, frame = matcher(), frame_with_icon_at(10, 10)
+    first = m.match(frame, "gear")
+    assert m.match(frame.copy(), "gear") == first
+    assert m.stats()["hits"] == 1
+
+
+def test_moving_a_tile_invalidates_the_cached_result():
+    m = matcher()
+    frame = frame_with_icon_at(20, 20)  # Inside the top-left 64 px tile
+    moved = frame.copy()
+    moved[:64, :64], moved[64:, 64:] = frame[64:, 64:], frame[:64, :64]  # Same tiles, swapped
+    assert m.find(frame, "gear")[:2] == (20, 20)
+    assert m.find(moved, "gear")[:2] == (84, 84)
+
+
+def test_list_region_is_cached_like_a_tuple():
+    m, frame = matcher(), frame_with_icon_at(70, 70)
+    assert m.find(frame, "gear", region=[64, 64, 64, 64])[:2] == (70, 70)
+    assert m.find(frame, "gear", region=(64, 64, 64, 64))[:2] == (70, 70)
+    assert m.stats()["hits"] == 1
+
+
+def test_region_limits_the_search_and_keys_the_cache():
+    m, frame = matcher(), frame_with_icon_at(70, 70)
+    assert m.find(frame, "gear", region=(0, 0, 64, 64)) is None
+    assert m.find(frame, "gear", region=(64, 64, 64, 64))[:2] == (70, 70)
+
+
+def test_unknown_template_matches_nothing():
+    assert matcher().match(frame_with_icon_at(0, 0), "missing") == []
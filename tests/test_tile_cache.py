@@ -0,0 +1,84 @@
+import numpy as np
+
+from src.safwanbuddy.vision.ocr_frame import OCRFrame
+from src.safwanbuddy.vision.tile_cache import TileHasher, TileOCRCache, regroup_lines
+
+TILE = 32
+
+
+def screen():
+    rng = np.random.default_rng(1)
+    return rng.integers(0, 255, size=(96, 128), dtype=np.uint8)
+
+
+class FakeOCR:
+    """Reports one word per image, at its top-left corner, and counts the pixels it was asked to read."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, image):
+        self.calls.append(image.shape)
+        return OCRFrame.from_words([{"text": "word", "box": (4, 4, 10, 8), "conf": 90.0, "line": (1, 1, 1, 1)}])
+
+
+def test_hash_tiles_pads_partial_tiles():
+    hasher = TileHasher(TILE)
+    hashes = hasher.hash_tiles(np.zeros((70, 40), dtype=np.uint8))
+    assert hashes.shape == (3, 2) and hashes.dtype == np.uint64
+
+
+def test_one_changed_pixel_changes_only_its_tile():
+    hasher, image = TileHasher(TILE), screen()
+    changed = image.copy()
+    changed[40, 70] ^= 1
+    diff = hasher.hash_tiles(image) != hasher.hash_tiles(changed)
+    assert np.argwhere(diff).tolist() == [[1, 2]]
+
+
+def test_region_hash_depends_on_tile_positions():
+    hasher, image = TileHasher(TILE), screen()
+    swapped = image.copy()
+    swapped[:32, :32], swapped[:32, 32:64] = image[:32, 32:64], image[:32, :32]
+    assert hasher.hash_region(image) == hasher.hash_region(image.copy())
+    assert hasher.hash_region(image) != hasher.hash_region(swapped)
+
+
+def test_dirty_rects_merge_connected_tiles():
+    previous = np.zeros((3, 4), dtype=np.uint64)
+    current = previous.copy()
+    current[0, 0] = current[0, 1] = current[2, 3] = 1
+    assert sorted(TileHasher.dirty_rects(previous, current, TILE)) == [(0, 0, 64, 32), (96, 64, 32, 32)]
+    assert TileHasher.dirty_rects(previous, previous, TILE) == []
+    assert TileHasher.dirty_rects(None, current, TILE) == [(0, 0, 128, 96)]
+
+
+def test_unchanged_frame_skips_recognition():
+    ocr = FakeOCR()
+    cache = TileOCRCache(ocr, tile_size=TILE, margin=8)
+    image = screen()
+    first = cache.recognize(image)
+    assert len(ocr.calls) == 1 and cache.last_dirty == 12
+    assert cache.recognize(image.copy()) is first
+    assert len(ocr.calls) == 1 and cache.last_dirty == 0
+
+
+def test_only_dirty_neighbourhoods_are_recognized():
+    ocr = FakeOCR()
+    cache = TileOCRCache(ocr, tile_size=TILE, margin=8)
+    image = screen()
+    cache.recognize(image)
+    image[70, 120] ^= 1  # Bottom-right tile; its neighbours' keys change too
+    frame = cache.recognize(image)
+    assert cache.last_dirty == 4
+    assert ocr.calls[-1] == (72, 72)  # The 2x2 dirty group plus margin, clipped to the frame
+    assert frame.find_text("word")  # Words of clean tiles come from the cache
+
+
+def test_regroup_lines_splits_on_rows_and_wide_gaps():
+    words = [{"text": t, "box": box, "conf": 90.0, "line": None} for t, box in [
+        ("far", (300, 10, 20, 10)), ("save", (10, 11, 30, 10)), ("as", (45, 10, 15, 10)), ("next", (10, 40, 30, 10))]]
+    lines = {}
+    for word in regroup_lines(words):
+        lines.setdefault(word["line"], []).append(word["text"])
+    assert list(lines.values()) == [["save", "as"], ["far"], ["next"]]
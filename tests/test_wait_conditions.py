@@ -0,0 +1,100 @@
+import threading
+
+import numpy as np
+import pytest
+
+from src.safwanbuddy.automation.wait_conditions import WaitConditions, WaitTimeout
+from src.safwanbuddy.core import event_bus
+
+
+@pytest.fixture
+def waits():
+    return WaitConditions(interval=0.005, timeout=0.2, capture=object())
+
+
+def test_armed_wait_sees_an_event_emitted_before_it_runs(waits):
+    spec = {"until": "event", "event": "saved", "match": {"ok": True}, "timeout": 0.05}
+    waiter = waits.arm(spec)
+    event_bus.emit("saved", {"ok": False})  # Filtered out by match
+    event_bus.emit("saved", {"ok": True, "id": 7})
+    assert waits.until(spec, waiter) == {"ok": True, "id": 7}
+    assert waiter not in event_bus._listeners["saved"]  # until() unsubscribed it
+
+
+def test_unarmed_wait_misses_an_event_that_already_fired(waits):
+    event_bus.emit("saved", {"ok": True})
+    with pytest.raises(WaitTimeout):
+        waits.until({"until": "event", "event": "saved", "timeout": 0.02})
+
+
+class FakeScreen:
+    """Capture source whose content switches to `after` from the given call on."""
+
+    def __init__(self, before, after, switch_at):
+        self.images = (before, after)
+        self.switch_at = switch_at
+        self.calls = []
+
+    def capture(self, monitor_id=1, region=None, mode="gray"):
+        self.calls.append((region, mode))
+        image = self.images[len(self.calls) > self.switch_at]
+        if region is not None:
+            x, y, w, h = region
+            image = image[y:y + h, x:x + w]
+        return image.copy()
+
+
+def test_poll_returns_the_first_truthy_result(waits):
+    results = iter([None, False, 0, "done"])
+    assert waits.poll(lambda: next(results)) == 0  # 0 counts as a result, only None/False retry
+
+
+def test_poll_times_out(waits):
+    calls = []
+    with pytest.raises(WaitTimeout, match="the door"):
+        waits.poll(lambda: calls.append(1), timeout=0.02, what="the door")
+    assert len(calls) >= 2
+
+
+def test_until_region_change_returns_the_new_content():
+    before, after = np.zeros((20, 20), np.uint8), np.full((20, 20), 255, np.uint8)
+    fake = FakeScreen(before, after, switch_at=3)
+    waits = WaitConditions(interval=0.001, timeout=0.5, capture=fake)
+    changed = waits.until({"until": "region_change", "region": [5, 5, 4, 4]})
+    assert (changed == 255).all() and changed.shape == (4, 4)
+    assert fake.calls[0] == ((5, 5, 4, 4), "gray")  # list regions become tuples
+
+
+def test_until_pixel_times_out_unless_optional():
+    black = np.zeros((4, 4, 3), np.uint8)
+    waits = WaitConditions(interval=0.001, timeout=0.5, capture=FakeScreen(black, black, switch_at=0))
+    spec = {"until": "pixel", "x": 1, "y": 1, "color": "#ff0000", "timeout": 0.02}
+    with pytest.raises(WaitTimeout):
+        waits.until(spec)
+    assert waits.until({**spec, "optional": True}) is None
+
+
+def test_until_pixel_succeeds_when_the_color_shows_up():
+    black, red = np.zeros((4, 4, 3), np.uint8), np.zeros((4, 4, 3), np.uint8)
+    red[..., 0] = 250
+    waits = WaitConditions(interval=0.001, timeout=0.5, capture=FakeScreen(black, red, switch_at=2))
+    assert waits.until({"until": "pixel", "x": 1, "y": 1, "color": (255, 0, 0)}) == (250, 0, 0)
+
+
+def test_unarmed_event_wait_sees_a_later_event(waits):
+    timer = threading.Timer(0.02, event_bus.emit, ("saved", {"ok": True}))
+    timer.start()
+    try:
+        assert waits.until({"until": "event", "event": "saved", "match": {"ok": True}, "timeout": 1}) == {"ok": True}
+    finally:
+        timer.join()
+    assert not event_bus._listeners["saved"]
+
+
+def test_validate_rejects_incomplete_specs():
+    with pytest.raises(ValueError, match="must be one of"):
+        WaitConditions.validate({"until": "forever"})
+    with pytest.raises(ValueError, match="needs x, y"):
+        WaitConditions.validate({"until": "pixel", "color": "#000000"})
+    with pytest.raises(ValueError, match="region"):
+        WaitConditions.validate({"until": "stable", "region": [1, 2, 3]})
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from src.safwanbuddy.automation.run_checkpoint import CheckpointStore
+from src.safwanbuddy.automation.workflow_engine import WorkflowEngine
+from src.safwanbuddy.automation.workflow_plan import UI, PlanCache
+
+
+class Recorder:
+    """Stands in for pyautogui, click_system, type_system and the event bus; records every call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+
+@pytest.fixture
+def engine(tmp_path):
+    fake = Recorder()
+    engine = WorkflowEngine(str(tmp_path / "recordings"))
+    engine.plans = PlanCache(engine.load_workflow, lambda: UI(fake, fake, fake, None, fake))
+    engine.checkpoints = CheckpointStore(str(tmp_path / "runs"))
+    engine.calls = fake.calls
+    return engine
+
+
+def write(tmp_path, steps):
+    path = tmp_path / "flow.json"
+    path.write_text(json.dumps({"name": "flow", "steps": steps}))
+    return str(path)
+
+
+def test_from_step_inside_a_coalesced_run_keeps_the_remaining_keys(engine, tmp_path):
+    path = write(tmp_path, [{"type": "key", "key": c, "delay": 0} for c in "hello"] +
+                 [{"type": "key", "key": "enter", "delay": 0}])
+    engine.run_workflow(path, coalesce=True)
+    engine.calls.clear()
+    engine.run_workflow(path, coalesce=True, from_step=2)
+    assert [(name, args) for name, args, _ in engine.calls] == [("type_text", ("llo",)), ("press", ("enter",))]
+
+
+def test_from_step_in_a_graph_without_checkpoint_skips_only_its_ancestors(engine, tmp_path):
+    # File order puts the unrelated step first and an ancestor after the selected step
+    path = write(tmp_path, [
+        {"id": "other", "type": "key", "key": "o", "delay": 0},
+        {"id": "pick", "needs": ["open"], "type": "key", "key": "p", "delay": 0},
+        {"id": "after", "needs": ["pick"], "type": "key", "key": "a", "delay": 0},
+        {"id": "open", "type": "key", "key": "x", "delay": 0},
+    ])
+    engine.run_workflow(path, from_step="pick")
+    assert sorted(args[0] for _, args, _ in engine.calls) == ["a", "o", "p"]
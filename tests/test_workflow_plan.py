@@ -0,0 +1,197 @@
+import json
+import os
+
+import pytest
+
+from src.safwanbuddy.automation.workflow_plan import (
+    UI, PlanCache, WorkflowError, coalesce_keys, compile_workflow,
+)
+
+
+class Recorder:
+    """Stands in for pyautogui, click_system, type_system and the event bus; records every call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+
+@pytest.fixture
+def ui():
+    fake = Recorder()
+    return UI(fake, fake, fake, None, fake)
+
+
+def test_steps_run_in_order_through_the_ui(ui):
+    plan = compile_workflow({"steps": [
+        {"type": "click", "x": 10, "y": 20, "delay": 0},
+        {"type": "key", "key": "Page Up", "delay": 0},
+        {"type": "type", "text": "hi", "human_like": False, "delay": 0},
+        {"type": "web_request", "data": {"action": "search", "query": "x"}, "delay": 0},
+    ]}, ui)
+    timings = plan.run()
+    assert [c[0] for c in ui.pyautogui.calls] == ["click", "press", "type_text", "emit"]
+    assert ui.pyautogui.calls[1][1] == ("pageup",)
+    assert ui.pyautogui.calls[3][1] == ("web_request", {"action": "search", "query": "x"})
+    assert [t.index for t in timings] == [0, 1, 2, 3]
+
+
+def test_single_character_keys_keep_their_case(ui):
+    compile_workflow({"steps": [{"type": "key", "key": "A", "delay": 0}]}, ui).run()
+    assert ui.pyautogui.calls == [("press", ("A",), {})]
+
+
+@pytest.mark.parametrize("step, message", [
+    ({"type": "click"}, "x and y or a target"),
+    ({"type": "launch"}, "unknown step type"),
+    ({"type": "wait", "duration": -1}, "must not be negative"),
+    ({"type": "web_request", "data": {}}, "'action'"),
+    ({"type": "key", "key": "a", "delay": "soon"}, "'delay' must be a number"),
+])
+def test_bad_steps_are_rejected_with_their_index(ui, step, message):
+    with pytest.raises(WorkflowError, match=message) as error:
+        compile_workflow({"steps": [{"type": "wait", "duration": 0}, step]}, ui, source="flow.json")
+    assert "flow.json step 1" in str(error.value)
+
+
+def test_dependency_cycles_are_rejected(ui):
+    with pytest.raises(WorkflowError, match="cycle"):
+        compile_workflow({"steps": [
+            {"type": "wait", "duration": 0, "id": "a", "needs": ["b"]},
+            {"type": "wait", "duration": 0, "id": "b", "needs": ["a"]},
+        ]}, ui)
+
+
+def test_speed_and_max_idle_scale_recorded_delays(ui):
+    slept = []
+    plan = compile_workflow({"steps": [{"type": "key", "key": "a", "delay": 4},
+                                       {"type": "key", "key": "b", "delay": 0.5}]}, ui)
+    plan.run(speed=2.0, max_idle=1.0, sleep=slept.append)
+    assert slept == [0.5, 0.25]
+
+
+def test_run_resumes_from_start_index(ui):
+    plan = compile_workflow({"steps": [{"type": "key", "key": k, "delay": 0} for k in "abc"]}, ui)
+    plan.run(start=1)
+    assert [c[1] for c in ui.pyautogui.calls] == [("b",), ("c",)]
+
+
+def test_coalesce_merges_printable_runs_and_absorbs_shift():
+    steps = [{"type": "key", "key": "shift", "delay": 0.1}, {"type": "key", "key": "H", "delay": 0.2},
+             {"type": "key", "key": "shift", "delay": 0.1}, {"type": "key", "key": "i", "delay": 0.1},
+             {"type": "key", "key": "space", "delay": 0.1}, {"type": "key", "key": "enter", "delay": 0.3}]
+    merged = coalesce_keys(steps)
+    assert [(i, s["type"], s.get("text", s.get("key"))) for i, s in merged] == [
+        (0, "key", "shift"), (1, "type", "Hi "), (5, "key", "enter")]
+    assert merged[1][1]["delay"] == 0.2
+
+
+def test_coalesce_splits_runs_at_split_at():
+    steps = [{"type": "key", "key": c, "delay": 0} for c in "hello"]
+    merged = coalesce_keys(steps, split_at=2)
+    assert [(i, s["text"]) for i, s in merged] == [(0, "he"), (2, "llo")]
+
+
+def test_plan_cache_recompiles_only_when_the_file_changes(tmp_path, ui):
+    path = tmp_path / "flow.json"
+    path.write_text(json.dumps({"steps": [{"type": "key", "key": "a"}]}))
+
+    def load(p):
+        with open(p, encoding="utf-8") as f:
+            return json.load(f)
+    cache = PlanCache(load, lambda: ui)
+    first = cache.get(str(path))
+    assert cache.get(str(path)) is first and cache.compiles == 1
+
+    path.write_text(json.dumps({"steps": [{"type": "key", "key": "a"}, {"type": "key", "key": "b"}]}))
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+    assert len(cache.get(str(path))) == 2 and cache.compiles == 2
+
+    cache.invalidate(str(path))
+    cache.get(str(path))
+    assert cache.compiles == 3
+
+
+class Finder(Recorder):
+    """click_text returns what it clicked, so a step has a result to save."""
+
+    def click_text(self, target):
+        self.calls.append(("click_text", (target,), {}))
+        return f"found {target}"
+
+
+def test_saved_results_fill_placeholders_in_later_steps(ui):
+    finder = Finder()
+    ui = ui._replace(click_system=finder)
+    plan = compile_workflow({"steps": [
+        {"type": "click", "target": "Invoice", "save_as": "hit", "delay": 0},
+        {"type": "type", "text": "{hit} at {missing}", "delay": 0},
+        {"type": "web_request", "data": {"action": "search", "query": "{hit}"}, "delay": 0},
+        {"type": "type", "text": '{"literal": 1}', "delay": 0},
+    ]}, ui)
+    assert [step.uses for step in plan.steps] == [(), ("hit",), ("hit",), ()]
+    variables = {}
+    plan.run(variables=variables)
+    assert variables == {"hit": "found Invoice"}
+    calls = ui.pyautogui.calls
+    assert calls[0][1] == ("found Invoice at {missing}",)
+    assert calls[1][1] == ("web_request", {"action": "search", "query": "found Invoice"})
+    assert calls[2][1] == ('{"literal": 1}',)
+
+
+def test_placeholders_resolve_in_graphs_and_after_resume(ui):
+    from src.safwanbuddy.automation.dag_scheduler import DagScheduler
+    ui = ui._replace(click_system=Finder())
+    workflow = {"steps": [
+        {"id": "find", "type": "click", "target": "Total", "save_as": "total", "delay": 0},
+        {"id": "note", "needs": ["find"], "type": "type", "text": "{total}", "delay": 0},
+    ]}
+    compile_workflow(workflow, ui).run_dag(DagScheduler(2), variables={})
+    compile_workflow(workflow, ui).run(start=1, variables={"total": "from checkpoint"})
+    assert [c[1] for c in ui.pyautogui.calls] == [("found Total",), ("from checkpoint",)]
+
+
+def test_event_wait_catches_the_event_the_step_before_emits(ui):
+    from src.safwanbuddy.automation.dag_scheduler import DagScheduler
+    from src.safwanbuddy.automation.wait_conditions import EventWaiter, WaitConditions
+    from src.safwanbuddy.core import event_bus
+    ui = ui._replace(waits=WaitConditions(interval=0.005, timeout=0.2, capture=object()), bus=event_bus)
+    steps = [
+        {"id": "save", "type": "document_request", "data": {"action": "saved", "ok": True}, "delay": 0},
+        {"id": "done", "needs": ["save"], "type": "wait", "until": "event", "event": "document_request",
+         "match": {"action": "saved"}, "timeout": 0.05, "save_as": "event", "delay": 0},
+    ]
+    plan = compile_workflow({"steps": steps}, ui)
+    variables = {}
+    plan.run(variables=variables)
+    assert variables["event"] == {"action": "saved", "ok": True}
+    variables = {}
+    plan.run_dag(DagScheduler(2), variables=variables)
+    assert variables["event"] == {"action": "saved", "ok": True}
+    assert not [l for l in event_bus._listeners["document_request"] if isinstance(l, EventWaiter)]
+
+
+@pytest.mark.parametrize("step", [
+    {"type": "type", "text": "hi", "save_as": "out"},
+    {"type": "key", "key": "a", "save_as": "out"},
+    {"type": "click", "x": 1, "y": 2, "save_as": "out"},
+    {"type": "web_request", "data": {"action": "search"}, "save_as": "out"},
+    {"type": "wait", "duration": 0, "save_as": "out"},
+])
+def test_save_as_is_rejected_on_steps_without_a_result(ui, step):
+    with pytest.raises(WorkflowError, match="'save_as' needs a step with a result"):
+        compile_workflow({"steps": [step]}, ui)
+
+
+def test_missing_or_none_variables_fail_the_step(ui):
+    plan = compile_workflow({"steps": [
+        {"type": "click", "target": "Invoice", "save_as": "hit", "delay": 0},  # Recorder returns None
+        {"type": "type", "text": "{hit}", "delay": 0},
+    ]}, ui)
+    with pytest.raises(WorkflowError, match="variable 'hit' has no value"):
+        plan.run(variables={})
+    with pytest.raises(WorkflowError, match="variable 'hit' has no value"):
+        plan.run(start=1, variables={})
+    assert [c[0] for c in ui.pyautogui.calls] == ["click_text"]
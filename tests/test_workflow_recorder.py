@@ -0,0 +1,65 @@
+import json
+import time
+
+import pytest
+
+from src.safwanbuddy.automation.workflow_recorder import (
+    FORMAT, WorkflowRecorder, iter_recording, load_recording, read_header,
+)
+
+
+def write_lines(path, *lines):
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+    return str(path)
+
+
+HEADER = json.dumps({"format": FORMAT, "version": 1, "name": "demo", "started": 0})
+
+
+def test_recorded_steps_round_trip(tmp_path):
+    recorder = WorkflowRecorder(str(tmp_path / "runs" / "demo.jsonl"), flush_interval=0.01)
+    recorder.start()
+    assert recorder.is_recording
+    recorder.record("click", x=10, y=20)
+    recorder.record("key", key="a")
+    assert recorder.stop() == 2 and not recorder.is_recording
+
+    workflow = load_recording(recorder.path)
+    assert workflow["name"] == "demo"
+    assert [(s["type"], s.get("x"), s.get("key")) for s in workflow["steps"]] == [("click", 10, None), ("key", None, "a")]
+    assert all(s["delay"] >= 0 for s in workflow["steps"])
+    assert read_header(recorder.path)["version"] == 1
+
+
+def test_steps_are_on_disk_before_stop(tmp_path):
+    recorder = WorkflowRecorder(str(tmp_path / "live.jsonl"), flush_interval=0.01)
+    recorder.start()
+    try:
+        recorder.record("key", key="x")
+        for _ in range(200):
+            if len(list(iter_recording(recorder.path))) == 1:
+                break
+            time.sleep(0.01)
+        assert [s["key"] for s in iter_recording(recorder.path)] == ["x"]
+    finally:
+        recorder.stop()
+
+
+def test_truncated_last_line_is_skipped(tmp_path):
+    path = tmp_path / "crashed.jsonl"
+    path.write_text(HEADER + '\n{"type":"key","delay":0.1,"key":"a"}\n{"type":"key","del', encoding="utf-8")
+    assert [s["key"] for s in iter_recording(str(path))] == ["a"]
+
+
+def test_malformed_line_mid_file_raises(tmp_path):
+    path = write_lines(tmp_path / "corrupt.jsonl", HEADER, '{"type":"key","delay":0.1,"key":"a"}', "{oops",
+                       "", '{"type":"key","delay":0.1,"key":"b"}')
+    with pytest.raises(ValueError, match=r"corrupt\.jsonl:3: corrupt step"):
+        list(iter_recording(path))
+
+
+def test_other_formats_are_rejected(tmp_path):
+    path = write_lines(tmp_path / "other.jsonl", json.dumps({"format": "something-else"}))
+    with pytest.raises(ValueError, match="not a step recording"):
+        list(iter_recording(path))
+    assert read_header(path) == {}